@@ -4,3 +4,34 @@ from django.apps import AppConfig
 class ListingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'listings'
+
+    def ready(self):
+        from django.contrib.auth.models import User
+        from django.db.models.signals import post_delete, post_save
+        from rest_framework.authtoken.models import Token
+
+        from . import authentication, fulltext, locks, market_stats, response_cache
+        from . import tasks  # noqa: F401  (καταχώρηση των εργασιών της ουράς)
+        from .models import Agent, AgentBuyerAssociation, Buyer, Lead, Property, Seller
+
+        # Ακύρωση της cache token -> user όταν αλλάζουν tokens, users ή ρόλοι
+        for signal in (post_save, post_delete):
+            signal.connect(authentication.invalidate_for_token, sender=Token, dispatch_uid=f'auth-cache-token-{signal}')
+            signal.connect(authentication.invalidate_for_user, sender=User, dispatch_uid=f'auth-cache-user-{signal}')
+            for model in (Agent, Buyer, Seller):
+                signal.connect(authentication.invalidate_for_role, sender=model,
+                               dispatch_uid=f'auth-cache-{model.__name__}-{signal}')
+
+        # Διαγραφές ακινήτων (και μέσω cascade από Seller) ενημερώνουν τις cached λίστες,
+        # τα στατιστικά αγοράς και το full-text index.
+        # Τα saves γίνονται ήδη από το Property.save().
+        post_delete.connect(response_cache.invalidate_for_property, sender=Property,
+                            dispatch_uid='listing-cache-property-delete')
+        post_delete.connect(market_stats.record_deleted, sender=Property, dispatch_uid='market-stats-property-delete')
+        post_delete.connect(fulltext.remove_for_property, sender=Property, dispatch_uid='fulltext-property-delete')
+
+        # Αλλαγές σε Lead/AgentBuyerAssociation ακυρώνουν τα cached κλειδώματα του αγοραστή
+        for signal in (post_save, post_delete):
+            for model in (Lead, AgentBuyerAssociation):
+                signal.connect(locks.invalidate_for_instance, sender=model,
+                               dispatch_uid=f'property-locks-{model.__name__}-{signal}')
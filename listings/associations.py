@@ -0,0 +1,95 @@
+import re
+from collections import defaultdict
+
+from . import fulltext
+
+
+# Οι μεσίτες καταχωρούν προσωρινές συσχετίσεις (CreateTemporaryAssociationView) πριν ο
+# αγοραστής εγγραφεί. Στην εγγραφή ταιριάζουν με βάση το κανονικοποιημένο ζεύγος
+# (όνομα, αριθμός ταυτότητας), ώστε "Γιώργος  Παπαδόπουλος" να ταιριάζει με "ΓΙΩΡΓΟΣ ΠΑΠΑΔΟΠΟΥΛΟΣ"
+# και "ΑΒ 123456" με "ab-123456".
+
+ID_SEPARATORS = re.compile(r'[\s\-./]+')
+
+
+def normalize_name(value):
+    return ' '.join(fulltext.normalize(value).split())
+
+
+def normalize_id(value):
+    return ID_SEPARATORS.sub('', fulltext.normalize(value))
+
+
+def match_key(name, identification_number):
+    """(name_key, id_key) ή None όταν λείπει κάποιο από τα δύο."""
+    name_key, id_key = normalize_name(name), normalize_id(identification_number)
+    if not name_key or not id_key:
+        return None
+    return name_key, id_key
+
+
+def _unmatched():
+    from .models import AgentBuyerAssociation
+    return AgentBuyerAssociation.objects.filter(buyer__isnull=True)
+
+
+def claim_for_buyer(buyer):
+    """Συνδέει με τον αγοραστή όλες τις προσωρινές συσχετίσεις που ταιριάζουν, με ένα UPDATE."""
+    key = match_key(buyer.name, buyer.identification_number)
+    if key is None:
+        return 0
+    claimed = _unmatched().filter(temp_buyer_name_key=key[0], temp_buyer_id_key=key[1]).update(buyer=buyer)
+    if claimed:
+        _invalidate_locks([buyer.pk])
+    return claimed
+
+
+def _invalidate_locks(buyer_ids):
+    # Το update() δεν στέλνει post_save· οι απορριφθείσες συσχετίσεις είναι κλειδώματα
+    from .locks import lock_cache
+    for buyer_id in buyer_ids:
+        lock_cache.invalidate(buyer_id)
+
+
+def reconcile(batch_size=1000):
+    """
+    Για αγοραστές που εγγράφηκαν πριν από την προσωρινή συσχέτιση ή πριν από την κανονικοποίηση:
+    διατρέχει τους αγοραστές σε batches (keyset κατά id) και συνδέει τις συσχετίσεις που ταιριάζουν.
+    Όπως και στην εγγραφή, αν δύο αγοραστές έχουν το ίδιο ζεύγος τις παίρνει ο πρώτος.
+    Επιστρέφει (buyers, claimed).
+    """
+    from .models import Buyer
+
+    buyers = claimed = 0
+    last_id = 0
+    while True:
+        batch = list(
+            Buyer.objects.filter(id__gt=last_id, identification_number__isnull=False)
+            .exclude(identification_number='')
+            .order_by('id').values_list('id', 'name', 'identification_number')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        buyers += len(batch)
+
+        by_key = {}
+        for buyer_id, name, identification_number in batch:
+            key = match_key(name, identification_number)
+            if key is not None:
+                by_key.setdefault(key, buyer_id)
+
+        # Ένα query για τις υποψήφιες συσχετίσεις του batch, μετά ένα UPDATE ανά αγοραστή
+        candidates = _unmatched().filter(temp_buyer_id_key__in={id_key for _, id_key in by_key}).values_list(
+            'id', 'temp_buyer_name_key', 'temp_buyer_id_key',
+        )
+        matches = defaultdict(list)
+        for association_id, name_key, id_key in candidates:
+            buyer_id = by_key.get((name_key, id_key))
+            if buyer_id is not None:
+                matches[buyer_id].append(association_id)
+
+        for buyer_id, association_ids in matches.items():
+            claimed += _unmatched().filter(id__in=association_ids).update(buyer_id=buyer_id)
+        _invalidate_locks(matches)
+    return buyers, claimed
@@ -0,0 +1,201 @@
+from asgiref.sync import sync_to_async  # type: ignore
+from django.contrib.auth.models import AnonymousUser  # type: ignore
+from django.db.models import OuterRef, Subquery  # type: ignore
+from django.http import HttpResponse  # type: ignore
+from django.views import View  # type: ignore
+from rest_framework import exceptions  # type: ignore
+from rest_framework.authentication import get_authorization_header  # type: ignore
+from rest_framework.authtoken.models import Token  # type: ignore
+from rest_framework.permissions import IsAuthenticated  # type: ignore
+from rest_framework.renderers import JSONRenderer  # type: ignore
+from rest_framework.request import Request  # type: ignore
+
+from . import locks
+from .authentication import token_cache
+from .models import Property, SupportMessage, Transaction, VisitRequest
+from .pagination import KeysetPagination
+from .permissions import IsVerifiedAgent
+from .search import PropertySearch
+from .serializers import (
+    PROPERTY_LIST_ANNOTATIONS, PROPERTY_LIST_FIELDS, PropertyListSerializer, SupportMessageSerializer, TransactionSerializer,
+    VisitRequestSerializer,
+)
+
+
+async def authenticate(request):
+    """
+    Token authentication όπως το CachedTokenAuthentication. Με ζεστή cache δεν γίνεται
+    κανένα I/O. Σε miss το φόρτωμα (ένα query) τρέχει σε thread μέσω sync_to_async.
+    """
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b'token':
+        return AnonymousUser()
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed('Invalid token header.')
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed('Invalid token header.')
+
+    user = token_cache.peek(key)
+    if user is None:
+        try:
+            user = await sync_to_async(token_cache.get_or_load)(key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed('User inactive or deleted.')
+    return user
+
+
+class AsyncAPIView(View):
+    """
+    Ελάχιστο async αντίστοιχο του APIView για τα read-only endpoints: authentication,
+    permission_classes, χειρισμός APIException και JSON με τον renderer του DRF, ώστε οι
+    απαντήσεις να είναι ίδιες με των sync views. Τα handlers επιστρέφουν δεδομένα, όχι Response.
+    """
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get']
+
+    async def dispatch(self, request, *args, **kwargs):
+        drf_request = Request(request)
+        try:
+            drf_request.user = await authenticate(request)
+            self.check_permissions(drf_request)
+            handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            self.request = drf_request
+            data = await handler(drf_request, *args, **kwargs)
+            return self.render(data)
+        except exceptions.APIException as exc:
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = self.render(data, status=exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = 'Token'
+            return response
+
+    def check_permissions(self, request):
+        for permission_class in self.permission_classes:
+            permission = permission_class()
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    @staticmethod
+    def render(data, status=200):
+        return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class BaseAsyncListView(AsyncAPIView):
+    """
+    Λίστα με KeysetPagination για τα async endpoints. Αφηρημένη βάση χωρίς route:
+    οι υποκλάσεις ορίζουν serializer_class και get_queryset().
+    """
+    serializer_class = None
+
+    def get_queryset(self):
+        """Το (lazy) queryset της λίστας· εκτελείται με το async ORM από το paginator."""
+        raise NotImplementedError(f'{type(self).__name__} must define get_queryset().')
+
+    def get_serializer(self, page):
+        return self.serializer_class(page, many=True, context={'request': self.request, 'view': self})
+
+    async def get(self, request):
+        paginator = KeysetPagination()
+        page = await paginator.apaginate_queryset(self.get_queryset(), request, view=self)
+        return paginator.get_paginated_data(self.get_serializer(page).data)
+
+
+class AsyncPropertyLockStateMixin:
+    """Όπως το locks.PropertyLockStateMixin: locked_until σε κάθε ακίνητο όταν ο χρήστης είναι αγοραστής."""
+
+    async def get(self, request):
+        data = await super().get(request)
+        buyer = getattr(request.user, 'buyer', None)
+        if buyer is not None:
+            await locks.aannotate(data['results'], buyer.id)
+        return data
+
+
+class AsyncPropertyListView(AsyncPropertyLockStateMixin, BaseAsyncListView):
+    serializer_class = PropertyListSerializer
+    permission_classes = [IsAuthenticated, IsVerifiedAgent]
+
+    def get_queryset(self):
+        return PropertySearch(self.request.query_params).apply(Property.objects.all()).values(*PROPERTY_LIST_FIELDS, **PROPERTY_LIST_ANNOTATIONS)
+
+
+class AsyncPropertySearchView(AsyncPropertyLockStateMixin, BaseAsyncListView):
+    serializer_class = PropertyListSerializer
+
+    def get_queryset(self):
+        return PropertySearch(self.request.query_params).apply(Property.objects.all()).values(*PROPERTY_LIST_FIELDS, **PROPERTY_LIST_ANNOTATIONS)
+
+    async def get(self, request):
+        data = await super().get(request)
+        data['facets'] = await PropertySearch(request.query_params).afacets(Property.objects.all())
+        return data
+
+
+class AsyncSellerDashboardView(BaseAsyncListView):
+    serializer_class = TransactionSerializer
+
+    def get_queryset(self):
+        seller = getattr(self.request.user, 'seller', None)
+        if not seller:
+            return Transaction.objects.none()
+        return Transaction.objects.filter(property__seller=seller).order_by('-created_at')
+
+
+class AsyncSellerVisitRequestListView(BaseAsyncListView):
+    serializer_class = VisitRequestSerializer
+
+    def get_queryset(self):
+        seller = getattr(self.request.user, 'seller', None)
+        if not seller:
+            return VisitRequest.objects.none()
+        return VisitRequest.objects.filter(property__seller=seller).order_by('-created_at')
+
+
+class AsyncSupportMessageListView(BaseAsyncListView):
+    serializer_class = SupportMessageSerializer
+
+    def get_queryset(self):
+        ticket_id = self.request.query_params.get('ticket')
+        if not ticket_id:
+            return SupportMessage.objects.none()
+        # select_related: το sender.username του serializer δεν επιτρέπεται να κάνει query σε async context
+        return SupportMessage.objects.filter(ticket__id=ticket_id).select_related('sender').order_by('created_at')
+
+
+class AsyncAgentDashboardView(AsyncAPIView):
+    """Το ίδιο με το AgentDashboardView (ένα query με correlated subquery)."""
+
+    async def get(self, request):
+        agent = getattr(request.user, 'agent', None)
+        if agent is None:
+            raise exceptions.NotFound()
+
+        latest_id = (
+            Transaction.objects.filter(agent=agent, buyer=OuterRef('buyer'))
+            .order_by('-created_at', '-id')
+            .values('id')[:1]
+        )
+        latest_transactions = (
+            Transaction.objects.filter(agent=agent, id=Subquery(latest_id))
+            .order_by('buyer_id')
+            .values('id', 'status', 'buyer_id', 'buyer__name', 'buyer__email', 'property__title')
+        )
+        return [
+            {
+                'id': row['buyer_id'],
+                'name': row['buyer__name'],
+                'email': row['buyer__email'],
+                'transactionId': row['id'],
+                'propertyTitle': row['property__title'],
+                'status': row['status'],
+            }
+            async for row in latest_transactions
+        ]
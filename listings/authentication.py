@@ -0,0 +1,241 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings  # type: ignore
+from django.core.cache import caches  # type: ignore
+from django.db import connection, transaction  # type: ignore
+from rest_framework import exceptions  # type: ignore
+from rest_framework.authentication import TokenAuthentication  # type: ignore
+from rest_framework.authtoken.models import Token  # type: ignore
+
+
+# Σειρά προτεραιότητας όπως στο CustomAuthToken
+ROLE_RELATIONS = ('buyer', 'seller', 'agent')
+
+DEFAULTS = {
+    'TTL': 300,              # δευτερόλεπτα
+    'LOCAL_TTL': 5,          # δευτερόλεπτα για τις τοπικές εγγραφές όταν δεν υπάρχει SHARED_CACHE
+    'MAX_ENTRIES': 10000,    # LRU όριο της τοπικής cache
+    'SHARED_CACHE': None,    # alias από το CACHES (π.χ. 'default') για κοινή cache μεταξύ processes
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'AUTH_TOKEN_CACHE', {})}
+
+
+def get_role(user):
+    """
+    Ο ρόλος του χρήστη ('buyer', 'seller', 'agent' ή 'unknown'). Αν ο user ήρθε από
+    το TokenCache οι σχέσεις είναι ήδη φορτωμένες και δεν γίνεται κανένα query.
+    """
+    for relation in ROLE_RELATIONS:
+        if getattr(user, relation, None) is not None:
+            return relation
+    return 'unknown'
+
+
+def is_verified_agent(user):
+    agent = getattr(user, 'agent', None)
+    return bool(agent is not None and agent.is_verified)
+
+
+def _clone(user):
+    # Κάθε request παίρνει δικό του αντίγραφο ώστε αλλαγές σε ένα request να μη διαρρέουν σε άλλα
+    clone = copy.copy(user)
+    for name, value in list(clone._state.fields_cache.items()):
+        if value is not None:
+            clone._state.fields_cache[name] = copy.copy(value)
+    return clone
+
+
+class TokenCache:
+    """
+    Cache token -> user (μαζί με τα Agent/Buyer/Seller του) με TTL και LRU eviction.
+
+    Με SHARED_CACHE οι εγγραφές μοιράζονται μεταξύ των workers και κάθε token έχει εκεί
+    ένα generation key, που αλλάζει σε κάθε ακύρωση (διαγραφή token, αλλαγή user ή ρόλου).
+    Μια τοπική εγγραφή χρησιμοποιείται μόνο αν το generation της είναι ακόμα το τρέχον,
+    οπότε η ακύρωση σε ένα process ισχύει αμέσως και στα υπόλοιπα (κόστος: ένα cache get).
+    Χωρίς SHARED_CACHE η ακύρωση φτάνει μόνο στο τρέχον process· γι' αυτό οι τοπικές
+    εγγραφές ζουν τότε μόνο LOCAL_TTL δευτερόλεπτα.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def _shared(self):
+        alias = _config()['SHARED_CACHE']
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _shared_key(key):
+        return f'auth-token:{key}'
+
+    @staticmethod
+    def _generation_key(key):
+        return f'auth-token-generation:{key}'
+
+    def _local(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user, generation, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return user, generation
+                self._discard(key)
+        return None
+
+    def _generation(self, shared, key):
+        return shared.get(self._generation_key(key))
+
+    def peek(self, key):
+        """
+        Μόνο η τοπική cache, χωρίς I/O (ασφαλές και μέσα σε async views). Με SHARED_CACHE
+        επιστρέφει πάντα None: η τοπική εγγραφή πρέπει πρώτα να ελεγχθεί από το get().
+        """
+        if self._shared() is not None:
+            return None
+        entry = self._local(key)
+        return _clone(entry[0]) if entry is not None else None
+
+    def get(self, key):
+        shared = self._shared()
+        if shared is None:
+            return self.peek(key)
+
+        generation = self._generation(shared, key)
+        entry = self._local(key)
+        if entry is not None and entry[1] == generation:
+            return _clone(entry[0])
+        cached = shared.get(self._shared_key(key))
+        if cached is not None and cached[1] == generation:
+            self._store_local(key, *cached)
+            return _clone(cached[0])
+        return None
+
+    def load(self, key):
+        """Ένα query για token, user και τους τρεις ρόλους."""
+        # Το generation διαβάζεται πριν από το query: μια ακύρωση στο μεταξύ το αλλάζει
+        # και η εγγραφή που θα αποθηκευτεί απορρίπτεται στο επόμενο get()
+        shared = self._shared()
+        generation = self._generation(shared, key) if shared is not None else None
+        token = Token.objects.select_related(
+            'user', *(f'user__{relation}' for relation in ROLE_RELATIONS)
+        ).get(key=key)
+        user = token.user
+        # Προσπέλαση ώστε οι κενές reverse σχέσεις να αποθηκευτούν ως None στο fields_cache
+        for relation in ROLE_RELATIONS:
+            getattr(user, relation, None)
+        self.set(key, user, generation)
+        return _clone(user)
+
+    def get_or_load(self, key):
+        return self.get(key) or self.load(key)
+
+    def set(self, key, user, generation=None):
+        self._store_local(key, user, generation)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._shared_key(key), (user, generation), _config()['TTL'])
+
+    def _store_local(self, key, user, generation=None):
+        config = _config()
+        ttl = config['TTL'] if config['SHARED_CACHE'] else min(config['TTL'], config['LOCAL_TTL'])
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (user, generation, time.monotonic() + ttl)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > config['MAX_ENTRIES']:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry[0].pk)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry[0].pk]
+
+    def _bump(self, shared, keys):
+        # Νέο generation (με διάρκεια όσο οι εγγραφές που ακυρώνει) και διαγραφή της κοινής εγγραφής
+        ttl = _config()['TTL']
+        shared.set_many({self._generation_key(key): uuid.uuid4().hex for key in keys}, ttl)
+        shared.delete_many([self._shared_key(key) for key in keys])
+
+    def _invalidate_shared(self, keys):
+        """
+        Όπως στο response_cache.invalidate(): μέσα σε transaction ξανά μετά το commit, ώστε
+        ένα load() άλλου worker που διάβασε τα παλιά δεδομένα πριν το commit να μη μείνει έγκυρο.
+        """
+        shared = self._shared()
+        if shared is None or not keys:
+            return
+        self._bump(shared, keys)
+        if connection.in_atomic_block:
+            transaction.on_commit(lambda: self._bump(shared, keys))
+
+    def invalidate_key(self, key):
+        with self._lock:
+            self._discard(key)
+        self._invalidate_shared([key])
+
+    def invalidate_user(self, user_id):
+        if user_id is None:
+            return
+        with self._lock:
+            keys = set(self._keys_by_user.get(user_id, ()))
+            for key in keys:
+                self._discard(key)
+        if self._shared() is not None:
+            keys |= set(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+            self._invalidate_shared(list(keys))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Ίδια συμπεριφορά με το TokenAuthentication του DRF, αλλά το token, ο user και οι
+    σχέσεις agent/buyer/seller έρχονται από το token_cache. Έτσι τα request.user.agent,
+    .buyer, .seller και το IsVerifiedAgent δεν κάνουν επιπλέον queries.
+    """
+
+    def authenticate_credentials(self, key):
+        try:
+            user = token_cache.get_or_load(key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        return (user, Token(key=key, user=user))
+
+
+# Invalidation: καλείται από τα signals του ListingsConfig.ready()
+def invalidate_for_token(sender, instance, **kwargs):
+    token_cache.invalidate_key(instance.key)
+
+
+def invalidate_for_user(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
+
+
+def invalidate_for_role(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.user_id)
@@ -0,0 +1,589 @@
+import itertools
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings  # type: ignore
+from django.contrib.auth.models import User  # type: ignore
+from django.core.files.uploadedfile import SimpleUploadedFile  # type: ignore
+from django.db import connection  # type: ignore
+from django.db.models import Max, Min  # type: ignore
+from django.test import Client  # type: ignore
+from django.urls import URLPattern, reverse  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.views.static import serve  # type: ignore
+from rest_framework.authtoken.models import Token  # type: ignore
+
+from . import documents, metrics, otp, synthetic
+from .authentication import token_cache
+from .models import (
+    Agent, AgentBuyerAssociation, Buyer, DocumentUpload, Lead, Property, Seller, SupportTicket, Transaction, VisitRequest,
+)
+
+
+# Benchmark όλων των endpoints του listings/urls.py μέσω του test client, πάνω σε συνθετικά
+# δεδομένα (listings/synthetic.py). Κάθε endpoint έχει ένα σενάριο που ετοιμάζει (χωρίς
+# χρονομέτρηση) ό,τι χρειάζεται το request, π.χ. μια συναλλαγή σε PRE_DEPOSIT για το
+# pay_deposit, ώστε να μετριέται η επιτυχημένη διαδρομή και όχι ένα 400. Ανά request
+# καταγράφονται χρόνος, πλήθος queries και bytes της απάντησης (μαζί με το streaming σώμα).
+
+PASSWORD = 'benchmark-password'
+
+SCENARIOS = {}
+
+
+class Call:
+    def __init__(self, method, path, actor=None, data=None, params=None, multipart=False):
+        self.method = method
+        self.path = path
+        self.actor = actor
+        self.data = data
+        self.params = params
+        self.multipart = multipart
+
+
+def scenario(name):
+    def register(function):
+        SCENARIOS[name] = function
+        return function
+    return register
+
+
+def endpoints():
+    """(url name, route) για κάθε μοναδικό route του listings/urls.py· το πρώτο name κερδίζει, όπως στο resolve."""
+    from . import urls
+    seen = set()
+    for pattern in urls.urlpatterns:
+        if not isinstance(pattern, URLPattern) or pattern.callback is serve:
+            continue  # media (DEBUG): στατικά αρχεία, όχι endpoint
+        route = str(pattern.pattern)
+        if route in seen:
+            continue
+        seen.add(route)
+        yield pattern.name, route
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def summarize(samples):
+    latencies = [sample['seconds'] * 1000 for sample in samples]
+    queries = [sample['queries'] for sample in samples]
+    sizes = [sample['bytes'] for sample in samples]
+    statuses = {}
+    for sample in samples:
+        statuses[str(sample['status'])] = statuses.get(str(sample['status']), 0) + 1
+    return {
+        'requests': len(samples),
+        'statuses': statuses,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3), 'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3), 'mean': round(statistics.fmean(latencies), 3),
+        },
+        'queries': {'p50': percentile(queries, 50), 'max': max(queries), 'mean': round(statistics.fmean(queries), 2)},
+        'bytes': {'p50': percentile(sizes, 50), 'max': max(sizes), 'mean': round(statistics.fmean(sizes), 1)},
+    }
+
+
+class Context:
+    """
+    Οι λογαριασμοί (actors) και τα αντικείμενα που χρησιμοποιούν τα σενάρια. Οι actors είναι
+    οι πρώτοι seller, buyer και επαληθευμένος agent του συνόλου, με tokens, και ένας admin.
+    """
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(f'{seed}:benchmark')
+        self.counter = itertools.count(1)
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    def setup(self):
+        self.seller = Seller.objects.select_related('user').filter(user__isnull=False).order_by('pk').first()
+        self.buyer = Buyer.objects.select_related('user').filter(user__isnull=False).order_by('pk').first()
+        self.agent = (Agent.objects.select_related('user').filter(user__isnull=False, is_verified=True)
+                      .order_by('user_id').first())
+        if not (self.seller and self.buyer and self.agent):
+            raise ValueError('The dataset needs at least one seller, buyer and verified agent with users.')
+        self.seller.user.set_password(PASSWORD)
+        self.seller.user.save(update_fields=['password'])
+        self.admin, _ = User.objects.get_or_create(username='benchmark-admin', defaults={'is_staff': True})
+        self.tokens = {
+            role: Token.objects.get_or_create(user=user)[0].key
+            for role, user in (('seller', self.seller.user), ('buyer', self.buyer.user), ('agent', self.agent.user),
+                               ('admin', self.admin))
+        }
+        token_cache.clear()
+
+        self.bounds = {
+            model: model.objects.aggregate(low=Min('pk'), high=Max('pk'))
+            for model in (Property, Buyer, Transaction)
+        }
+        # Ακίνητο του seller για τα σενάρια που αλλάζουν διαθεσιμότητα ή κατάσταση
+        self.scratch = Property.objects.create(**self.property_data(), seller=self.seller)
+        # Ακίνητο χωρίς διαθεσιμότητα και handler, για αιτήματα επίσκεψης χωρίς συγκρούσεις
+        owner = Seller.objects.create(name='Benchmark', email=f'{self.unique("owner")}@example.gr',
+                                      phone=self.phone(), handle_visits=False)
+        self.visit_property = Property.objects.create(**self.property_data(), seller=owner)
+        self.transaction = Transaction.objects.create(property=self.scratch, buyer=self.buyer)
+        self.upload = DocumentUpload.objects.create(transaction=self.transaction, field='final_contract_doc',
+                                                    filename='contract.pdf', size=1024, created_by=self.buyer.user)
+        self.transaction.final_contract_doc.name = documents.store_uploaded_file(self.document())
+        self.transaction.save()
+        ticket = SupportTicket.objects.filter(messages__isnull=False).order_by('pk').first()
+        self.ticket_id = ticket.pk if ticket else SupportTicket.objects.create(
+            buyer=self.buyer, subject='Benchmark', description='-').pk
+
+    def headers(self, actor):
+        return {'Authorization': f'Token {self.tokens[actor]}'} if actor else {}
+
+    def unique(self, prefix):
+        return f'bench-{prefix}-{next(self.counter)}'
+
+    def phone(self):
+        return f'+30699{next(self.counter):09d}'
+
+    def pick(self, model):
+        bounds = self.bounds[model]
+        return self.rng.randint(bounds['low'], bounds['high'])
+
+    def city(self):
+        return self.rng.choices(synthetic.CITIES, synthetic.CITY_WEIGHTS)[0]
+
+    def later(self, days, i):
+        # Διαφορετική ώρα ανά επανάληψη, ώστε οι κρατήσεις να μη συγκρούονται
+        return self.now + timedelta(days=days, hours=i)
+
+    def document(self):
+        return SimpleUploadedFile('contract.pdf', b'%PDF-1.4\n' + bytes(64 * 1024), content_type='application/pdf')
+
+    def property_data(self):
+        state, city, *_ = self.city()
+        return {'title': 'Διαμέρισμα benchmark', 'full_description': '-', 'property_type': 'apartment',
+                'area': Decimal('85'), 'price': Decimal('180000'), 'state': state, 'city': city,
+                'street': 'Ερμού', 'number': '1'}
+
+    def new_buyer(self):
+        name = self.unique('buyer')
+        return Buyer.objects.create(name=name, email=f'{name}@example.gr', phone=self.phone())
+
+    def visit(self, prop, buyer, days, i, handler=None):
+        scheduled = self.later(days, i)
+        return VisitRequest.objects.create(property=prop, buyer=buyer, handler=handler, scheduled_date=scheduled,
+                                           ends_at=scheduled + timedelta(minutes=30))
+
+    def registration(self, role):
+        username = self.unique(role)
+        return {'username': username, 'password': PASSWORD, 'email': f'{username}@example.gr',
+                'name': 'Benchmark User', 'phone': self.phone()}
+
+
+# --- Σενάρια: (context, αύξων αριθμός) -> Call ---
+
+@scenario('register_seller')
+def register_seller(ctx, i):
+    return Call('POST', reverse('register_seller'), data=ctx.registration('seller'))
+
+
+@scenario('register_buyer')
+def register_buyer(ctx, i):
+    return Call('POST', reverse('register_buyer'),
+                data={**ctx.registration('buyer'), 'identification_number': f'ΑΒ {100000 + i}'})
+
+
+@scenario('register_agent')
+def register_agent(ctx, i):
+    return Call('POST', reverse('register_agent'), data={**ctx.registration('agent'), 'commission': 2.5})
+
+
+def listing_params(ctx, i):
+    _, city, *_ = ctx.city()
+    return ({}, {'city': city}, {'city': city, 'max_price': 250000}, {'property_type': 'house', 'min_bedrooms': 3},
+            {'ordering': 'price', 'energy_class': 'B'})[i % 5]
+
+
+@scenario('property-list')
+def property_list(ctx, i):
+    return Call('GET', reverse('property-list'), 'agent', params=listing_params(ctx, i))
+
+
+@scenario('property-detail')
+def property_detail(ctx, i):
+    return Call('GET', reverse('property-detail', args=[ctx.pick(Property)]), 'agent')
+
+
+@scenario('property-image')
+def property_image(ctx, i):
+    return Call('GET', reverse('property-image', args=[ctx.pick(Property), 0, 'thumb']))
+
+
+@scenario('property-search')
+def property_search(ctx, i):
+    return Call('GET', reverse('property-search'), 'buyer', params=listing_params(ctx, i))
+
+
+@scenario('property-text-search')
+def property_text_search(ctx, i):
+    neighborhood = ctx.rng.choice(ctx.city()[5])[0]
+    return Call('GET', reverse('property-text-search'), 'buyer', params={'q': neighborhood})
+
+
+@scenario('property-geo-bbox')
+def property_geo_bbox(ctx, i):
+    _, lat, lng, _ = ctx.rng.choice(ctx.city()[5])
+    return Call('GET', reverse('property-geo-bbox'), 'buyer', params={
+        'min_lat': lat - 0.02, 'max_lat': lat + 0.02, 'min_lng': lng - 0.03, 'max_lng': lng + 0.03,
+    })
+
+
+@scenario('property-geo-radius')
+def property_geo_radius(ctx, i):
+    _, lat, lng, _ = ctx.rng.choice(ctx.city()[5])
+    return Call('GET', reverse('property-geo-radius'), 'buyer', params={'lat': lat, 'lng': lng, 'radius_km': 2})
+
+
+@scenario('market-stats')
+def market_stats_view(ctx, i):
+    _, city, *_ = ctx.city()
+    return Call('GET', reverse('market-stats'), 'buyer', params=({'level': 'city'}, {'city': city}, {})[i % 3])
+
+
+@scenario('listing-cache-stats')
+def listing_cache_stats(ctx, i):
+    return Call('GET', reverse('listing-cache-stats'), 'admin')
+
+
+@scenario('metrics')
+def metrics_view(ctx, i):
+    return Call('GET', reverse('metrics'), 'admin')
+
+
+@scenario('api_token_auth')
+def api_token_auth(ctx, i):
+    return Call('POST', reverse('api_token_auth'), data={'username': ctx.seller.user.username, 'password': PASSWORD})
+
+
+@scenario('lead-create')
+def lead_create(ctx, i):
+    # Νέος αγοραστής κάθε φορά: κανένα κλείδωμα από προηγούμενα leads
+    return Call('POST', reverse('lead-create'), 'agent',
+                data={'buyer': ctx.new_buyer().pk, 'property': ctx.pick(Property)})
+
+
+@scenario('lead-verify-otp')
+def lead_verify_otp(ctx, i):
+    buyer = ctx.new_buyer()
+    lead = Lead.objects.create(agent=ctx.agent, buyer=buyer, property_id=ctx.pick(Property))
+    _, code = otp.issue(buyer, lead=lead)
+    return Call('POST', reverse('lead-verify-otp'), 'agent', data={'lead_id': lead.pk, 'otp_code': code})
+
+
+@scenario('lead-update-status')
+def lead_update_status(ctx, i):
+    lead = Lead.objects.create(agent=ctx.agent, buyer=ctx.new_buyer(), property_id=ctx.pick(Property))
+    return Call('POST', reverse('lead-update-status'), 'agent',
+                data={'lead_id': lead.pk, 'status': 'interested' if i % 2 else 'not_interested'})
+
+
+@scenario('seller_dashboard')
+def seller_dashboard(ctx, i):
+    return Call('GET', reverse('seller_dashboard'), 'seller')
+
+
+@scenario('seller-transactions-export')
+def seller_transactions_export(ctx, i):
+    return Call('GET', reverse('seller-transactions-export'), 'seller')
+
+
+@scenario('register_buyer_from_agent')
+def register_buyer_from_agent(ctx, i):
+    return Call('POST', reverse('register_buyer_from_agent', args=[ctx.agent.pk, ctx.pick(Property)]),
+                data=ctx.registration('buyer'))
+
+
+@scenario('agent_dashboard')
+def agent_dashboard(ctx, i):
+    return Call('GET', reverse('agent_dashboard'), 'agent')
+
+
+@scenario('list_sellers')
+def list_sellers(ctx, i):
+    return Call('GET', reverse('list_sellers'), 'admin')
+
+
+@scenario('list_buyers')
+def list_buyers(ctx, i):
+    return Call('GET', reverse('list_buyers'), 'admin')
+
+
+@scenario('list_agents')
+def list_agents(ctx, i):
+    return Call('GET', reverse('list_agents'), 'agent')
+
+
+@scenario('pay_deposit')
+def pay_deposit(ctx, i):
+    transaction = Transaction.objects.create(property=ctx.scratch, buyer=ctx.buyer)
+    return Call('POST', reverse('pay_deposit', args=[transaction.pk]), 'buyer', data={'amount': '18000.00'})
+
+
+@scenario('upload_contract')
+def upload_contract(ctx, i):
+    transaction = Transaction.objects.create(property=ctx.scratch, buyer=ctx.buyer)
+    return Call('POST', reverse('upload_contract', args=[transaction.pk]), 'buyer',
+                data={'final_contract_doc': ctx.document()}, multipart=True)
+
+
+@scenario('finalize_transaction')
+def finalize_transaction(ctx, i):
+    transaction = Transaction.objects.create(property=ctx.scratch, buyer=ctx.buyer, agent=ctx.agent,
+                                             status='DEPOSIT_PAID', deposit_paid=True, deposit_amount=Decimal('18000'))
+    return Call('POST', reverse('finalize_transaction', args=[transaction.pk]), 'buyer')
+
+
+@scenario('transaction-progress')
+def transaction_progress(ctx, i):
+    return Call('GET', reverse('transaction-progress', args=[ctx.pick(Transaction)]), 'admin')
+
+
+@scenario('property-interest')
+def property_interest(ctx, i):
+    return Call('POST', reverse('property-interest', args=[ctx.pick(Property)]), 'buyer')
+
+
+@scenario('create_property')
+def create_property(ctx, i):
+    data = {key: str(value) for key, value in ctx.property_data().items()}
+    return Call('POST', reverse('create_property'), 'seller', data={**data, 'energy_class': 'B', 'bedrooms': 2})
+
+
+@scenario('document-upload-create')
+def document_upload_create(ctx, i):
+    return Call('POST', reverse('document-upload-create', args=[ctx.transaction.pk]), 'buyer',
+                data={'field': 'proof_of_payment_doc', 'filename': 'proof.pdf', 'size': 256 * 1024})
+
+
+@scenario('document-upload')
+def document_upload(ctx, i):
+    return Call('GET', reverse('document-upload', args=[ctx.upload.pk]), 'buyer')
+
+
+@scenario('transaction-document')
+def transaction_document(ctx, i):
+    return Call('GET', reverse('transaction-document', args=[ctx.transaction.pk, 'final_contract_doc']), 'buyer')
+
+
+@scenario('buyer_agent_association_response')
+def buyer_agent_association_response(ctx, i):
+    association = AgentBuyerAssociation.objects.create(buyer=ctx.buyer, agent=ctx.agent, property_id=ctx.pick(Property))
+    return Call('PATCH', reverse('buyer_agent_association_response', args=[association.pk]), 'buyer',
+                data={'accepted': bool(i % 2)})
+
+
+@scenario('buyer-transactions')
+def buyer_transactions(ctx, i):
+    return Call('GET', reverse('buyer-transactions'), 'buyer')
+
+
+@scenario('buyer-transactions-export')
+def buyer_transactions_export(ctx, i):
+    return Call('GET', reverse('buyer-transactions-export'), 'buyer')
+
+
+@scenario('admin-transactions-export')
+def admin_transactions_export(ctx, i):
+    return Call('GET', reverse('admin-transactions-export'), 'admin')
+
+
+@scenario('create_temporary_association')
+def create_temporary_association(ctx, i):
+    return Call('POST', reverse('create_temporary_association'), 'agent', data={
+        'property': ctx.pick(Property), 'temp_buyer_name': 'Γιώργος Παπαδόπουλος',
+        'temp_buyer_identification_number': f'ΑΚ {200000 + i}',
+    })
+
+
+@scenario('create_visit_availability')
+def create_visit_availability(ctx, i):
+    return Call('POST', reverse('create_visit_availability'), 'seller',
+                data={'property': ctx.scratch.pk, 'available_date': ctx.later(10, i).isoformat()})
+
+
+@scenario('visit-slots')
+def visit_slots(ctx, i):
+    return Call('GET', reverse('visit-slots', args=[ctx.pick(Property)]), 'buyer')
+
+
+@scenario('visit-slots-bulk')
+def visit_slots_bulk(ctx, i):
+    slots = [ctx.later(20, i * 4 + n).isoformat() for n in range(4)]
+    return Call('POST', reverse('visit-slots-bulk', args=[ctx.scratch.pk]), 'seller',
+                data={'slots': slots, 'duration_minutes': 30})
+
+
+@scenario('create_visit_request')
+def create_visit_request(ctx, i):
+    return Call('POST', reverse('create_visit_request'), 'buyer',
+                data={'property': ctx.visit_property.pk, 'scheduled_date': ctx.later(40, i).isoformat()})
+
+
+@scenario('seller_visit_requests')
+def seller_visit_requests(ctx, i):
+    return Call('GET', reverse('seller_visit_requests'), 'seller')
+
+
+@scenario('update_visit_request')
+def update_visit_request(ctx, i):
+    visit = ctx.visit(ctx.scratch, ctx.buyer, 80, i, handler=ctx.seller.user)
+    return Call('PATCH', reverse('update_visit_request', args=[visit.pk]), 'seller', data={'status': 'APPROVED'})
+
+
+@scenario('cancel_visit_request_by_buyer')
+def cancel_visit_request_by_buyer(ctx, i):
+    visit = ctx.visit(ctx.visit_property, ctx.buyer, 120, i)
+    return Call('PATCH', reverse('cancel_visit_request_by_buyer', args=[visit.pk]), 'buyer',
+                data={'cancellation_reason': 'Δεν μπορώ να έρθω.'})
+
+
+@scenario('cancel_visit_request_by_seller')
+def cancel_visit_request_by_seller(ctx, i):
+    # Σχεδιασμένα 403: ο seller παραπέμπεται στο support
+    visit = ctx.visit(ctx.scratch, ctx.buyer, 160, i, handler=ctx.seller.user)
+    return Call('PATCH', reverse('cancel_visit_request_by_seller', args=[visit.pk]), 'seller',
+                data={'cancellation_reason': 'Ακύρωση από τον πωλητή.'})
+
+
+@scenario('admin_cancel_visit_request')
+def admin_cancel_visit_request(ctx, i):
+    visit = ctx.visit(ctx.visit_property, ctx.buyer, 200, i)
+    return Call('PATCH', reverse('admin_cancel_visit_request', args=[visit.pk]), 'admin',
+                data={'cancellation_reason': 'Ακύρωση από τη διαχείριση.'})
+
+
+@scenario('support_ticket_create')
+def support_ticket_create(ctx, i):
+    return Call('POST', reverse('support_ticket_create'), 'buyer',
+                data={'subject': 'Ερώτηση', 'description': 'Θα ήθελα πληροφορίες για την προκαταβολή.'})
+
+
+@scenario('support_ticket_list')
+def support_ticket_list(ctx, i):
+    return Call('GET', reverse('support_ticket_list'), 'buyer')
+
+
+@scenario('support_message_create')
+def support_message_create(ctx, i):
+    return Call('POST', reverse('support_message_create'), 'buyer', data={'ticket': ctx.ticket_id, 'content': 'Ευχαριστώ.'})
+
+
+@scenario('support_message_list')
+def support_message_list(ctx, i):
+    return Call('GET', reverse('support_message_list'), 'buyer', params={'ticket': ctx.ticket_id})
+
+
+@scenario('generate_otp')
+def generate_otp(ctx, i):
+    return Call('POST', reverse('generate_otp'), 'agent', data={'buyer_id': ctx.pick(Buyer)})
+
+
+@scenario('verify_otp')
+def verify_otp(ctx, i):
+    buyer = ctx.new_buyer()
+    _, code = otp.issue(buyer)
+    return Call('POST', reverse('verify_otp'), 'agent', data={'buyer_id': buyer.pk, 'otp': code})
+
+
+@scenario('async-property-list')
+def async_property_list(ctx, i):
+    return Call('GET', reverse('async-property-list'), 'agent', params=listing_params(ctx, i))
+
+
+@scenario('async-property-search')
+def async_property_search(ctx, i):
+    return Call('GET', reverse('async-property-search'), 'buyer', params=listing_params(ctx, i))
+
+
+@scenario('async-seller-dashboard')
+def async_seller_dashboard(ctx, i):
+    return Call('GET', reverse('async-seller-dashboard'), 'seller')
+
+
+@scenario('async-agent-dashboard')
+def async_agent_dashboard(ctx, i):
+    return Call('GET', reverse('async-agent-dashboard'), 'agent')
+
+
+@scenario('async-seller-visit-requests')
+def async_seller_visit_requests(ctx, i):
+    return Call('GET', reverse('async-seller-visit-requests'), 'seller')
+
+
+@scenario('async-support-message-list')
+def async_support_message_list(ctx, i):
+    return Call('GET', reverse('async-support-message-list'), 'buyer', params={'ticket': ctx.ticket_id})
+
+
+# --- Εκτέλεση ---
+
+def settings_overrides(media_root, with_cache=False):
+    """Για override_settings κατά τη μέτρηση."""
+    return {
+        'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+        # Έγγραφα και παράγωγα εικόνων σε προσωρινό φάκελο· καμία λήψη εικόνων από το δίκτυο
+        'MEDIA_ROOT': media_root,
+        'IMAGE_DERIVATIVES': {**getattr(settings, 'IMAGE_DERIVATIVES', {}), 'ROOT': None, 'SOURCE_HOSTS': []},
+        'LISTING_CACHE': {**getattr(settings, 'LISTING_CACHE', {}), 'ENABLED': with_cache},
+        # Μετράμε τα endpoints, όχι τα όρια ή τα εργαλεία μέτρησης
+        'THROTTLING': {**getattr(settings, 'THROTTLING', {}), 'ENABLED': False},
+        'METRICS': {**getattr(settings, 'METRICS', {}), 'ENABLED': False},
+        'N_PLUS_ONE': {**getattr(settings, 'N_PLUS_ONE', {}), 'ENABLED': False},
+    }
+
+
+def send(client, ctx, call):
+    """Εκτελεί το request και διαβάζει όλο το σώμα (και των streaming απαντήσεων). (status, bytes, queries, seconds)."""
+    headers = ctx.headers(call.actor)
+    probe = metrics.QueryProbe()
+    started = time.perf_counter()
+    with connection.execute_wrapper(probe):
+        if call.method == 'GET':
+            response = client.get(call.path, call.params or {}, headers=headers)
+        elif call.multipart:
+            response = client.post(call.path, call.data, headers=headers)
+        else:
+            response = client.generic(call.method, call.path, json.dumps(call.data or {}),
+                                      content_type='application/json', headers=headers)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+    seconds = time.perf_counter() - started
+    response.close()
+    return {'status': response.status_code, 'bytes': size, 'queries': probe.queries, 'seconds': seconds}
+
+
+def run(ctx, requests, names=None, warmup=1, progress=None):
+    """Τρέχει requests (+warmup, χωρίς μέτρηση) ανά endpoint. Επιστρέφει {name: summary}."""
+    client = Client()
+    results = {}
+    for name, route in endpoints():
+        if names and name not in names:
+            continue
+        build = SCENARIOS[name]
+        samples = []
+        for i in range(warmup + requests):
+            call = build(ctx, i)
+            sample = send(client, ctx, call)
+            if i >= warmup:
+                samples.append(sample)
+        results[name] = {'route': route, 'method': call.method, **summarize(samples)}
+        if progress:
+            progress(name, results[name])
+    return results
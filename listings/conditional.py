@@ -0,0 +1,83 @@
+import hashlib
+
+from django.db.models import Count, Max  # type: ignore
+from django.utils.cache import get_conditional_response  # type: ignore
+from django.utils.http import http_date  # type: ignore
+from rest_framework.response import Response  # type: ignore
+
+
+def _weak_etag(*parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value is not None else None
+
+
+def _set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def _conditional_response(request, etag, last_modified):
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None and response.status_code == 304:
+        _set_validators(response, etag, last_modified)
+    return response
+
+
+def list_etag(request, queryset, *extra):
+    """
+    ETag για μια λίστα από MAX(updated_at) και πλήθος γραμμών, με ένα query.
+    Το πλήθος μπαίνει στο ETag ώστε μια διαγραφή να αλλάζει την τιμή του, ενώ το path
+    (φίλτρα, cursor) και ο χρήστης ώστε να μη μοιράζονται ETags διαφορετικές απαντήσεις.
+    Οι λίστες δεν έχουν Last-Modified: το MAX(updated_at) δεν αλλάζει όταν μια γραμμή
+    διαγράφεται ή παύει να ταιριάζει στα φίλτρα, οπότε ένα If-Modified-Since θα έδινε 304
+    με παλιά λίστα.
+    """
+    state = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+    return _weak_etag(request.get_full_path(), request.user.pk, state['last'], state['count'], *extra)
+
+
+def detail_validators(request, instance):
+    last_modified = _timestamp(instance.updated_at)
+    etag = _weak_etag(instance._meta.label, instance.pk, instance.updated_at, request.user.pk)
+    return etag, last_modified
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET για ListAPIView πάνω σε μοντέλα με updated_at: ETag στην απάντηση
+    και 304 χωρίς σειριοποίηση όταν ο client έχει ήδη την τρέχουσα έκδοση.
+    """
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_validator_extras(self):
+        # Ό,τι άλλο επηρεάζει την απάντηση εκτός από τις γραμμές (μπαίνει στο ETag)
+        return ()
+
+    def get(self, request, *args, **kwargs):
+        etag = list_etag(request, self.get_conditional_queryset(), *self.get_validator_extras())
+        not_modified = _conditional_response(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+        response = super().get(request, *args, **kwargs)
+        return _set_validators(response, etag, None)
+
+
+class ConditionalRetrieveMixin:
+    """Το ίδιο για detail endpoints, με βάση το updated_at της ίδιας της γραμμής."""
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = detail_validators(request, instance)
+        not_modified = _conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return _set_validators(Response(serializer.data), etag, last_modified)
@@ -0,0 +1,287 @@
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings  # type: ignore
+from django.db.models import Q  # type: ignore
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.utils.http import http_date  # type: ignore
+
+from .models import DocumentUpload
+
+
+DEFAULTS = {
+    'CHUNK_MAX': 8 * 1024 * 1024,        # μέγιστο μέγεθος ενός chunk (ένα PUT)
+    'MAX_SIZE': 200 * 1024 * 1024,       # μέγιστο μέγεθος εγγράφου
+    'LOCK_TIMEOUT': 120,                 # δευτερόλεπτα κλειδώματος ενός upload για ένα chunk
+    # None: σερβίρει η Django (FileResponse -> wsgi.file_wrapper/sendfile).
+    # 'x-accel-redirect' (nginx) ή 'x-sendfile' (Apache/lighttpd): σερβίρει ο web server.
+    'SENDFILE': None,
+    'SENDFILE_PREFIX': '/protected-media/',
+}
+
+# Τα έγγραφα αποθηκεύονται με όνομα το sha256 του περιεχομένου τους, οπότε
+# ίδια αρχεία (π.χ. επανάληψη upload) υπάρχουν στον δίσκο μία φορά
+BLOB_DIR = 'documents'
+PARTIAL_DIR = '.uploads'
+BLOCK_SIZE = 64 * 1024
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+# Υπογραφές για το Content-Type των downloads (τα blobs δεν έχουν επέκταση)
+SIGNATURES = (
+    (b'%PDF', 'application/pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'II*\x00', 'image/tiff'),
+    (b'MM\x00*', 'image/tiff'),
+)
+
+# Hashers των uploads σε εξέλιξη: upload id -> (offset, hasher). Αν το επόμενο chunk
+# έρθει σε άλλο process, το hash υπολογίζεται στο τέλος διαβάζοντας το αρχείο.
+_hashers = {}
+MAX_HASHERS = 1000
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'DOCUMENTS', {})}
+
+
+def _root():
+    return str(settings.MEDIA_ROOT)
+
+
+def blob_name(digest):
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}'
+
+
+def partial_path(upload):
+    return os.path.join(_root(), PARTIAL_DIR, f'{upload.pk}.part')
+
+
+def _commit(path, digest):
+    """Μετακινεί το αρχείο στη θέση του blob ή το σβήνει αν το blob υπάρχει ήδη."""
+    name = blob_name(digest)
+    target = os.path.join(_root(), name)
+    if os.path.exists(target):
+        os.remove(path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+    return name
+
+
+def store_chunks(chunks):
+    """Γράφει τα chunks στον δίσκο υπολογίζοντας ταυτόχρονα το sha256 και επιστρέφει το όνομα του blob."""
+    directory = os.path.join(_root(), PARTIAL_DIR)
+    os.makedirs(directory, exist_ok=True)
+    hasher = hashlib.sha256()
+    fd, path = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            for chunk in chunks:
+                hasher.update(chunk)
+                handle.write(chunk)
+        return _commit(path, hasher.hexdigest())
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def store_uploaded_file(uploaded):
+    """Για multipart uploads (request.FILES): η Django τα έχει ήδη σε temp file πάνω από 2.5MB."""
+    return store_chunks(uploaded.chunks(BLOCK_SIZE))
+
+
+# --- Resumable uploads ---
+
+def parse_content_range(header):
+    """'bytes start-end/total' -> (start, end, total) ή None."""
+    match = CONTENT_RANGE.match(header or '')
+    if not match:
+        return None
+    start, end, total = map(int, match.groups())
+    if start > end or end >= total:
+        return None
+    return start, end, total
+
+
+def acquire(upload, start):
+    """Κλειδώνει το upload για το chunk που ξεκινά στο start. False αν το offset δεν ταιριάζει ή άλλο request γράφει."""
+    now = timezone.now()
+    return bool(
+        DocumentUpload.objects.filter(pk=upload.pk, received=start, completed_at__isnull=True)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(locked_until=now + timedelta(seconds=config()['LOCK_TIMEOUT']))
+    )
+
+
+def write_chunk(upload, stream, start, length):
+    """
+    Γράφει length bytes από το stream στο offset start του αρχείου του upload, σε blocks
+    των 64KB (χωρίς να φορτώνεται το chunk στη μνήμη). Επιστρέφει πόσα bytes γράφτηκαν.
+    """
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    offset, hasher = _hashers.pop(upload.pk, (None, None))
+    if start == 0:
+        hasher = hashlib.sha256()
+    elif offset != start:
+        hasher = None
+
+    written = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as handle:
+        # Ό,τι έμεινε από ένα διακομμένο chunk πετιέται
+        handle.seek(start)
+        handle.truncate()
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            handle.write(block)
+            if hasher is not None:
+                hasher.update(block)
+            written += len(block)
+
+    if hasher is not None and written == length:
+        if len(_hashers) >= MAX_HASHERS:
+            _hashers.pop(next(iter(_hashers)))
+        _hashers[upload.pk] = (start + length, hasher)
+    return written
+
+
+def release(upload, received):
+    DocumentUpload.objects.filter(pk=upload.pk).update(received=received, locked_until=None)
+    upload.received = received
+
+
+def _file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def complete(upload):
+    """Ολοκληρώνει ένα upload: blob με βάση το sha256 και σύνδεση με το πεδίο της συναλλαγής."""
+    path = partial_path(upload)
+    offset, hasher = _hashers.pop(upload.pk, (None, None))
+    digest = hasher.hexdigest() if hasher is not None and offset == upload.size else _file_digest(path)
+    name = _commit(path, digest)
+
+    upload.sha256 = digest
+    upload.completed_at = timezone.now()
+    upload.save(update_fields=['sha256', 'completed_at'])
+    transaction = upload.transaction
+    getattr(transaction, upload.field).name = name
+    transaction.save(update_fields=[upload.field, 'updated_at'])
+    return name
+
+
+# --- Downloads ---
+
+def parse_range(header, size):
+    """
+    Ένα byte range ('bytes=a-b', 'bytes=a-', 'bytes=-n') -> (start, end) ή None για
+    ολόκληρο το αρχείο. Πολλαπλά ranges σερβίρονται ως ολόκληρο αρχείο (RFC 9110 14.2).
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end and first and last:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            block = handle.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def content_type(path):
+    with open(path, 'rb') as handle:
+        head = handle.read(8)
+    for signature, value in SIGNATURES:
+        if head.startswith(signature):
+            return value
+    return 'application/octet-stream'
+
+
+def serve(request, name, filename):
+    """
+    Απάντηση για το αρχείο name (σχετικό με το MEDIA_ROOT) με υποστήριξη Range/If-Range.
+    Με DOCUMENTS['SENDFILE'] το σώμα το στέλνει ο web server και η Django δίνει μόνο headers.
+    """
+    options = config()
+    path = os.path.join(_root(), name)
+    stat = os.stat(path)
+    ctype = content_type(path)
+    blob = name.startswith(BLOB_DIR + '/')
+    etag = f'"{os.path.basename(name)}"' if blob else f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+    if not os.path.splitext(filename)[1]:
+        filename += mimetypes.guess_extension(ctype) or ''
+
+    if options['SENDFILE'] == 'x-accel-redirect':
+        response = HttpResponse(content_type=ctype)
+        response['X-Accel-Redirect'] = options['SENDFILE_PREFIX'] + name
+    elif options['SENDFILE'] == 'x-sendfile':
+        response = HttpResponse(content_type=ctype)
+        response['X-Sendfile'] = path
+    else:
+        response = _range_response(request, path, stat.st_size, etag, ctype)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'private, max-age=0'
+    return response
+
+
+def _range_response(request, path, size, etag, ctype):
+    header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag:
+        header = None
+    try:
+        byte_range = parse_range(header, size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        # Ολόκληρο αρχείο: το FileResponse χρησιμοποιεί το wsgi.file_wrapper (sendfile) όπου υπάρχει
+        return FileResponse(open(path, 'rb'), content_type=ctype)
+    start, end = byte_range
+    response = StreamingHttpResponse(_iter_range(path, start, end - start + 1), status=206,
+                                     content_type=ctype)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    return response
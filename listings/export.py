@@ -0,0 +1,110 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder  # type: ignore
+from django.http import StreamingHttpResponse  # type: ignore
+from django.utils import timezone  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+
+# Γραμμές ανά fetch από τη βάση (server-side cursor σε PostgreSQL)
+CHUNK_SIZE = 2000
+
+# Γραμμές ανά κομμάτι της απάντησης, ώστε να μη γίνεται ένα write ανά γραμμή
+ROWS_PER_WRITE = 200
+
+# Στήλη export -> lookup του values(). Οι joins γίνονται στο ίδιο query (όχι N+1).
+TRANSACTION_COLUMNS = {
+    'id': 'id',
+    'property_id': 'property_id',
+    'property_title': 'property__title',
+    'property_city': 'property__city',
+    'buyer_id': 'buyer_id',
+    'buyer_name': 'buyer__name',
+    'agent_id': 'agent_id',
+    'status': 'status',
+    'deposit_amount': 'deposit_amount',
+    'deposit_paid': 'deposit_paid',
+    'final_contract_doc': 'final_contract_doc',
+    'proof_of_payment_doc': 'proof_of_payment_doc',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class _Echo:
+    """Ψευδο-αρχείο για το csv.writer: το write επιστρέφει τη γραμμή αντί να τη γράφει."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    lookups = list(columns.values())
+    for row in queryset.values_list(*lookups).iterator(chunk_size=chunk_size):
+        yield row
+
+
+# Κελιά κειμένου που τα Excel/LibreOffice θα εκτελούσαν ως τύπους (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _grouped(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_lines(rows, columns):
+    writer = csv.writer(_Echo())
+    # BOM ώστε το Excel να ανοίγει σωστά τα ελληνικά
+    yield '\ufeff' + writer.writerow(list(columns))
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def jsonl_lines(rows, columns):
+    names = list(columns)
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+def parse_format(params):
+    fmt = params.get('output', 'csv')
+    if fmt not in FORMATS:
+        raise ValidationError({'output': f"Must be one of: {', '.join(FORMATS)}"})
+    return fmt
+
+
+def streaming_export(queryset, columns, fmt, name):
+    """
+    StreamingHttpResponse που διαβάζει το queryset σε chunks και στέλνει CSV ή JSONL
+    καθώς διαβάζει, οπότε η μνήμη μένει σταθερή ανεξάρτητα από το πλήθος γραμμών.
+    """
+    rows = iter_rows(queryset, columns)
+    lines = csv_lines(rows, columns) if fmt == 'csv' else jsonl_lines(rows, columns)
+    response = StreamingHttpResponse(_grouped(lines), content_type=FORMATS[fmt])
+    filename = f"{name}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
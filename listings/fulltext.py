@@ -0,0 +1,117 @@
+import re
+import unicodedata
+
+from django.db import connection  # type: ignore
+
+
+FTS_TABLE = 'listings_property_fts'
+
+# Βάρη για το ranking: τίτλος > keywords > περιγραφές
+TITLE_WEIGHT = 10.0
+KEYWORDS_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(text):
+    """
+    Κανονικοποίηση για αναζήτηση: πεζά, χωρίς τόνους/διαλυτικά και τελικό σίγμα -> σ,
+    ώστε "Σπίτι", "σπιτι" και "ΣΠΊΤΙ" να ταιριάζουν μεταξύ τους.
+    """
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFD', str(text))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize('NFC', stripped).lower().replace('ς', 'σ')
+
+
+def is_supported():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def _document(title, short_description, full_description, keywords):
+    if isinstance(keywords, (list, tuple)):
+        keywords = ' '.join(str(k) for k in keywords)
+    body = ' '.join(filter(None, [short_description, full_description]))
+    return normalize(title), normalize(body), normalize(keywords)
+
+
+def index_property(property_id, title, short_description, full_description, keywords, conn=connection):
+    """Ενημερώνει (upsert) τη γραμμή ενός ακινήτου στο full-text index."""
+    index_properties([(property_id, title, short_description, full_description, keywords)], conn=conn)
+
+
+def index_properties(rows, conn=connection):
+    """
+    Upsert πολλών ακινήτων με executemany. Κάθε γραμμή είναι
+    (property_id, title, short_description, full_description, keywords).
+    """
+    documents = [(row[0], *_document(*row[1:])) for row in rows]
+    if not documents:
+        return
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[doc[0]] for doc in documents])
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, body, keywords) VALUES (%s, %s, %s, %s)",
+                [list(doc) for doc in documents],
+            )
+        elif conn.vendor == 'postgresql':
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (property_id, document) VALUES (%s, "
+                f"setweight(to_tsvector('simple', %s), 'A') || "
+                f"setweight(to_tsvector('simple', %s), 'B') || "
+                f"setweight(to_tsvector('simple', %s), 'C')) "
+                f"ON CONFLICT (property_id) DO UPDATE SET document = EXCLUDED.document",
+                [[property_id, title, keywords, body] for property_id, title, body, keywords in documents],
+            )
+
+
+def remove_property(property_id, conn=connection):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [property_id])
+        elif conn.vendor == 'postgresql':
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE property_id = %s", [property_id])
+
+
+def remove_for_property(sender, instance, **kwargs):
+    # post_delete: καλύπτει και τα QuerySet.delete() και τα cascades από Seller/User
+    if is_supported():
+        remove_property(instance.pk)
+
+
+def query_terms(text):
+    return WORD_RE.findall(normalize(text))
+
+
+def search(text, limit=20):
+    """
+    Επιστρέφει λίστα (property_id, score) ταξινομημένη κατά relevance.
+    Κάθε λέξη του query ταιριάζει και ως πρόθεμα ("αθη" -> "αθηνα"), ώστε
+    το endpoint να δουλεύει ανά πληκτρολόγηση.
+    """
+    terms = query_terms(text)
+    if not terms:
+        return []
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            match = ' '.join(f'"{term}"*' for term in terms)
+            # Το bm25() επιστρέφει αρνητικές τιμές: μικρότερο = πιο σχετικό
+            cursor.execute(
+                f"SELECT rowid, -bm25({FTS_TABLE}, %s, %s, %s) AS score FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s ORDER BY score DESC LIMIT %s",
+                [TITLE_WEIGHT, BODY_WEIGHT, KEYWORDS_WEIGHT, match, limit],
+            )
+        elif connection.vendor == 'postgresql':
+            tsquery = ' & '.join(f'{term}:*' for term in terms)
+            cursor.execute(
+                f"SELECT property_id, ts_rank(document, to_tsquery('simple', %s)) AS score FROM {FTS_TABLE} "
+                f"WHERE document @@ to_tsquery('simple', %s) ORDER BY score DESC LIMIT %s",
+                [tsquery, tsquery, limit],
+            )
+        else:
+            return []
+        return [(row[0], float(row[1])) for row in cursor.fetchall()]
@@ -0,0 +1,137 @@
+import math
+
+from django.db.models import Q  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+# Μέγεθος κελιού του grid σε μοίρες (~1.1km σε γεωγραφικό πλάτος)
+CELL_SIZE = 0.01
+
+# Πάνω από τόσα κελιά το IN (...) παύει να συμφέρει και φιλτράρουμε μόνο με lat/lng range
+MAX_CELLS = 400
+
+
+def parse_coordinates(value):
+    """
+    Εξάγει (lat, lng) από το Property.coordinates. Υποστηρίζει {"lat", "lng"},
+    {"latitude", "longitude"} και [lat, lng]. Επιστρέφει None αν δεν είναι έγκυρο.
+    """
+    if not value:
+        return None
+    if isinstance(value, dict):
+        lat = value.get('lat', value.get('latitude'))
+        lng = value.get('lng', value.get('lon', value.get('longitude')))
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        lat, lng = value
+    else:
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def _cell_index(lat, lng):
+    row = int(math.floor((lat + 90) / CELL_SIZE))
+    col = int(math.floor((lng + 180) / CELL_SIZE))
+    return row, col
+
+
+def cell_key(lat, lng):
+    row, col = _cell_index(lat, lng)
+    return f'{row}:{col}'
+
+
+def cells_for_bbox(min_lat, min_lng, max_lat, max_lng):
+    """Τα κλειδιά των κελιών που καλύπτουν το bbox ή None αν είναι πάρα πολλά."""
+    min_row, min_col = _cell_index(min_lat, min_lng)
+    max_row, max_col = _cell_index(max_lat, max_lng)
+    if (max_row - min_row + 1) * (max_col - min_col + 1) > MAX_CELLS:
+        return None
+    return [
+        f'{row}:{col}'
+        for row in range(min_row, max_row + 1)
+        for col in range(min_col, max_col + 1)
+    ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bbox_around(lat, lng, radius_km):
+    """
+    Το bbox που περικλείει τον κύκλο ακτίνας radius_km γύρω από το (lat, lng).
+    Κοντά στον αντιμεσημβρινό επιστρέφει min_lng > max_lng (βλ. filter_bbox).
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(lat))
+    dlng = 180.0 if cos_lat < 1e-6 else radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    if dlng >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lng, max_lng = lng - dlng, lng + dlng
+    if min_lng < -180.0:
+        min_lng += 360.0
+    if max_lng > 180.0:
+        max_lng -= 360.0
+    return min_lat, min_lng, max_lat, max_lng
+
+
+def _lng_ranges(min_lng, max_lng):
+    # min_lng > max_lng: το bbox περνά τον αντιμεσημβρινό και χωρίζεται σε δύο τμήματα
+    if min_lng > max_lng:
+        return [(min_lng, 180.0), (-180.0, max_lng)]
+    return [(min_lng, max_lng)]
+
+
+def filter_bbox(queryset, min_lat, min_lng, max_lat, max_lng):
+    ranges = _lng_ranges(min_lng, max_lng)
+    cells = [cells_for_bbox(min_lat, low, max_lat, high) for low, high in ranges]
+    if None not in cells and sum(map(len, cells)) <= MAX_CELLS:
+        queryset = queryset.filter(geo_cell__in=[key for part in cells for key in part])
+    longitude = Q()
+    for low, high in ranges:
+        longitude |= Q(longitude__gte=low, longitude__lte=high)
+    return queryset.filter(longitude, latitude__gte=min_lat, latitude__lte=max_lat)
+
+
+def within_radius(queryset, lat, lng, radius_km, limit):
+    """
+    Επιστρέφει λίστα (property_id, distance_km) ταξινομημένη κατά απόσταση.
+    Πρώτα περιορίζουμε με τα κελιά/bbox στη βάση και μετά υπολογίζουμε την ακριβή
+    απόσταση haversine μόνο για τους υποψήφιους.
+    """
+    candidates = filter_bbox(queryset, *bbox_around(lat, lng, radius_km)).values_list('id', 'latitude', 'longitude')
+    matches = []
+    for property_id, plat, plng in candidates.iterator():
+        distance = haversine_km(lat, lng, plat, plng)
+        if distance <= radius_km:
+            matches.append((property_id, distance))
+    matches.sort(key=lambda item: (item[1], item[0]))
+    return matches[:limit]
+
+
+def parse_float(params, name, minimum, maximum, required=True, default=None):
+    value = params.get(name)
+    if value in (None, ''):
+        if required:
+            raise ValidationError({name: "This parameter is required."})
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValidationError({name: f"Invalid number: {value}"})
+    if math.isnan(number) or not (minimum <= number <= maximum):
+        raise ValidationError({name: f"Must be between {minimum} and {maximum}."})
+    return number
@@ -0,0 +1,262 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings  # type: ignore
+from django.urls import reverse  # type: ignore
+
+try:
+    from PIL import Image, ImageOps  # type: ignore
+except ImportError:  # Pillow είναι προαιρετικό: χωρίς αυτό σερβίρονται τα originals
+    Image = ImageOps = None
+
+
+DEFAULTS = {
+    'ROOT': None,                       # default: MEDIA_ROOT/derivatives
+    'MAX_BYTES': 512 * 1024 * 1024,     # όριο της cache στον δίσκο (LRU eviction)
+    'WORKERS': 2,                       # processes για decode/resize/encode
+    'RENDER_TIMEOUT': 20,
+    'SOURCE_TIMEOUT': 10,
+    'MAX_SOURCE_BYTES': 25 * 1024 * 1024,
+    'SOURCE_HOSTS': (),                 # hosts από τους οποίους επιτρέπεται λήψη (κενό: καμία λήψη)
+    'MEDIA_HOSTS': (),                  # hosts των URLs που αντιστοιχούν στο MEDIA_ROOT (πέρα από τα σκέτα paths)
+    'MEDIA_DIR': 'properties',          # υποφάκελος του MEDIA_ROOT με τις εικόνες ακινήτων
+}
+
+# Μέγεθος -> (πλάτος, ύψος) που χωράει η εικόνα (χωρίς crop)
+SIZES = {
+    'thumb': (320, 240),
+    'medium': (1024, 768),
+}
+
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Η ανανέωση του mtime (σειρά του LRU) γίνεται το πολύ μία φορά ανά TOUCH_INTERVAL
+TOUCH_INTERVAL = 3600
+# Μετά από eviction η cache κατεβαίνει στο 90% του ορίου, ώστε να μη γίνεται σε κάθε νέο αρχείο
+EVICT_TARGET = 0.9
+
+_pool = None
+_inflight = {}
+_lock = threading.Lock()
+_usage = None
+
+
+class ImageUnavailable(Exception):
+    """Δεν μπορεί να παραχθεί παράγωγο (χωρίς Pillow, μη επιτρεπτή πηγή, σφάλμα λήψης ή decode)."""
+
+
+def config():
+    options = {**DEFAULTS, **getattr(settings, 'IMAGE_DERIVATIVES', {})}
+    options['ROOT'] = str(options['ROOT'] or os.path.join(settings.MEDIA_ROOT, 'derivatives'))
+    return options
+
+
+def version(source):
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:40]
+
+
+def thumbnail_url(property_id, source):
+    """URL του thumbnail της πρώτης εικόνας για τις λίστες ή None. Το ?v= αλλάζει όταν αλλάξει η εικόνα."""
+    if not isinstance(source, str) or not source:
+        return None
+    return f"{reverse('property-image', args=[property_id, 0, 'thumb'])}?v={version(source)[:12]}"
+
+
+def negotiate(accept):
+    return 'webp' if 'image/webp' in (accept or '') else 'jpeg'
+
+
+def derivative_path(root, source, size, fmt):
+    key = version(source)
+    return os.path.join(root, key[:2], f'{key}-{size}.{fmt}')
+
+
+def derivative(source, size, fmt):
+    """
+    Διαδρομή του παραγώγου στον δίσκο. Αν δεν υπάρχει, παράγεται στο process pool: το
+    request thread μόνο περιμένει, ενώ ταυτόχρονα requests για το ίδιο παράγωγο μοιράζονται
+    την ίδια εργασία.
+    """
+    options = config()
+    # Έλεγχος της πηγής πριν από την cache, ώστε να μη σερβίρεται παράγωγο μιας πηγής που δεν επιτρέπεται πια
+    local = _local_source(source, options)
+    if local is None:
+        _check_remote(source, options)
+    path = derivative_path(options['ROOT'], source, size, fmt)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        pass
+    else:
+        if time.time() - stat.st_mtime > TOUCH_INTERVAL:
+            os.utime(path)
+        return path
+
+    if Image is None:
+        raise ImageUnavailable('Pillow is not installed.')
+
+    with _lock:
+        future = _inflight.get(path)
+        if future is None:
+            future = _inflight[path] = _executor(options).submit(
+                render, local or source, path, SIZES[size], fmt, options['SOURCE_TIMEOUT'], options['MAX_SOURCE_BYTES'],
+                tuple(options['SOURCE_HOSTS']),
+            )
+    try:
+        written = future.result(timeout=options['RENDER_TIMEOUT'])
+    except ImageUnavailable:
+        raise
+    except Exception as exc:
+        raise ImageUnavailable(str(exc)) from exc
+    finally:
+        with _lock:
+            if _inflight.get(path) is future and future.done():
+                del _inflight[path]
+    _account(options, written)
+    return path
+
+
+def _executor(options):
+    global _pool
+    if _pool is None:
+        # spawn: τα workers δεν κληρονομούν threads/συνδέσεις του web process
+        _pool = ProcessPoolExecutor(max_workers=options['WORKERS'], mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def _local_source(source, options):
+    """
+    Αρχείο στο MEDIA_ROOT για URLs κάτω από το MEDIA_URL (σκέτο path ή host του MEDIA_HOSTS),
+    αλλιώς None. Μόνο μέσα στο MEDIA_DIR: το endpoint είναι δημόσιο, ενώ στο MEDIA_ROOT
+    βρίσκονται και ιδιωτικά αρχεία (συμβόλαια, αποδεικτικά πληρωμής, έγγραφα συναλλαγών).
+    """
+    parts = urllib.parse.urlsplit(source)
+    if (parts.scheme or parts.netloc) and parts.hostname not in options['MEDIA_HOSTS']:
+        return None
+    if not parts.path.startswith(settings.MEDIA_URL):
+        if parts.scheme or parts.netloc:
+            raise ImageUnavailable('Invalid media path.')
+        return None
+    root = os.path.realpath(os.path.join(settings.MEDIA_ROOT, options['MEDIA_DIR']))
+    local = os.path.realpath(os.path.join(settings.MEDIA_ROOT, urllib.parse.unquote(parts.path[len(settings.MEDIA_URL):])))
+    if not local.startswith(root + os.sep):
+        raise ImageUnavailable('Invalid media path.')
+    return local
+
+
+def _check_remote(source, options):
+    # Μόνο ρητά επιτρεπτοί hosts: το endpoint είναι δημόσιο και η λήψη από οποιονδήποτε
+    # host θα επέτρεπε requests προς εσωτερικές διευθύνσεις (SSRF)
+    _check_host(source, options['SOURCE_HOSTS'])
+
+
+def _check_host(url, hosts):
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        raise ImageUnavailable('Unsupported image URL.')
+    if parts.hostname not in hosts:
+        raise ImageUnavailable('Image host not allowed.')
+
+
+# --- Εκτελούνται στα worker processes ---
+
+class AllowedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Ακολουθεί redirects μόνο προς τους SOURCE_HOSTS, ώστε ένας επιτρεπτός host να μην οδηγεί σε εσωτερικό."""
+
+    def __init__(self, hosts):
+        self.hosts = hosts
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        # Το newurl είναι ήδη απόλυτο (το http_error_30x το ενώνει με το URL του request)
+        _check_host(newurl, self.hosts)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def _read_source(source, timeout, max_bytes, hosts):
+    if os.path.isabs(source):
+        with open(source, 'rb') as handle:
+            data = handle.read(max_bytes + 1)
+    else:
+        opener = urllib.request.build_opener(AllowedRedirectHandler(hosts))
+        with opener.open(source, timeout=timeout) as response:
+            data = response.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ImageUnavailable('Source image too large.')
+    return data
+
+
+def render(source, target, box, fmt, timeout, max_bytes, hosts=()):
+    """Κατεβάζει/διαβάζει την πηγή, τη σμικρύνει ώστε να χωράει στο box και γράφει το target ατομικά."""
+    data = _read_source(source, timeout, max_bytes, hosts)
+    name, _, save_options = FORMATS[fmt]
+    with Image.open(io.BytesIO(data)) as original:
+        # Για JPEG το draft κάνει decode απευθείας σε μικρότερη ανάλυση
+        original.draft('RGB', box)
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail(box, Image.LANCZOS)
+        if fmt == 'jpeg' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        elif fmt == 'webp' and image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary = f'{target}.{os.getpid()}.tmp'
+        image.save(temporary, name, **save_options)
+    os.replace(temporary, target)
+    return os.path.getsize(target)
+
+
+# --- LRU στον δίσκο ---
+
+def _account(options, written):
+    global _usage
+    with _lock:
+        if _usage is None:
+            _usage = disk_usage(options['ROOT'])
+        else:
+            _usage += written
+        over = _usage > options['MAX_BYTES']
+    if over:
+        remaining = evict(options['ROOT'], options['MAX_BYTES'])
+        with _lock:
+            _usage = remaining
+
+
+def _files(root):
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, path
+
+
+def disk_usage(root):
+    return sum(size for _, size, _ in _files(root))
+
+
+def evict(root, max_bytes):
+    """Σβήνει τα λιγότερο πρόσφατα χρησιμοποιημένα παράγωγα (κατά mtime) ώσπου η cache να πέσει στο 90% του ορίου."""
+    files = sorted(_files(root))
+    total = sum(size for _, size, _ in files)
+    target = max_bytes * EVICT_TARGET
+    for _, size, path in files:
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
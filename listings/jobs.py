@@ -0,0 +1,156 @@
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings  # type: ignore
+from django.db import IntegrityError, transaction  # type: ignore
+from django.db.models import F, Q  # type: ignore
+from django.utils import timezone  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'VISIBILITY_TIMEOUT': 300,   # δευτερόλεπτα που μια εργασία μένει κλειδωμένη σε έναν worker
+    'POLL_INTERVAL': 1.0,        # αναμονή του worker όταν η ουρά είναι άδεια
+    'BATCH_SIZE': 10,            # εργασίες ανά claim
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_BASE': 5,           # 5s, 10s, 20s, ... μεταξύ των προσπαθειών
+    'BACKOFF_MAX': 3600,
+}
+
+TASKS = {}
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'JOB_QUEUE', {})}
+
+
+def _model():
+    from .models import Job
+    return Job
+
+
+def task(name, max_attempts=None):
+    """Καταχωρεί μια συνάρτηση ως εργασία. Καλείται με τα πεδία του payload ως kwargs."""
+    def register(func):
+        TASKS[name] = (func, max_attempts)
+        return func
+    return register
+
+
+def enqueue(name, payload=None, delay=0, key=None, max_attempts=None):
+    """
+    Βάζει μια εργασία στην ουρά και επιστρέφει αμέσως. Μέσα σε transaction.atomic() η γραμμή
+    γράφεται στο ίδιο transaction με τον caller, οπότε σε rollback δεν εκτελείται ούτε η εργασία.
+    Εκτός atomic() (τα requests δεν τρέχουν σε transaction, ATOMIC_REQUESTS είναι off) γίνεται
+    commit αμέσως και η εργασία μπορεί να εκτελεστεί ακόμα κι αν ο caller αποτύχει αργότερα.
+    Με key, δεύτερη κλήση για το ίδιο key επιστρέφει την υπάρχουσα εργασία.
+    """
+    if name not in TASKS:
+        raise ValueError(f"Unknown task: {name}")
+    Job = _model()
+    fields = {
+        'task': name,
+        'payload': payload or {},
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'max_attempts': max_attempts or TASKS[name][1] or config()['MAX_ATTEMPTS'],
+    }
+    if key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(key=key, **fields)
+    except IntegrityError:
+        return Job.objects.get(key=key)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def backoff(attempts):
+    options = config()
+    delay = min(options['BACKOFF_BASE'] * 2 ** (attempts - 1), options['BACKOFF_MAX'])
+    # Jitter ώστε εργασίες που απέτυχαν μαζί να μην ξαναδοκιμάζονται ταυτόχρονα
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim(worker, limit=None):
+    """
+    Κλειδώνει έως limit εργασίες για τον worker: όσες είναι queued και έτοιμες ή running
+    με ληγμένο visibility timeout. Το κλείδωμα είναι conditional UPDATE ανά γραμμή, οπότε
+    δύο workers δεν παίρνουν ποτέ την ίδια εργασία (και σε SQLite, χωρίς SELECT FOR UPDATE).
+    """
+    Job = _model()
+    options = config()
+    now = timezone.now()
+    # Εργασίες που "χάθηκαν" (π.χ. crash του worker) ενώ είχαν εξαντλήσει τις προσπάθειες
+    Job.objects.filter(status='running', locked_until__lt=now, attempts__gte=F('max_attempts')).update(
+        status='failed', last_error='Visibility timeout expired.', locked_until=None, finished_at=now,
+    )
+    available = (
+        Q(status='queued', run_at__lte=now)
+        | Q(status='running', locked_until__lt=now)
+    )
+    candidates = list(
+        Job.objects.filter(available).order_by('run_at', 'id').values_list('id', flat=True)[:limit or options['BATCH_SIZE']]
+    )
+
+    claimed = []
+    for job_id in candidates:
+        updated = Job.objects.filter(available, pk=job_id).update(
+            status='running',
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=options['VISIBILITY_TIMEOUT']),
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(job_id)
+    return list(Job.objects.filter(pk__in=claimed, locked_by=worker).order_by('run_at', 'id'))
+
+
+def run(job, worker):
+    """Εκτελεί μια κλειδωμένη εργασία και καταγράφει το αποτέλεσμα (done, retry ή failed)."""
+    Job = _model()
+    mine = Job.objects.filter(pk=job.pk, locked_by=worker, status='running')
+    try:
+        func = TASKS[job.task][0]
+        func(**job.payload)
+    except Exception as exc:
+        error = ''.join(traceback.format_exception(exc))[-4000:]
+        if job.task not in TASKS or job.attempts >= job.max_attempts:
+            logger.error("Job %s (%s) failed permanently: %s", job.pk, job.task, exc)
+            mine.update(status='failed', last_error=error, locked_until=None, finished_at=timezone.now())
+        else:
+            delay = backoff(job.attempts)
+            logger.warning("Job %s (%s) failed, retrying in %.0fs: %s", job.pk, job.task, delay, exc)
+            mine.update(status='queued', last_error=error, locked_until=None,
+                        run_at=timezone.now() + timedelta(seconds=delay))
+        return False
+    mine.update(status='done', locked_until=None, finished_at=timezone.now())
+    return True
+
+
+def work_once(worker=None, limit=None):
+    """Ένας κύκλος: claim και εκτέλεση. Επιστρέφει πόσες εργασίες εκτελέστηκαν."""
+    worker = worker or worker_name()
+    jobs = claim(worker, limit)
+    for job in jobs:
+        run(job, worker)
+    return len(jobs)
+
+
+def purge(tasks, batch_size=1000):
+    """Σβήνει σε chunks τις ολοκληρωμένες/αποτυχημένες εργασίες των tasks. Επιστρέφει πόσες σβήστηκαν."""
+    Job = _model()
+    finished = Job.objects.filter(task__in=tasks, status__in=('done', 'failed'))
+    deleted = 0
+    while True:
+        ids = list(finished.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += Job.objects.filter(pk__in=ids).delete()[0]
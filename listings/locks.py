@@ -0,0 +1,147 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async  # type: ignore
+from django.conf import settings  # type: ignore
+from django.utils import timezone  # type: ignore
+
+
+# Ένα ακίνητο είναι "κλειδωμένο" για έναν αγοραστή όσο ισχύει κάποιο από:
+#   - Lead.locked_until (ο αγοραστής δήλωσε ότι δεν ενδιαφέρεται, 3 μήνες)
+#   - AgentBuyerAssociation.lock_until με accepted=False (απέρριψε τον μεσίτη, 2 εβδομάδες)
+
+DEFAULTS = {
+    'CACHE_TTL': 30,          # δευτερόλεπτα· οι αλλαγές στο ίδιο process ακυρώνουν αμέσως
+    'CACHE_SIZE': 10000,      # αγοραστές στην τοπική cache (LRU)
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'PROPERTY_LOCKS', {})}
+
+
+def _lock_rows(buyer_id, property_ids=None):
+    """(property_id, until) των ενεργών κλειδωμάτων του αγοραστή, με ένα UNION query στα composite indexes."""
+    from .models import AgentBuyerAssociation, Lead
+    now = timezone.now()
+    leads = Lead.objects.filter(buyer_id=buyer_id, locked_until__gt=now)
+    associations = AgentBuyerAssociation.objects.filter(buyer_id=buyer_id, accepted=False, lock_until__gt=now)
+    if property_ids is not None:
+        leads = leads.filter(property_id__in=property_ids)
+        associations = associations.filter(property_id__in=property_ids)
+    rows = leads.values_list('property_id', 'locked_until').union(
+        associations.values_list('property_id', 'lock_until'), all=True,
+    )
+    locks = {}
+    for property_id, until in rows:
+        if property_id not in locks or until > locks[property_id]:
+            locks[property_id] = until
+    return locks
+
+
+class LockCache:
+    """Τοπική cache buyer -> {property_id: until} με σύντομο TTL και LRU eviction."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, buyer_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(buyer_id)
+            if entry is not None:
+                locks, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(buyer_id)
+                    return locks
+                del self._entries[buyer_id]
+        return None
+
+    def set(self, buyer_id, locks):
+        config = _config()
+        with self._lock:
+            self._entries.pop(buyer_id, None)
+            self._entries[buyer_id] = (locks, time.monotonic() + config['CACHE_TTL'])
+            while len(self._entries) > config['CACHE_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, buyer_id):
+        with self._lock:
+            self._entries.pop(buyer_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+lock_cache = LockCache()
+
+
+def active_locks(buyer_id):
+    """Όλα τα ενεργά κλειδώματα του αγοραστή ({property_id: until}), από την cache όπου γίνεται."""
+    locks = lock_cache.get(buyer_id)
+    if locks is None:
+        locks = _lock_rows(buyer_id)
+        lock_cache.set(buyer_id, locks)
+    now = timezone.now()
+    return {property_id: until for property_id, until in locks.items() if until > now}
+
+
+def locked_properties(buyer_id, property_ids):
+    """Ποια από τα property_ids είναι κλειδωμένα για τον αγοραστή: {property_id: until}."""
+    locks = active_locks(buyer_id)
+    return {property_id: locks[property_id] for property_id in property_ids if property_id in locks}
+
+
+def locked_until(buyer_id, property_id):
+    """Για ελέγχους πριν από εγγραφές: πάντα από τη βάση, όχι από την cache."""
+    return _lock_rows(buyer_id, [property_id]).get(property_id)
+
+
+def digest(buyer_id):
+    """Σταθερό αποτύπωμα των ενεργών κλειδωμάτων, για το ETag των λιστών."""
+    locks = sorted(active_locks(buyer_id).items())
+    return hashlib.sha1(repr(locks).encode('utf-8')).hexdigest()[:16]
+
+
+def annotate(rows, buyer_id):
+    """Προσθέτει locked_until σε κάθε ακίνητο μιας λίστας (dicts της απάντησης), χωρίς query ανά γραμμή."""
+    locks = active_locks(buyer_id)
+    for row in rows:
+        row['locked_until'] = locks.get(row['id'])
+    return rows
+
+
+aannotate = sync_to_async(annotate)
+
+
+def invalidate_for_instance(sender, instance, **kwargs):
+    # post_save/post_delete σε Lead και AgentBuyerAssociation
+    if instance.buyer_id is not None:
+        lock_cache.invalidate(instance.buyer_id)
+
+
+class PropertyLockStateMixin:
+    """
+    Για λίστες ακινήτων: όταν ο χρήστης είναι αγοραστής, κάθε γραμμή παίρνει locked_until.
+    Εφαρμόζεται μετά την response cache (που είναι κοινή για όλους τους χρήστες) και μπαίνει
+    στο ETag ώστε μια αλλαγή κλειδώματος να μη δίνει 304 με παλιά κατάσταση.
+    """
+
+    def get_buyer_id(self):
+        buyer = getattr(self.request.user, 'buyer', None)
+        return buyer.id if buyer is not None else None
+
+    def get_validator_extras(self):
+        buyer_id = self.get_buyer_id()
+        return (*super().get_validator_extras(), digest(buyer_id)) if buyer_id else super().get_validator_extras()
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        buyer_id = self.get_buyer_id()
+        if buyer_id and response.status_code == 200 and isinstance(getattr(response, 'data', None), dict):
+            annotate(response.data.get('results', []), buyer_id)
+        return response
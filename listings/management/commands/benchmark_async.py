@@ -0,0 +1,130 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings  # type: ignore
+from django.contrib.auth.models import User  # type: ignore
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.test import AsyncClient, Client, override_settings  # type: ignore
+from django.urls import reverse  # type: ignore
+from rest_framework.authtoken.models import Token  # type: ignore
+
+from listings.authentication import token_cache
+
+
+# (sync url name, async url name, query params)
+ENDPOINTS = (
+    ('property-list', 'async-property-list', {}),
+    ('property-search', 'async-property-search', {'ordering': 'price'}),
+    ('seller_dashboard', 'async-seller-dashboard', {}),
+    ('agent_dashboard', 'async-agent-dashboard', {}),
+    ('seller_visit_requests', 'async-seller-visit-requests', {}),
+    ('support_message_list', 'async-support-message-list', {'ticket': 1}),
+)
+
+
+def _summary(latencies, elapsed, statuses):
+    latencies = sorted(latencies)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 2),
+        'p95_ms': round(quantiles[94] * 1000, 2),
+        'p99_ms': round(quantiles[98] * 1000, 2),
+        'statuses': statuses,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Συγκρίνει sync (WSGI) και async (ASGI) εκδόσεις των read endpoints στα ίδια δεδομένα: "
+        "N ταυτόχρονοι clients (threads για WSGI, coroutines για ASGI) ανά endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help="Username με token (π.χ. επαληθευμένος agent)")
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=500, help="Requests ανά endpoint και mode")
+        parser.add_argument('--endpoint', action='append', help="Μόνο αυτά τα sync url names")
+        parser.add_argument('--with-cache', action='store_true', help="Με ενεργή τη response cache των λιστών")
+        parser.add_argument('--output', help="Αποθήκευση των αποτελεσμάτων σε JSON")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user: {options['user']}")
+        token, _ = Token.objects.get_or_create(user=user)
+        headers = {'Authorization': f'Token {token.key}'}
+        endpoints = [e for e in ENDPOINTS if not options['endpoint'] or e[0] in options['endpoint']]
+        listing_cache = {**getattr(settings, 'LISTING_CACHE', {}), 'ENABLED': options['with_cache']}
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], LISTING_CACHE=listing_cache):
+            for sync_name, async_name, params in endpoints:
+                token_cache.clear()
+                results[sync_name] = {
+                    'wsgi': self.run_sync(reverse(sync_name), params, headers, options),
+                    'asgi': self.run_async(reverse(async_name), params, headers, options),
+                }
+                self.report(sync_name, results[sync_name])
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump({'concurrency': options['concurrency'], 'results': results}, handle, indent=2)
+
+    def run_sync(self, url, params, headers, options):
+        def worker(count):
+            client = Client()
+            timings = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.get(url, params, headers=headers)
+                timings.append((time.perf_counter() - started, response.status_code))
+            return timings
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            batches = list(pool.map(worker, self.split(options)))
+        return self.collect([t for batch in batches for t in batch], time.perf_counter() - started)
+
+    def run_async(self, url, params, headers, options):
+        async def worker(count):
+            client = AsyncClient()
+            timings = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.get(url, params, headers=headers)
+                timings.append((time.perf_counter() - started, response.status_code))
+            return timings
+
+        async def run():
+            return await asyncio.gather(*(worker(count) for count in self.split(options)))
+
+        started = time.perf_counter()
+        batches = asyncio.run(run())
+        return self.collect([t for batch in batches for t in batch], time.perf_counter() - started)
+
+    @staticmethod
+    def split(options):
+        concurrency = max(1, min(options['concurrency'], options['requests']))
+        base, extra = divmod(options['requests'], concurrency)
+        return [base + (1 if i < extra else 0) for i in range(concurrency)]
+
+    @staticmethod
+    def collect(timings, elapsed):
+        statuses = {}
+        for _, status in timings:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        return _summary([latency for latency, _ in timings], elapsed, statuses)
+
+    def report(self, name, result):
+        for mode in ('wsgi', 'asgi'):
+            row = result[mode]
+            self.stdout.write(
+                f"{name:<24} {mode}  {row['throughput_rps']:>8} req/s  p50 {row['p50_ms']:>8}ms  "
+                f"p95 {row['p95_ms']:>8}ms  p99 {row['p99_ms']:>8}ms  {row['statuses']}"
+            )
@@ -0,0 +1,84 @@
+import json
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.db import connection  # type: ignore
+from django.test import override_settings  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from listings import benchmark, synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark όλων των endpoints του listings/urls.py σε συνθετικά δεδομένα διαφόρων μεγεθών. "
+        "Κάθε scale τρέχει σε νέα test βάση (SQLite in-memory ή --database-file), ποτέ στη βάση του project. "
+        "Αναφέρει p50/p95/p99 χρόνου, queries και bytes ανά request και γράφει τα αποτελέσματα σε JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100,1000', help="Πλήθη ακινήτων, χωρισμένα με κόμμα")
+        parser.add_argument('--requests', type=int, default=50, help="Μετρημένα requests ανά endpoint")
+        parser.add_argument('--warmup', type=int, default=1, help="Requests ανά endpoint πριν από τη μέτρηση")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--endpoint', action='append', help="Μόνο αυτά τα url names")
+        parser.add_argument('--with-cache', action='store_true', help="Με ενεργή τη response cache των λιστών")
+        parser.add_argument('--database-file', help="Αρχείο SQLite για τη βάση του benchmark (σβήνεται στο τέλος)")
+        parser.add_argument('--output', default='benchmark-endpoints.json', help="Αρχείο JSON των αποτελεσμάτων")
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(value) for value in options['scales'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError("--scales must be a comma separated list of integers.")
+        if not scales or min(scales) < 1 or options['requests'] < 1:
+            raise CommandError("--scales and --requests must be positive.")
+        names = {name for name, _ in benchmark.endpoints()}
+        unknown = set(options['endpoint'] or ()) - names
+        if unknown:
+            raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+        report = {
+            'started_at': timezone.now().isoformat(),
+            'vendor': connection.vendor,
+            'seed': options['seed'],
+            'requests': options['requests'],
+            'warmup': options['warmup'],
+            'with_cache': options['with_cache'],
+            'scales': [],
+        }
+        for scale in scales:
+            report['scales'].append(self.run_scale(scale, options))
+            # Μετά από κάθε scale, ώστε ένα διακομμένο run να κρατά ό,τι μετρήθηκε
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(f"Results: {options['output']}"))
+
+    def run_scale(self, scale, options):
+        creation = connection.creation
+        original_name = connection.settings_dict['NAME']
+        if options['database_file']:
+            connection.settings_dict['TEST']['NAME'] = options['database_file']
+        creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            started = time.perf_counter()
+            counts = synthetic.seed(scale, options['seed'])
+            seed_seconds = round(time.perf_counter() - started, 2)
+            self.stdout.write(f"Scale {scale}: seeded in {seed_seconds}s {counts}")
+
+            with tempfile.TemporaryDirectory() as media_root, override_settings(**benchmark.settings_overrides(media_root, options['with_cache'])):
+                ctx = benchmark.Context(options['seed'])
+                ctx.setup()
+                endpoints = benchmark.run(ctx, options['requests'], names=options['endpoint'],
+                                          warmup=options['warmup'], progress=self.report)
+        finally:
+            creation.destroy_test_db(original_name, verbosity=0)
+        return {'scale': scale, 'counts': counts, 'seed_seconds': seed_seconds, 'endpoints': endpoints}
+
+    def report(self, name, result):
+        latency, queries = result['latency_ms'], result['queries']
+        self.stdout.write(
+            f"  {result['method']:<6} {name:<34} p50 {latency['p50']:>9}ms  p95 {latency['p95']:>9}ms  "
+            f"p99 {latency['p99']:>9}ms  {queries['mean']:>6} q  {result['bytes']['mean']:>10} B  {result['statuses']}"
+        )
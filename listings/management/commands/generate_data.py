@@ -0,0 +1,75 @@
+import multiprocessing
+import time
+from functools import partial
+
+import django  # type: ignore
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.db import connection, connections  # type: ignore
+
+from listings import synthetic
+
+
+def _init_worker():
+    # Με spawn το process ξεκινά χωρίς Django· με fork το setup() δεν κάνει τίποτα
+    django.setup()
+    # Κάθε process ανοίγει τη δική του σύνδεση στη βάση
+    connections.close_all()
+    if connection.vendor == 'sqlite':
+        # Ένας writer τη φορά στην SQLite: τα chunks περιμένουν το lock αντί για "database is locked".
+        # IMMEDIATE ώστε το lock να παίρνεται στην αρχή του transaction και όχι στη μέση του.
+        connection.settings_dict['OPTIONS'] = {
+            **connection.settings_dict['OPTIONS'], 'timeout': 600, 'transaction_mode': 'IMMEDIATE',
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        "Γράφει συνθετικά δεδομένα κλίμακας στη βάση: --scale ακίνητα με πόλεις/γειτονιές, τιμές, συντεταγμένες "
+        "και ιστορικό (συναλλαγές, leads, επισκέψεις, συσχετίσεις), μαζί με τους πωλητές, αγοραστές και μεσίτες τους. "
+        "Τα chunks παράγονται και εισάγονται με bulk_create από --workers processes· το ίδιο --seed δίνει τα ίδια δεδομένα."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, required=True, help="Πλήθος ακινήτων")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                            help="Worker processes (default: πλήθος CPUs· 1 για εκτέλεση χωρίς processes)")
+
+    def handle(self, *args, **options):
+        if options['scale'] < 1 or options['workers'] < 1:
+            raise CommandError("--scale and --workers must be positive.")
+        ds = synthetic.Dataset.for_database(options['scale'], options['seed'])
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            # Τα processes δεν βλέπουν τη βάση μνήμης του parent
+            self.stdout.write("In-memory database: running without worker processes.")
+            workers = 1
+
+        started = time.perf_counter()
+        total = {}
+        if workers == 1:
+            for name, stage in synthetic.tasks(ds):
+                self.run_stage(name, stage, lambda tasks: (synthetic.run_task(ds, task) for task in tasks), total)
+        else:
+            connections.close_all()
+            with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+                for name, stage in synthetic.tasks(ds):
+                    self.run_stage(name, stage, lambda tasks: pool.imap_unordered(partial(synthetic.run_task, ds), tasks), total)
+        synthetic.finish()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total.get('property', 0)} properties in {elapsed:.1f}s "
+            f"({total.get('property', 0) / elapsed:.0f}/s) with {workers} worker(s)."
+        ))
+        for name, value in total.items():
+            self.stdout.write(f"  {name}: {value}")
+
+    def run_stage(self, name, stage, execute, total):
+        started = time.perf_counter()
+        step = max(len(stage) // 10, 1)
+        for done, counts in enumerate(execute(stage), 1):
+            synthetic.add_counts(total, counts)
+            if done % step == 0 or done == len(stage):
+                self.stdout.write(f"{name}: {done}/{len(stage)} chunks, {time.perf_counter() - started:.1f}s")
+
@@ -0,0 +1,267 @@
+import csv
+import json
+import os
+import time
+
+from django.core.exceptions import ValidationError  # type: ignore
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.db import DatabaseError, models, transaction  # type: ignore
+
+from listings import fulltext, market_stats, response_cache
+from listings.models import Agent, Property, Seller
+
+
+# Εναλλακτικά ονόματα στηλών -> πεδίο του Property
+ALIASES = {
+    'seller_id': 'seller',
+    'agent_id': 'agent',
+    'description': 'full_description',
+}
+
+# Υπολογίζονται από το update_derived_fields() και δεν εισάγονται από το αρχείο
+DERIVED_FIELDS = {'price_per_square_meter'}
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'ναι'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n', 'όχι'}
+
+
+class RowError(Exception):
+    pass
+
+
+def _importable_fields():
+    fields = {}
+    for field in Property._meta.concrete_fields:
+        if field.primary_key or not field.editable or field.name in DERIVED_FIELDS:
+            continue
+        fields[field.name] = field
+    return fields
+
+
+FIELDS = _importable_fields()
+
+
+def _convert(field, value):
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == '':
+        if field.null:
+            return None
+        if field.has_default():
+            return field.get_default()
+        if field.blank and isinstance(field, (models.CharField, models.TextField)):
+            return ''
+        raise RowError('This field is required.')
+
+    if isinstance(field, models.BooleanField) and isinstance(value, str):
+        lowered = value.lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+        raise RowError(f'Invalid boolean: {value}')
+    if isinstance(field, models.JSONField) and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise RowError('Invalid JSON.')
+
+    if field.is_relation:
+        value = field.target_field.to_python(value)
+    else:
+        value = field.to_python(value)
+        # choices και validators (max_length, max_digits, ...) χωρίς queries
+        if value not in field.empty_values:
+            field.validate(value, None)
+        field.run_validators(value)
+    return value
+
+
+def build_property(record, default_seller=None):
+    """Μετατρέπει μια γραμμή του αρχείου σε (μη αποθηκευμένο) Property ή σηκώνει RowError."""
+    values = {}
+    errors = {}
+    for key, raw in record.items():
+        name = ALIASES.get(key, key)
+        field = FIELDS.get(name)
+        if field is None:
+            errors[key] = 'Unknown field.'
+            continue
+        try:
+            values[field.attname] = _convert(field, raw)
+        except RowError as exc:
+            errors[key] = str(exc)
+        except ValidationError as exc:
+            errors[key] = ' '.join(exc.messages)
+
+    if values.get('seller_id') is None and default_seller is not None:
+        values['seller_id'] = default_seller
+    for name, field in FIELDS.items():
+        if field.attname not in values and name not in errors:
+            try:
+                values[field.attname] = _convert(field, None)
+            except RowError as exc:
+                errors[name] = str(exc)
+    if errors:
+        raise RowError(errors)
+
+    instance = Property(**values)
+    instance.update_derived_fields()
+    return instance
+
+
+def read_csv(handle):
+    reader = csv.DictReader(handle)
+    unknown = [name for name in reader.fieldnames or () if ALIASES.get(name, name) not in FIELDS]
+    if unknown:
+        raise CommandError(f"Unknown column(s): {', '.join(unknown)}")
+    for record in reader:
+        yield record
+
+
+def read_jsonl(handle):
+    for line in handle:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield RowError('Invalid JSON line.')
+            continue
+        yield record if isinstance(record, dict) else RowError('Each line must be a JSON object.')
+
+
+class Command(BaseCommand):
+    help = (
+        "Μαζική εισαγωγή ακινήτων από CSV ή JSONL με bulk_create ανά batch. "
+        "Οι λανθασμένες γραμμές καταγράφονται χωρίς να σταματά η εισαγωγή και "
+        "με --resume συνεχίζει από το τελευταίο ολοκληρωμένο batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Αρχείο .csv ή .jsonl")
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help="Προεπιλογή: από την κατάληξη του αρχείου")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seller', type=int, help="Seller για γραμμές χωρίς στήλη seller")
+        parser.add_argument('--errors', help="Αρχείο JSONL για τα σφάλματα ανά γραμμή (προεπιλογή: <path>.errors.jsonl)")
+        parser.add_argument('--state-file', help="Αρχείο προόδου για --resume (προεπιλογή: <path>.import-state)")
+        parser.add_argument('--resume', action='store_true', help="Συνέχεια από το αρχείο προόδου")
+        parser.add_argument('--dry-run', action='store_true', help="Μόνο έλεγχος, χωρίς εγγραφή στη βάση")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        if fmt == 'csv' and not path.endswith('.csv') and not options['format']:
+            raise CommandError("Cannot infer the format, use --format.")
+        self.dry_run = options['dry_run']
+        self.default_seller = options['seller']
+        self.state_path = options['state_file'] or f'{path}.import-state'
+        errors_path = options['errors'] or f'{path}.errors.jsonl'
+
+        state = {'rows': 0, 'imported': 0, 'failed': 0}
+        if options['resume'] and os.path.exists(self.state_path):
+            with open(self.state_path) as handle:
+                state = json.load(handle)
+            self.stdout.write(f"Resuming after row {state['rows']}.")
+        self.state = state
+        self.known_ids = {Seller: set(), Agent: set()}
+        started = time.monotonic()
+
+        with open(path, newline='', encoding='utf-8-sig') as handle, \
+                open(errors_path, 'a' if options['resume'] else 'w', encoding='utf-8') as self.errors:
+            records = read_jsonl(handle) if fmt == 'jsonl' else read_csv(handle)
+            batch = []
+            row_number = 0
+            for row_number, record in enumerate(records, start=1):
+                if row_number <= state['rows']:
+                    continue
+                try:
+                    if isinstance(record, RowError):
+                        raise record
+                    batch.append((row_number, build_property(record, self.default_seller)))
+                except RowError as exc:
+                    self.report(row_number, exc.args[0])
+                if row_number - state['rows'] >= batch_size:
+                    self.flush(batch, row_number)
+                    batch = []
+            if row_number > state['rows']:
+                self.flush(batch, row_number)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {elapsed:.1f}s: {state['imported']} imported, {state['failed']} failed "
+            f"({state['rows']} rows). Errors: {errors_path}"
+        ))
+
+    def report(self, row_number, errors):
+        self.state['failed'] += 1
+        self.errors.write(json.dumps({'row': row_number, 'errors': errors}, ensure_ascii=False) + '\n')
+
+    def check_foreign_keys(self, batch):
+        """Ένα query ανά μοντέλο και batch για seller/agent που δεν έχουμε ήδη δει."""
+        valid = []
+        for model, attname in ((Seller, 'seller_id'), (Agent, 'agent_id')):
+            wanted = {getattr(obj, attname) for _, obj in batch} - {None} - self.known_ids[model]
+            if wanted:
+                self.known_ids[model] |= set(model.objects.filter(pk__in=wanted).values_list('pk', flat=True))
+        for row_number, obj in batch:
+            missing = {
+                name: 'Does not exist.'
+                for model, name, attname in ((Seller, 'seller', 'seller_id'), (Agent, 'agent', 'agent_id'))
+                if getattr(obj, attname) is not None and getattr(obj, attname) not in self.known_ids[model]
+            }
+            if missing:
+                self.report(row_number, missing)
+            else:
+                valid.append((row_number, obj))
+        return valid
+
+    def flush(self, batch, last_row):
+        batch = self.check_foreign_keys(batch)
+        if batch and not self.dry_run:
+            try:
+                with transaction.atomic():
+                    self.insert([obj for _, obj in batch])
+            except DatabaseError:
+                # Αποτυχία του batch: εισαγωγή ανά γραμμή για να βρεθεί η προβληματική
+                inserted = []
+                for row_number, obj in batch:
+                    obj.pk = None
+                    try:
+                        with transaction.atomic():
+                            self.insert([obj])
+                        inserted.append((row_number, obj))
+                    except DatabaseError as exc:
+                        obj.pk = None
+                        self.report(row_number, {'database': str(exc)})
+                batch = inserted
+            response_cache.invalidate(
+                {response_cache.city_scope(obj.city) for _, obj in batch}
+                | {response_cache.seller_scope(obj.seller_id) for _, obj in batch}
+            )
+
+        self.state['imported'] += len(batch)
+        self.state['rows'] = last_row
+        if not self.dry_run:
+            self.save_state()
+        self.stdout.write(f"Row {last_row}: {self.state['imported']} imported, {self.state['failed']} failed")
+
+    def insert(self, objs):
+        Property.objects.bulk_create(objs)
+        market_stats.record_created(objs)
+        if fulltext.is_supported():
+            fulltext.index_properties([
+                (obj.pk, obj.title, obj.short_description, obj.full_description, obj.keywords) for obj in objs
+            ])
+
+    def save_state(self):
+        temporary = f'{self.state_path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(self.state, handle)
+        os.replace(temporary, self.state_path)
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand  # type: ignore
+
+from listings import associations
+
+
+class Command(BaseCommand):
+    help = (
+        "Συνδέει προσωρινές συσχετίσεις μεσιτών (temp_buyer_name/temp_buyer_identification_number) "
+        "με ήδη εγγεγραμμένους αγοραστές, σε batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Αγοραστές ανά batch (default 1000).")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        buyers, claimed = associations.reconcile(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {buyers} buyers, matched {claimed} associations in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand  # type: ignore
+
+from listings import jobs, otp
+
+
+# Εργασίες αποστολής κωδικών: δεν κρατιούνται μετά την ολοκλήρωσή τους
+OTP_TASKS = ('send_lead_otp', 'send_buyer_otp')
+
+
+class Command(BaseCommand):
+    help = "Σβήνει σε chunks τους ληγμένους κωδικούς OTP και τις ολοκληρωμένες εργασίες αποστολής τους (για εκτέλεση από cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="Γραμμές ανά DELETE (default OTP['PURGE_BATCH']).")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or otp.config()['PURGE_BATCH']
+        deleted = otp.purge(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired OTP records."))
+        deleted = jobs.purge(OTP_TASKS, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} finished OTP jobs."))
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand  # type: ignore
+
+from listings import market_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Πλήρης επανυπολογισμός του πίνακα MarketStat από τα ακίνητα. Χρειάζεται μετά από "
+        "μαζικές αλλαγές που δεν περνούν από το Property.save() (π.χ. queryset.update())."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        groups = market_stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {groups} market stat groups in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,69 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand  # type: ignore
+from django.db import connections  # type: ignore
+
+from listings import jobs
+
+
+def _work(options, stop):
+    # Κάθε process ανοίγει τη δική του σύνδεση στη βάση
+    connections.close_all()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker = jobs.worker_name()
+    poll_interval = options['poll_interval'] or jobs.config()['POLL_INTERVAL']
+    while not stop.is_set():
+        processed = jobs.work_once(worker, options['batch_size'])
+        if not processed:
+            if options['burst']:
+                break
+            stop.wait(poll_interval)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Εκτελεί τις εργασίες της ουράς (listings/jobs.py) με N worker processes. "
+        "Με --burst τερματίζει όταν αδειάσει η ουρά."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=None, help="Εργασίες ανά claim (default: JOB_QUEUE['BATCH_SIZE'])")
+        parser.add_argument('--poll-interval', type=float, default=None, help="Αναμονή σε δευτερόλεπτα όταν η ουρά είναι άδεια")
+        parser.add_argument('--burst', action='store_true', help="Τερματισμός όταν δεν υπάρχουν διαθέσιμες εργασίες")
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 1:
+            # Χωρίς fork: χρήσιμο για debugging και για SQLite
+            stop = multiprocessing.Event()
+            self._install_signals(stop)
+            _work(options, stop)
+            return
+
+        stop = multiprocessing.Event()
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_work, args=(options, stop), daemon=True)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self._install_signals(stop)
+        self.stdout.write(f"Started {len(processes)} workers.")
+        try:
+            while any(process.is_alive() for process in processes):
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            stop.set()
+        for process in processes:
+            process.join()
+        self.stdout.write("Workers stopped.")
+
+    @staticmethod
+    def _install_signals(stop):
+        # SIGTERM/SIGINT: οι workers τελειώνουν την τρέχουσα εργασία και σταματούν
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *args: stop.set())
@@ -0,0 +1,219 @@
+import math
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction  # type: ignore
+from django.db.models import Max, Min, Q  # type: ignore
+
+
+# Σχετικό σφάλμα των quantiles του sketch (1%)
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+CENTS = Decimal('0.01')
+
+KEY_FIELDS = ('state', 'city', 'neighborhood', 'property_type')
+
+# Επίπεδα συνάθροισης του endpoint: επίπεδο -> πεδία του κλειδιού που κρατάμε
+LEVELS = {
+    'neighborhood': KEY_FIELDS,
+    'city': ('state', 'city', 'property_type'),
+    'state': ('state', 'property_type'),
+}
+
+
+def _model():
+    from .models import MarketStat
+    return MarketStat
+
+
+# --- Quantile sketch ---
+# Λογαριθμικό ιστόγραμμα τύπου DDSketch: η τιμή x πάει στο bucket ceil(log_gamma(x)),
+# οπότε κάθε quantile έχει σχετικό σφάλμα <= RELATIVE_ACCURACY. Τα sketches
+# συγχωνεύονται προσθέτοντας counts και μια αφαίρεση είναι απλώς μείωση του count.
+
+def bucket(value):
+    return math.ceil(math.log(float(value)) / LOG_GAMMA)
+
+
+def bucket_value(index):
+    return 2 * GAMMA ** index / (GAMMA + 1)
+
+
+def sketch_add(sketch, value, count=1):
+    key = str(bucket(value))
+    remaining = sketch.get(key, 0) + count
+    if remaining > 0:
+        sketch[key] = remaining
+    else:
+        sketch.pop(key, None)
+    return sketch
+
+
+def sketch_merge(*sketches):
+    merged = defaultdict(int)
+    for sketch in sketches:
+        for key, count in sketch.items():
+            merged[key] += count
+    return {key: count for key, count in merged.items() if count > 0}
+
+
+def sketch_quantile(sketch, q):
+    buckets = sorted((int(key), count) for key, count in sketch.items())
+    total = sum(count for _, count in buckets)
+    if not total:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for index, count in buckets:
+        seen += count
+        if seen > rank:
+            return round(bucket_value(index), 2)
+    return round(bucket_value(buckets[-1][0]), 2)
+
+
+# --- Συνεισφορά ενός ακινήτου ---
+
+def contribution(values):
+    """
+    (κλειδί, τιμή/m²) με την οποία μετράει ένα ακίνητο στα στατιστικά ή None.
+    Μετράνε μόνο τα διαθέσιμα (όχι πωλημένα) ακίνητα με θετική τιμή/m².
+    """
+    price = values.get('price_per_square_meter')
+    if values.get('is_sold') or price is None or price <= 0:
+        return None
+    key = tuple(values.get(field) or '' for field in KEY_FIELDS)
+    return key, Decimal(price).quantize(CENTS)
+
+
+def record_change(old, new):
+    """Ενημερώνει τα στατιστικά για την αλλαγή ενός ακινήτου από old σε new (dicts ή None)."""
+    before = contribution(old) if old else None
+    after = contribution(new) if new else None
+    if before == after:
+        return
+    deltas = []
+    if before is not None:
+        deltas.append((*before, -1))
+    if after is not None:
+        deltas.append((*after, 1))
+    apply(deltas)
+
+
+def record_created(properties):
+    """Για ακίνητα που μπήκαν με bulk_create (π.χ. import_properties), που δεν περνά από το save()."""
+    contributions = filter(None, (contribution(prop.current_values()) for prop in properties))
+    apply([(key, price, 1) for key, price in contributions])
+
+
+def record_deleted(sender, instance, **kwargs):
+    # post_delete (και για cascades): αφαιρείται η αποθηκευμένη συνεισφορά του ακινήτου
+    record_change(getattr(instance, '_loaded', None) or instance.current_values(), None)
+
+
+def apply(deltas):
+    """
+    Εφαρμόζει λίστα (κλειδί, τιμή/m², +1/-1). Ένα κλειδωμένο UPDATE ανά ομάδα, ώστε
+    ταυτόχρονες αλλαγές στην ίδια ομάδα να μη χάνονται.
+    """
+    if not deltas:
+        return
+    MarketStat = _model()
+    grouped = defaultdict(list)
+    for key, price, sign in deltas:
+        grouped[key].append((price, sign))
+
+    with transaction.atomic():
+        for key in sorted(grouped):
+            lookup = dict(zip(KEY_FIELDS, key))
+            stat, _ = MarketStat.objects.select_for_update().get_or_create(**lookup)
+            removed_extreme = False
+            for price, sign in grouped[key]:
+                stat.count += sign
+                stat.total += sign * price
+                sketch_add(stat.sketch, price, sign)
+                if sign > 0:
+                    stat.min_price = price if stat.min_price is None else min(stat.min_price, price)
+                    stat.max_price = price if stat.max_price is None else max(stat.max_price, price)
+                elif price in (stat.min_price, stat.max_price):
+                    removed_extreme = True
+            if stat.count <= 0:
+                stat.delete()
+                continue
+            if removed_extreme:
+                # Το min/max δεν αφαιρείται αυξητικά: επανυπολογισμός μόνο για αυτή την ομάδα
+                stat.min_price, stat.max_price = _group_extremes(lookup)
+            stat.save()
+
+
+def _group_extremes(lookup):
+    from .models import Property
+    filters = dict(lookup)
+    neighborhood = filters.pop('neighborhood')
+    queryset = Property.objects.filter(is_sold=False, price_per_square_meter__gt=0, **filters)
+    if neighborhood:
+        queryset = queryset.filter(neighborhood=neighborhood)
+    else:
+        queryset = queryset.filter(Q(neighborhood='') | Q(neighborhood__isnull=True))
+    extremes = queryset.aggregate(low=Min('price_per_square_meter'), high=Max('price_per_square_meter'))
+    return extremes['low'], extremes['high']
+
+
+def rebuild():
+    """Πλήρης επανυπολογισμός του πίνακα με ένα πέρασμα πάνω στα ακίνητα."""
+    from .models import Property
+    MarketStat = _model()
+    groups = {}
+    rows = Property.objects.filter(is_sold=False, price_per_square_meter__gt=0).values_list(
+        *KEY_FIELDS, 'price_per_square_meter',
+    )
+    for *key, price in rows.iterator(chunk_size=5000):
+        key, price = contribution({**dict(zip(KEY_FIELDS, key)), 'price_per_square_meter': price})
+        stat = groups.get(key)
+        if stat is None:
+            stat = groups[key] = MarketStat(**dict(zip(KEY_FIELDS, key)), count=0, total=0, sketch={})
+        stat.count += 1
+        stat.total += price
+        stat.min_price = price if stat.min_price is None else min(stat.min_price, price)
+        stat.max_price = price if stat.max_price is None else max(stat.max_price, price)
+        sketch_add(stat.sketch, price)
+
+    with transaction.atomic():
+        MarketStat.objects.all().delete()
+        MarketStat.objects.bulk_create(groups.values(), batch_size=1000)
+    return len(groups)
+
+
+# --- Ανάγνωση ---
+
+def summarize(stats, level='neighborhood'):
+    """
+    Συγχωνεύει τις γραμμές του πίνακα στο ζητούμενο επίπεδο (neighborhood, city, state)
+    και επιστρέφει count, μέση/ελάχιστη/μέγιστη τιμή/m² και quantiles από τα sketches.
+    """
+    fields = LEVELS[level]
+    merged = {}
+    for stat in stats:
+        key = tuple(getattr(stat, field) for field in fields)
+        group = merged.setdefault(key, {'count': 0, 'total': Decimal('0'), 'min': None, 'max': None, 'sketches': []})
+        group['count'] += stat.count
+        group['total'] += stat.total
+        group['min'] = stat.min_price if group['min'] is None else min(group['min'], stat.min_price)
+        group['max'] = stat.max_price if group['max'] is None else max(group['max'], stat.max_price)
+        group['sketches'].append(stat.sketch)
+
+    results = []
+    for key, group in sorted(merged.items()):
+        sketch = sketch_merge(*group['sketches'])
+        results.append({
+            **dict(zip(fields, key)),
+            'count': group['count'],
+            'avg_price_per_m2': (group['total'] / group['count']).quantize(CENTS),
+            'min_price_per_m2': group['min'],
+            'max_price_per_m2': group['max'],
+            'p25_price_per_m2': sketch_quantile(sketch, 0.25),
+            'median_price_per_m2': sketch_quantile(sketch, 0.5),
+            'p75_price_per_m2': sketch_quantile(sketch, 0.75),
+        })
+    return results
@@ -0,0 +1,203 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import connection  # type: ignore
+
+
+# Μετρήσεις ανά request, ομαδοποιημένες κατά URL name (τα names του listings/urls.py) και
+# method, σε histograms ανά process. Εκτίθενται σε Prometheus text format στο /api/metrics.
+# Τα histograms γεμίζουν μόνο από το δείγμα των requests (SAMPLE_RATE)· ο μετρητής
+# requests_total μετρά όλα τα requests.
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0,     # π.χ. 0.1 σε production: 10% των requests μετρώνται αναλυτικά
+}
+
+PREFIX = 'listings'
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HISTOGRAMS = {
+    'request_duration_seconds': ('Συνολικός χρόνος του request', SECONDS_BUCKETS),
+    'db_queries': ('Πλήθος SQL queries ανά request', QUERY_BUCKETS),
+    'db_duration_seconds': ('Χρόνος στη βάση ανά request', SECONDS_BUCKETS),
+    'serialization_seconds': ('Χρόνος rendering της απάντησης (JSON/CSV)', SECONDS_BUCKETS),
+    'response_bytes': ('Μέγεθος του σώματος της απάντησης', BYTES_BUCKETS),
+}
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'METRICS', {})}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.histograms = {}
+        self.requests = {}
+
+    def count(self, view, method, status):
+        key = (view, method, status)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def observe(self, view, method, values):
+        with self._lock:
+            for name, value in values.items():
+                key = (name, view, method)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+                histogram.observe(value)
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            requests = sorted(self.requests.items())
+            histograms = sorted(
+                (key, list(histogram.counts), histogram.sum) for key, histogram in self.histograms.items()
+            )
+        lines = [
+            f'# HELP {PREFIX}_requests_total Requests ανά view, method και status',
+            f'# TYPE {PREFIX}_requests_total counter',
+        ]
+        for (view, method, status), value in requests:
+            lines.append(f'{PREFIX}_requests_total{{view="{view}",method="{method}",status="{status}"}} {value}')
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            metric = f'{PREFIX}_{name}'
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+            for (histogram_name, view, method), counts, total in histograms:
+                if histogram_name != name:
+                    continue
+                labels = f'view="{view}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(buckets, counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{labels}}} {total:.6f}')
+                lines.append(f'{metric}_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class QueryProbe:
+    """connection.execute_wrapper: πλήθος και χρόνος των queries του request (στο thread του)."""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.render_started = None
+        self.serialization = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.duration += time.perf_counter() - started
+
+    def start_render(self, response):
+        self.render_started = time.perf_counter()
+        response.add_post_render_callback(self.finish_render)
+        return response
+
+    def finish_render(self, response):
+        self.serialization = time.perf_counter() - self.render_started
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    # Μόνο URL names (όχι paths), ώστε το πλήθος των labels να μένει σταθερό
+    return match.view_name or 'unnamed'
+
+
+class MetricsMiddleware:
+    """
+    Μετρά χρόνο, queries, χρόνο βάσης, χρόνο rendering και bytes ανά view. Σε async (ASGI)
+    requests τα queries τρέχουν σε άλλα threads, οπότε μετρώνται μόνο χρόνος και bytes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        options = config()
+        if not options['ENABLED']:
+            return self.get_response(request)
+        if random.random() >= options['SAMPLE_RATE']:
+            response = self.get_response(request)
+            registry.count(view_name(request), request.method, response.status_code)
+            return response
+
+        probe = request._metrics_probe = QueryProbe()
+        started = time.perf_counter()
+        with connection.execute_wrapper(probe):
+            response = self.get_response(request)
+        self.record(request, response, started, probe)
+        return response
+
+    async def __acall__(self, request):
+        options = config()
+        sampled = options['ENABLED'] and random.random() < options['SAMPLE_RATE']
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        if not options['ENABLED']:
+            return response
+        if sampled:
+            self.record(request, response, started, None)
+        else:
+            registry.count(view_name(request), request.method, response.status_code)
+        return response
+
+    def process_template_response(self, request, response):
+        # Οι απαντήσεις του DRF γίνονται render αμέσως μετά από αυτό το hook
+        probe = getattr(request, '_metrics_probe', None)
+        return probe.start_render(response) if probe is not None else response
+
+    def record(self, request, response, started, probe):
+        view, method = view_name(request), request.method
+        values = {'request_duration_seconds': time.perf_counter() - started}
+        if probe is not None:
+            values['db_queries'] = probe.queries
+            values['db_duration_seconds'] = probe.duration
+            if probe.serialization is not None:
+                values['serialization_seconds'] = probe.serialization
+        if not response.streaming:
+            values['response_bytes'] = len(response.content)
+        registry.count(view, method, response.status_code)
+        registry.observe(view, method, values)
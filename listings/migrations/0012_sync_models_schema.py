@@ -0,0 +1,340 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0011_alter_agentbuyerassociation_buyer'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='property',
+            old_name='description',
+            new_name='full_description',
+        ),
+        migrations.RemoveField(
+            model_name='property',
+            name='location',
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='additional_price_notes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='alarm',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='area',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='balcony_area',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='bathrooms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='bedrooms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='buildable_area',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='building_coefficient',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='building_permit',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='city',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='commercial_type',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='condition',
+            field=models.CharField(blank=True, choices=[('underConstruction', 'Υπό κατασκευή'), ('renovated', 'Ανακαινισμένο'), ('needsRenovation', 'Χρήζει ανακαίνισης')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='coordinates',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='coverage_ratio',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='disabled_access',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='elevator',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='elevator_type',
+            field=models.CharField(blank=True, choices=[('passenger', 'Κοινού'), ('freight', 'Φορτίου'), ('both', 'Και τα δύο'), ('none', 'Χωρίς Ανελκυστήρα')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='energy_class',
+            field=models.CharField(blank=True, choices=[('A+', 'A+'), ('A', 'A'), ('B+', 'B+'), ('B', 'B'), ('C', 'C'), ('D', 'D'), ('E', 'E'), ('F', 'F'), ('G', 'G')], max_length=2, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='facade_length',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='fireproof_door',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='floor',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='flooring',
+            field=models.CharField(blank=True, choices=[('tiles', 'Πλακάκι'), ('wooden', 'Παρκέ'), ('marble', 'Μάρμαρο')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='furnished',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='garden',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='has_balcony',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='heating_system',
+            field=models.CharField(blank=True, choices=[('gas', 'Φυσικό Αέριο'), ('oil', 'Πετρέλαιο'), ('electricity', 'Ρεύμα')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='heating_type',
+            field=models.CharField(blank=True, choices=[('autonomous', 'Αυτόνομη'), ('central', 'Κεντρική'), ('heatpump', 'Αντλία Θερμότητας')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='images',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='keywords',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='multiple_floors',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='negotiable',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='neighborhood',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='number',
+            field=models.CharField(default='', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='parking_spaces',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='plot_area',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='plot_category',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='plot_ownership_type',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='pool',
+            field=models.CharField(blank=True, choices=[('private', 'Ιδιωτική'), ('shared', 'Κοινόχρηστη'), ('none', 'Χωρίς Πισίνα')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='postal_code',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='price_per_square_meter',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='property_type',
+            field=models.CharField(choices=[('apartment', 'Διαμέρισμα'), ('house', 'Μονοκατοικία'), ('villa', 'Βίλα'), ('commercial', 'Επαγγελματικός Χώρος'), ('plot', 'Οικόπεδο')], default='apartment', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='renovation_year',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='road_access',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rooms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='security_door',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='shape',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='short_description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='sides',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='soundproofing',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='state',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='storage_type',
+            field=models.CharField(blank=True, choices=[('internal', 'Εσωτερική'), ('external', 'Εξωτερική'), ('none', 'Χωρίς Αποθήκη')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='street',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='suitability',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='terrain',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='thermal_insulation',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='windows',
+            field=models.CharField(blank=True, choices=[('pvc', 'PVC'), ('wooden', 'Ξύλινα'), ('aluminum', 'Αλουμινίου')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='windows_type',
+            field=models.CharField(blank=True, choices=[('insulated', 'Μονωτικά'), ('non_insulated', 'Μη Μονωτικά')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='year_built',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='TransactionProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('INQUIRY', 'Inquiry'), ('APPOINTMENT_SCHEDULED', 'Appointment Scheduled'), ('APPOINTMENT_COMPLETED', 'Appointment Completed'), ('DOCUMENT_CHECK', 'Document Check'), ('PRE_DEPOSIT', 'Pre Deposit'), ('CONTRACT_SIGNING', 'Contract Signing'), ('COMPLETED', 'Completed')], max_length=50)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='progress_updates', to=settings.AUTH_USER_MODEL)),
+                ('transaction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='listings.transaction')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
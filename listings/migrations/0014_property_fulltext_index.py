@@ -0,0 +1,72 @@
+import unicodedata
+
+from django.db import migrations
+
+
+# Αντίγραφο του listings/fulltext.py (index και κανονικοποίηση) όπως ήταν σε αυτό το migration,
+# ώστε μελλοντικές αλλαγές στο module να μην αλλάζουν το ιστορικό migration.
+FTS_TABLE = 'listings_property_fts'
+
+
+def normalize(text):
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFD', str(text))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize('NFC', stripped).lower().replace('ς', 'σ')
+
+
+def document(title, short_description, full_description, keywords):
+    if isinstance(keywords, (list, tuple)):
+        keywords = ' '.join(str(k) for k in keywords)
+    body = ' '.join(filter(None, [short_description, full_description]))
+    return normalize(title), normalize(body), normalize(keywords)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, body, keywords, tokenize='unicode61')"
+        )
+        insert = f"INSERT INTO {FTS_TABLE} (rowid, title, body, keywords) VALUES (%s, %s, %s, %s)"
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {FTS_TABLE} ("
+            f"property_id bigint PRIMARY KEY REFERENCES listings_property(id) ON DELETE CASCADE, "
+            f"document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {FTS_TABLE}_document_idx ON {FTS_TABLE} USING GIN (document)"
+        )
+        insert = (
+            f"INSERT INTO {FTS_TABLE} (property_id, document) VALUES (%s, "
+            f"setweight(to_tsvector('simple', %s), 'A') || "
+            f"setweight(to_tsvector('simple', %s), 'C') || "
+            f"setweight(to_tsvector('simple', %s), 'B'))"
+        )
+    else:
+        return
+    Property = apps.get_model('listings', 'Property')
+    rows = Property.objects.using(schema_editor.connection.alias).values_list(
+        'id', 'title', 'short_description', 'full_description', 'keywords'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        for row in rows.iterator(chunk_size=1000):
+            cursor.execute(insert, [row[0], *document(*row[1:])])
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0013_property_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:30
+
+import math
+
+from django.db import migrations, models
+
+
+# Αντίγραφο των listings.geo.parse_coordinates/cell_key όπως ήταν σε αυτό το migration,
+# ώστε μελλοντικές αλλαγές στο module (π.χ. μέγεθος κελιού) να μην αλλάζουν το backfill.
+CELL_SIZE = 0.01
+
+
+def parse_coordinates(value):
+    if not value:
+        return None
+    if isinstance(value, dict):
+        lat = value.get('lat', value.get('latitude'))
+        lng = value.get('lng', value.get('lon', value.get('longitude')))
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        lat, lng = value
+    else:
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def cell_key(lat, lng):
+    return f'{int(math.floor((lat + 90) / CELL_SIZE))}:{int(math.floor((lng + 180) / CELL_SIZE))}'
+
+
+def backfill_geo_fields(apps, schema_editor):
+    Property = apps.get_model('listings', 'Property')
+    batch = []
+    for prop in Property.objects.exclude(coordinates=None).only('id', 'coordinates').iterator(chunk_size=1000):
+        point = parse_coordinates(prop.coordinates)
+        if point is None:
+            continue
+        prop.latitude, prop.longitude = point
+        prop.geo_cell = cell_key(*point)
+        batch.append(prop)
+        if len(batch) >= 1000:
+            Property.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+            batch = []
+    if batch:
+        Property.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0014_property_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='geo_cell',
+            field=models.CharField(blank=True, editable=False, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['geo_cell'], name='property_geo_cell_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['latitude', 'longitude'], name='property_lat_lng_idx'),
+        ),
+        migrations.RunPython(backfill_geo_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:42
+
+import math
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+# Αντίγραφο της λογικής του listings/market_stats.py όπως ήταν σε αυτό το migration,
+# ώστε μελλοντικές αλλαγές στο module να μην αλλάζουν το ιστορικό migration.
+RELATIVE_ACCURACY = 0.01
+LOG_GAMMA = math.log((1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY))
+CENTS = Decimal('0.01')
+KEY_FIELDS = ('state', 'city', 'neighborhood', 'property_type')
+
+
+def build_market_stats(apps, schema_editor):
+    Property = apps.get_model('listings', 'Property')
+    MarketStat = apps.get_model('listings', 'MarketStat')
+    groups = {}
+    rows = Property.objects.filter(is_sold=False, price_per_square_meter__gt=0).values_list(
+        *KEY_FIELDS, 'price_per_square_meter',
+    )
+    for *key, price in rows.iterator(chunk_size=5000):
+        key = tuple(value or '' for value in key)
+        price = Decimal(price).quantize(CENTS)
+        stat = groups.get(key)
+        if stat is None:
+            stat = groups[key] = MarketStat(**dict(zip(KEY_FIELDS, key)), count=0, total=0, sketch={})
+        stat.count += 1
+        stat.total += price
+        stat.min_price = price if stat.min_price is None else min(stat.min_price, price)
+        stat.max_price = price if stat.max_price is None else max(stat.max_price, price)
+        bucket = str(math.ceil(math.log(float(price)) / LOG_GAMMA))
+        stat.sketch[bucket] = stat.sketch.get(bucket, 0) + 1
+    MarketStat.objects.bulk_create(groups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0015_property_geo_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(max_length=100)),
+                ('city', models.CharField(max_length=100)),
+                ('neighborhood', models.CharField(blank=True, default='', max_length=100)),
+                ('property_type', models.CharField(choices=[('apartment', 'Διαμέρισμα'), ('house', 'Μονοκατοικία'), ('villa', 'Βίλα'), ('commercial', 'Επαγγελματικός Χώρος'), ('plot', 'Οικόπεδο')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('sketch', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['city', 'property_type'], name='market_stat_city_type_idx')],
+                'constraints': [models.UniqueConstraint(fields=('state', 'city', 'neighborhood', 'property_type'), name='market_stat_key_unique')],
+            },
+        ),
+        migrations.RunPython(build_market_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:54
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_ends_at(apps, schema_editor):
+    # Τα υπάρχοντα αιτήματα παίρνουν τη default διάρκεια slot (30')
+    VisitRequest = apps.get_model('listings', 'VisitRequest')
+    VisitRequest.objects.filter(ends_at__isnull=True).update(ends_at=F('scheduled_date') + timedelta(minutes=30))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0018_document_uploads'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('slot_minutes', models.PositiveSmallIntegerField(default=30)),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='visitavailability',
+            name='duration_minutes',
+            field=models.PositiveSmallIntegerField(default=30, help_text='Διάρκεια του slot σε λεπτά'),
+        ),
+        migrations.AddField(
+            model_name='visitrequest',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, help_text='Τέλος του slot της επίσκεψης', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='visitavailability',
+            index=models.Index(fields=['property', 'available_date'], name='visitavail_property_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitrequest',
+            index=models.Index(fields=['property', 'scheduled_date'], name='visitreq_property_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitrequest',
+            index=models.Index(fields=['handler', 'scheduled_date'], name='visitreq_handler_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='visitrule',
+            name='property',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visit_rules', to='listings.property'),
+        ),
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+    ]
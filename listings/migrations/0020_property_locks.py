@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0019_visit_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='agentbuyerassociation',
+            index=models.Index(fields=['buyer', 'property', 'lock_until'], name='assoc_buyer_prop_lock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['buyer', 'property', 'locked_until'], name='lead_buyer_prop_lock_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:00
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Αντίγραφο των listings.associations.normalize_name/normalize_id (και του fulltext.normalize)
+# όπως ήταν σε αυτό το migration, ώστε μελλοντικές αλλαγές τους να μην αλλάζουν το backfill.
+ID_SEPARATORS = re.compile(r'[\s\-./]+')
+
+
+def normalize(text):
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFD', str(text))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize('NFC', stripped).lower().replace('ς', 'σ')
+
+
+def normalize_name(value):
+    return ' '.join(normalize(value).split())
+
+
+def normalize_id(value):
+    return ID_SEPARATORS.sub('', normalize(value))
+
+
+def backfill_match_keys(apps, schema_editor):
+    AgentBuyerAssociation = apps.get_model('listings', 'AgentBuyerAssociation')
+    rows = AgentBuyerAssociation.objects.exclude(temp_buyer_name__isnull=True).only(
+        'id', 'temp_buyer_name', 'temp_buyer_identification_number',
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        row.temp_buyer_name_key = normalize_name(row.temp_buyer_name)
+        row.temp_buyer_id_key = normalize_id(row.temp_buyer_identification_number)
+        batch.append(row)
+        if len(batch) == 2000:
+            AgentBuyerAssociation.objects.bulk_update(batch, ['temp_buyer_name_key', 'temp_buyer_id_key'])
+            batch = []
+    AgentBuyerAssociation.objects.bulk_update(batch, ['temp_buyer_name_key', 'temp_buyer_id_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0020_property_locks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentbuyerassociation',
+            name='temp_buyer_id_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='agentbuyerassociation',
+            name='temp_buyer_name_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='agentbuyerassociation',
+            index=models.Index(condition=models.Q(('buyer__isnull', True)), fields=['temp_buyer_id_key', 'temp_buyer_name_key'], name='assoc_temp_buyer_key_idx'),
+        ),
+        migrations.RunPython(backfill_match_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def delete_plaintext_codes(apps, schema_editor):
+    # Οι παλιοί κωδικοί είναι σε plaintext και χωρίς λήξη: ακυρώνονται (εκδίδονται ξανά από τα endpoints)
+    apps.get_model('listings', 'OTPRecord').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0021_association_match_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_plaintext_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='lead',
+            name='otp_code',
+        ),
+        migrations.RemoveField(
+            model_name='otprecord',
+            name='otp',
+        ),
+        migrations.AddField(
+            model_name='otprecord',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='otprecord',
+            name='code_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='otprecord',
+            name='expires_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='otprecord',
+            name='lead',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='otp_records', to='listings.lead'),
+        ),
+        migrations.AddField(
+            model_name='otprecord',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='otprecord',
+            index=models.Index(fields=['buyer', 'lead', 'expires_at'], name='otp_buyer_lead_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otprecord',
+            index=models.Index(fields=['expires_at'], name='otp_expires_idx'),
+        ),
+    ]
@@ -1,8 +1,10 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 import random
 
+from . import associations, fulltext, geo, market_stats, response_cache
+
 
 
 # Μοντέλο για τους Πωλητές (Ιδιοκτήτες Ακινήτων)
@@ -193,6 +195,10 @@ class Property(models.Model):
     number = models.CharField(max_length=20)
     postal_code = models.CharField(max_length=10, null=True, blank=True)
     coordinates = models.JSONField(null=True, blank=True)
+    # Παράγονται από το coordinates στο save() για γεωχωρικές αναζητήσεις (βλ. listings/geo.py)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geo_cell = models.CharField(max_length=16, null=True, blank=True, editable=False)
 
     # Τιμή
     price = models.DecimalField(max_digits=12, decimal_places=2)
@@ -212,6 +218,20 @@ class Property(models.Model):
     # Σχέσεις
     agent = models.ForeignKey(Agent, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        # Σύνθετα indexes για την αναζήτηση ακινήτων (βλ. listings/search.py)
+        indexes = [
+            models.Index(fields=['city', 'property_type', 'price'], name='property_city_type_price_idx'),
+            models.Index(fields=['city', 'neighborhood'], name='property_city_nbhd_idx'),
+            models.Index(fields=['property_type', 'price'], name='property_type_price_idx'),
+            models.Index(fields=['is_sold', 'is_reserved', 'price'], name='property_status_price_idx'),
+            models.Index(fields=['area'], name='property_area_idx'),
+            models.Index(fields=['bedrooms'], name='property_bedrooms_idx'),
+            models.Index(fields=['energy_class'], name='property_energy_class_idx'),
+            models.Index(fields=['geo_cell'], name='property_geo_cell_idx'),
+            models.Index(fields=['latitude', 'longitude'], name='property_lat_lng_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.property_type} ({self.city})"
 
@@ -220,10 +240,64 @@ class Property(models.Model):
             return self.price / self.area
         return None
 
-    def save(self, *args, **kwargs):
+    def update_geo_fields(self):
+        point = geo.parse_coordinates(self.coordinates)
+        if point is None:
+            self.latitude = self.longitude = self.geo_cell = None
+        else:
+            self.latitude, self.longitude = point
+            self.geo_cell = geo.cell_key(*point)
+
+    # Πεδία των οποίων την αρχική τιμή κρατάμε για τις αυξητικές ενημερώσεις (cache, στατιστικά)
+    TRACKED_FIELDS = ('seller_id', 'state', 'city', 'neighborhood', 'property_type', 'price_per_square_meter', 'is_sold')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded()
+        return instance
+
+    def _remember_loaded(self):
+        if all(name in self.__dict__ for name in self.TRACKED_FIELDS):
+            self._loaded = {name: self.__dict__[name] for name in self.TRACKED_FIELDS}
+        else:
+            self._loaded = None  # deferred πεδία: διαβάζονται από τη βάση στο save()
+
+    def loaded_values(self):
+        """Οι τιμές των TRACKED_FIELDS όπως είναι αποθηκευμένες ή None για νέο ακίνητο."""
+        loaded = getattr(self, '_loaded', None)
+        if loaded is None and self.pk is not None and not self._state.adding:
+            loaded = Property.objects.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+        return loaded
+
+    def current_values(self):
+        return {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+
+    def response_cache_scopes(self, loaded=None):
+        scopes = {response_cache.city_scope(self.city), response_cache.seller_scope(self.seller_id)}
+        if loaded:
+            scopes |= {response_cache.city_scope(loaded['city']), response_cache.seller_scope(loaded['seller_id'])}
+        return scopes
+
+    def update_derived_fields(self):
+        # Καλείται και από το import_properties πριν από το bulk_create, που δεν περνά από το save()
         if self.price and self.area:
             self.price_per_square_meter = self.calculate_price_per_square_meter()
-        super().save(*args, **kwargs)
+        self.update_geo_fields()
+
+    def save(self, *args, **kwargs):
+        self.update_derived_fields()
+        loaded = self.loaded_values()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Αυξητική ενημέρωση των στατιστικών αγοράς (βλ. listings/market_stats.py)
+            market_stats.record_change(loaded, self.current_values())
+        # Συγχρονισμός του full-text index (βλ. listings/fulltext.py)
+        if fulltext.is_supported():
+            fulltext.index_property(self.pk, self.title, self.short_description, self.full_description, self.keywords)
+        # Νέα έκδοση για τις cached λίστες (βλ. listings/response_cache.py)
+        response_cache.invalidate(self.response_cache_scopes(loaded))
+        self._remember_loaded()
 
 # Μοντέλο για τις Συναλλαγές (Αγοραπωλησίες)
 class Transaction(models.Model):
@@ -249,12 +323,17 @@ class Lead(models.Model):
     # locked_until: μέχρι πότε κλειδώνεται (αν δεν ενδιαφέρθηκε).
     locked_until = models.DateTimeField(null=True, blank=True)
 
-    # OTP: για επιβεβαίωση προφορικής επαφής.
-    otp_code = models.CharField(max_length=10, null=True, blank=True)
+    # OTP: για επιβεβαίωση προφορικής επαφής (ο κωδικός είναι OTPRecord με lead).
     otp_verified = models.BooleanField(default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Έλεγχος κλειδώματος ανά αγοραστή (listings/locks.py)
+            models.Index(fields=['buyer', 'property', 'locked_until'], name='lead_buyer_prop_lock_idx'),
+        ]
+
     def __str__(self):
         return f"Lead: {self.agent} -> {self.buyer} / {self.property}"
     
@@ -299,10 +378,43 @@ class Transaction(models.Model):
 class VisitAvailability(models.Model):
     property = models.ForeignKey('Property', on_delete=models.CASCADE, related_name='availabilities')
     available_date = models.DateTimeField(help_text="Η διαθέσιμη ημερομηνία/ώρα για επίσκεψη")
+    duration_minutes = models.PositiveSmallIntegerField(default=30, help_text="Διάρκεια του slot σε λεπτά")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['property', 'available_date'], name='visitavail_property_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.property.title} available at {self.available_date}"
+
+
+# Επαναλαμβανόμενη διαθεσιμότητα (π.χ. κάθε Τρίτη 10:00-13:00 σε slots των 30'),
+# που αναπτύσσεται σε slots μόνο όταν ζητηθούν (βλ. listings/scheduling.py)
+class VisitRule(models.Model):
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+
+    property = models.ForeignKey('Property', on_delete=models.CASCADE, related_name='visit_rules')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    # Τοπική ώρα (VISIT_SCHEDULING['TIME_ZONE']), ώστε οι αλλαγές θερινής ώρας να μη μετακινούν τα slots
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    slot_minutes = models.PositiveSmallIntegerField(default=30)
+    valid_from = models.DateField()
+    valid_until = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.property.title}: {self.get_weekday_display()} {self.start_time}-{self.end_time}"
     
 class VisitRequest(models.Model):
     STATUS_CHOICES = [
@@ -318,6 +430,7 @@ class VisitRequest(models.Model):
     # Ο handler θα οριστεί αυτόματα: αν ο Seller handle_visits=True, τότε handler = seller.user, αλλιώς μπορεί να μείνει null (ή να οριστεί default collaborator)
     handler = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='handled_visit_requests')
     scheduled_date = models.DateTimeField(help_text="Η ημερομηνία/ώρα που επιλέγει ο αγοραστής από τις διαθέσιμες επιλογές")
+    ends_at = models.DateTimeField(null=True, blank=True, help_text="Τέλος του slot της επίσκεψης")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     cancellation_reason = models.TextField(blank=True, help_text="Αιτιολόγηση ακύρωσης (εάν υπάρξει)")
     delegated = models.BooleanField(default=False, help_text="True αν το αίτημα πρέπει να χειριστείται από τους διαχειριστές (όταν ο Seller δεν αναλαμβάνει τις επισκέψεις)")
@@ -326,6 +439,13 @@ class VisitRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Αναζήτηση επικαλύψεων ανά ακίνητο και ανά handler (βλ. listings/scheduling.py)
+        indexes = [
+            models.Index(fields=['property', 'scheduled_date'], name='visitreq_property_date_idx'),
+            models.Index(fields=['handler', 'scheduled_date'], name='visitreq_handler_date_idx'),
+        ]
+
     def __str__(self):
         return f"VisitRequest #{self.id} for Property {self.property.id} by Buyer {self.buyer.id}"
     
@@ -369,19 +489,46 @@ class AgentBuyerAssociation(models.Model):
     lock_until = models.DateTimeField(null=True, blank=True, help_text="Αν απορριφθεί, το ακίνητο 'κλειδώνεται' για αυτόν τον αγοραστή μέχρι αυτήν την ημερομηνία.")
     temp_buyer_name = models.CharField(max_length=100, null=True, blank=True)
     temp_buyer_identification_number = models.CharField(max_length=50, null=True, blank=True)
+    # Κανονικοποιημένα temp_buyer_* για το ταίριασμα στην εγγραφή (βλ. listings/associations.py)
+    temp_buyer_name_key = models.CharField(max_length=100, blank=True, default='', editable=False)
+    temp_buyer_id_key = models.CharField(max_length=50, blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['buyer', 'property', 'lock_until'], name='assoc_buyer_prop_lock_idx'),
+            # Μόνο οι συσχετίσεις που περιμένουν αγοραστή
+            models.Index(fields=['temp_buyer_id_key', 'temp_buyer_name_key'], name='assoc_temp_buyer_key_idx',
+                         condition=models.Q(buyer__isnull=True)),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.temp_buyer_name_key = associations.normalize_name(self.temp_buyer_name)
+        self.temp_buyer_id_key = associations.normalize_id(self.temp_buyer_identification_number)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Association (Buyer {self.buyer.id}, Agent {self.agent.id}, Property {self.property.id})"
 
 class OTPRecord(models.Model):
+    """Κωδικός OTP αγοραστή (ή lead μεσίτη). Αποθηκεύεται μόνο το HMAC του (βλ. listings/otp.py)."""
     buyer = models.ForeignKey('Buyer', on_delete=models.CASCADE, related_name='otp_records')
-    otp = models.CharField(max_length=6)
+    lead = models.ForeignKey('Lead', on_delete=models.CASCADE, related_name='otp_records', null=True, blank=True)
+    code_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    attempts = models.PositiveSmallIntegerField(default=0)
     is_verified = models.BooleanField(default=False)
+    verified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['buyer', 'lead', 'expires_at'], name='otp_buyer_lead_expires_idx'),
+            models.Index(fields=['expires_at'], name='otp_expires_idx'),
+        ]
 
     def __str__(self):
-        return f"OTP for Buyer {self.buyer.id}: {self.otp}"
+        return f"OTP for Buyer {self.buyer_id}"
 
 class TransactionProgress(models.Model):
     STATUS_CHOICES = [
@@ -404,4 +551,89 @@ class TransactionProgress(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Progress update for Transaction #{self.transaction.id} - {self.status}"
\ No newline at end of file
+        return f"Progress update for Transaction #{self.transaction.id} - {self.status}"
+
+
+# Σύνοψη τιμής/m² ανά (νομός, πόλη, γειτονιά, τύπο) για τα διαθέσιμα ακίνητα.
+# Ενημερώνεται αυξητικά από το Property.save()/delete και ξαναχτίζεται με το rebuild_market_stats.
+class MarketStat(models.Model):
+    state = models.CharField(max_length=100)
+    city = models.CharField(max_length=100)
+    neighborhood = models.CharField(max_length=100, blank=True, default='')
+    property_type = models.CharField(max_length=20, choices=Property.PROPERTY_TYPE_CHOICES)
+
+    count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=18, decimal_places=2, default=0)  # άθροισμα τιμών/m²
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    sketch = models.JSONField(default=dict)  # quantile sketch, βλ. listings/market_stats.py
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['state', 'city', 'neighborhood', 'property_type'], name='market_stat_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['city', 'property_type'], name='market_stat_city_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.city} / {self.neighborhood or '-'} / {self.property_type}: {self.count}"
+
+
+# Ουρά εργασιών στη βάση (βλ. listings/jobs.py και manage.py run_workers)
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    # Προαιρετικό κλειδί ώστε η ίδια εργασία να μη μπαίνει δύο φορές (π.χ. μία πληρωμή ανά συναλλαγή)
+    key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField()
+    # Visibility timeout: αν ο worker χαθεί, η εργασία ξαναδιατίθεται μετά το locked_until
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+            models.Index(fields=['status', 'locked_until'], name='job_status_locked_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.id} {self.task} ({self.status})"
+
+
+# Resumable upload εγγράφου συναλλαγής (βλ. listings/documents.py)
+class DocumentUpload(models.Model):
+    FIELD_CHOICES = [
+        ('final_contract_doc', 'Final contract'),
+        ('proof_of_payment_doc', 'Proof of payment'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    transaction = models.ForeignKey('Transaction', on_delete=models.CASCADE, related_name='document_uploads')
+    field = models.CharField(max_length=30, choices=FIELD_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    # Κλείδωμα ενός chunk τη φορά, με conditional UPDATE όπως στο jobs.claim
+    locked_until = models.DateTimeField(null=True, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True, default='')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.received}/{self.size}) for Transaction #{self.transaction_id}"
@@ -0,0 +1,162 @@
+import logging
+import re
+import sys
+import traceback
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import connection  # type: ignore
+from django.test.runner import DiscoverRunner  # type: ignore
+from django.test.utils import override_settings  # type: ignore
+
+
+# Ανίχνευση N+1: μέσα σε ένα request (ή ένα block των tests) μετρά τα queries ανά "σχήμα"
+# (το SQL χωρίς τις τιμές των params). Όταν το ίδιο σχήμα επαναλαμβάνεται THRESHOLD φορές,
+# καταγράφεται από πού ξεκίνησε: το πεδίο του serializer (αν το query έγινε σε
+# to_representation) και τα frames του project. Ενεργό στο DEBUG και, μέσω του TestRunner, στα tests.
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': False,
+    'THRESHOLD': 5,       # ίδια queries ανά request που θεωρούνται N+1
+    'RAISE': False,       # True: NPlusOneError αντί για warning (στα tests)
+    'STACK_DEPTH': 8,     # frames του project στην αναφορά
+    'TESTS': True,        # ο TestRunner ενεργοποιεί ENABLED και RAISE κατά το manage.py test
+}
+
+IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'N_PLUS_ONE', {})}
+
+
+def shape(sql):
+    # IN (%s, %s, ...) με διαφορετικό πλήθος τιμών είναι το ίδιο σχήμα
+    return IN_LIST.sub('(%s...)', sql)
+
+
+def serializer_field(frame):
+    """'Serializer.field' του πιο εσωτερικού to_representation του DRF στη στοίβα, ή None."""
+    while frame is not None:
+        if frame.f_code.co_name == 'to_representation' and 'rest_framework' in frame.f_code.co_filename:
+            field = frame.f_locals.get('field')
+            if field is not None and getattr(field, 'parent', None) is not None:
+                return f'{type(field.parent).__name__}.{field.field_name}'
+        frame = frame.f_back
+    return None
+
+
+def project_stack(frame, depth):
+    root = str(settings.BASE_DIR)
+    frames = [
+        entry for entry in traceback.extract_stack(frame)
+        if entry.filename.startswith(root) and 'site-packages' not in entry.filename and entry.filename != __file__
+    ]
+    return [f'{entry.filename[len(root) + 1:]}:{entry.lineno} in {entry.name}' for entry in frames[-depth:]]
+
+
+class Finding:
+    def __init__(self, sql, origin, stack):
+        self.sql = sql
+        self.origin = origin
+        self.stack = stack
+        self.count = 0
+
+    def __str__(self):
+        lines = [f'{self.count} queries of the same shape from {self.origin or "unknown origin"}: {self.sql[:300]}']
+        return '\n    '.join(lines + self.stack)
+
+
+class Detector:
+    """connection.execute_wrapper· ένας μετρητής ανά σχήμα query, η στοίβα μόνο στο όριο."""
+
+    def __init__(self, threshold=None, depth=None):
+        options = config()
+        self.threshold = threshold or options['THRESHOLD']
+        self.depth = depth or options['STACK_DEPTH']
+        self.counts = {}
+        self.findings = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = shape(sql)
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        if count == self.threshold:
+            frame = sys._getframe(1)
+            self.findings[key] = Finding(sql, serializer_field(frame), project_stack(frame, self.depth))
+        if count >= self.threshold:
+            self.findings[key].count = count
+        return execute(sql, params, many, context)
+
+    def report(self):
+        return list(self.findings.values())
+
+
+def _message(findings, label):
+    return f'Possible N+1 queries in {label}:\n  ' + '\n  '.join(str(finding) for finding in findings)
+
+
+def check(detector, label):
+    findings = detector.report()
+    if not findings:
+        return
+    if config()['RAISE']:
+        raise NPlusOneError(_message(findings, label))
+    logger.warning(_message(findings, label))
+
+
+@contextmanager
+def detect(threshold=None, label='block'):
+    """Για tests: with nplusone.detect(): ... αποτυγχάνει αν κάποιο σχήμα query ξεπεράσει το όριο."""
+    detector = Detector(threshold)
+    with connection.execute_wrapper(detector):
+        yield detector
+    findings = detector.report()
+    if findings:
+        raise NPlusOneError(_message(findings, label))
+
+
+class NPlusOneMiddleware:
+    """Ελέγχει κάθε (sync) request όταν N_PLUS_ONE['ENABLED']. Τα async requests περνούν χωρίς έλεγχο."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.get_response(request)
+        if not config()['ENABLED']:
+            return self.get_response(request)
+        detector = Detector()
+        # Ο serializer και το render των DRF Responses τρέχουν μέσα στο get_response
+        with connection.execute_wrapper(detector):
+            response = self.get_response(request)
+        check(detector, f'{request.method} {request.path}')
+        return response
+
+
+class TestRunner(DiscoverRunner):
+    """TEST_RUNNER που κάνει κάθε N+1 των tests αποτυχία, εκτός αν N_PLUS_ONE['TESTS'] είναι False."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._overrides = None
+        if config()['TESTS']:
+            self._overrides = override_settings(N_PLUS_ONE={**getattr(settings, 'N_PLUS_ONE', {}), 'ENABLED': True, 'RAISE': True})
+            self._overrides.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        if self._overrides is not None:
+            self._overrides.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,110 @@
+import secrets
+from datetime import timedelta
+
+from django.conf import settings  # type: ignore
+from django.db.models import F  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.utils.crypto import constant_time_compare, salted_hmac  # type: ignore
+
+
+# Ενιαίο σύστημα OTP για τους αγοραστές (GenerateOTPView) και τα leads των μεσιτών.
+# Στη βάση αποθηκεύεται μόνο HMAC του κωδικού· ο ίδιος ο κωδικός δημιουργείται μέσα στην
+# εργασία αποστολής (listings/tasks.py) και υπάρχει μόνο στη μνήμη του worker και στο μήνυμα.
+
+DEFAULTS = {
+    'LENGTH': 6,
+    'TTL': 10 * 60,          # δευτερόλεπτα ισχύος ενός κωδικού
+    'MAX_ATTEMPTS': 5,       # λάθος προσπάθειες πριν ακυρωθεί ο κωδικός
+    'RETENTION': 24 * 3600,  # πόσο μένουν οι ληγμένοι κωδικοί πριν τους σβήσει το purge_otps
+    'PURGE_BATCH': 1000,
+}
+
+VERIFIED = 'verified'
+INVALID = 'invalid'
+LOCKED = 'locked'
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'OTP', {})}
+
+
+def _model():
+    from .models import OTPRecord
+    return OTPRecord
+
+
+def code_hash(buyer_id, code):
+    return salted_hmac('listings.otp', f'{buyer_id}:{code}', algorithm='sha256').hexdigest()
+
+
+def issue(buyer, lead=None):
+    """
+    Νέος κωδικός για τον αγοραστή (και προαιρετικά για ένα lead). Οι προηγούμενοι
+    ανεπιβεβαίωτοι κωδικοί του ίδιου σκοπού σβήνονται. Επιστρέφει (record, code).
+    """
+    OTPRecord = _model()
+    options = config()
+    code = ''.join(secrets.choice('0123456789') for _ in range(options['LENGTH']))
+    OTPRecord.objects.filter(buyer=buyer, lead=lead, is_verified=False).delete()
+    record = OTPRecord.objects.create(
+        buyer=buyer, lead=lead, code_hash=code_hash(buyer.pk, code),
+        expires_at=timezone.now() + timedelta(seconds=options['TTL']),
+    )
+    return record, code
+
+
+def revoke(buyer, lead=None):
+    """Ακυρώνει τους ανεπιβεβαίωτους κωδικούς του ίδιου σκοπού (πριν ζητηθεί νέος)."""
+    _model().objects.filter(buyer=buyer, lead=lead, is_verified=False).delete()
+
+
+def issue_pending(buyer, lead=None):
+    """
+    Όπως το issue(), αλλά μόνο αν δεν υπάρχει ήδη ενεργός κωδικός (μη ληγμένος, ανεπιβεβαίωτος,
+    με προσπάθειες). Αλλιώς None: η επανεκτέλεση μιας εργασίας αποστολής δεν ακυρώνει τον
+    κωδικό που έχει ήδη σταλεί.
+    """
+    active = _model().objects.filter(
+        buyer=buyer, lead=lead, is_verified=False, expires_at__gt=timezone.now(),
+        attempts__lt=config()['MAX_ATTEMPTS'],
+    )
+    if active.exists():
+        return None
+    return issue(buyer, lead=lead)
+
+
+def verify(buyer_id, code, lead_id=None):
+    """
+    Ελέγχει τον κωδικό έναντι του ενεργού (μη ληγμένου, ανεπιβεβαίωτου) κωδικού του αγοραστή.
+    Επιστρέφει VERIFIED, INVALID ή LOCKED (εξαντλήθηκαν οι προσπάθειες).
+    """
+    OTPRecord = _model()
+    now = timezone.now()
+    record = (
+        OTPRecord.objects.filter(buyer_id=buyer_id, lead_id=lead_id, expires_at__gt=now, is_verified=False)
+        .order_by('-expires_at').only('id', 'code_hash', 'attempts').first()
+    )
+    if record is None:
+        return INVALID
+    if record.attempts >= config()['MAX_ATTEMPTS']:
+        return LOCKED
+    if not constant_time_compare(record.code_hash, code_hash(buyer_id, str(code).strip())):
+        OTPRecord.objects.filter(pk=record.pk).update(attempts=F('attempts') + 1)
+        return INVALID
+    # Conditional UPDATE: ο κωδικός επιβεβαιώνεται μία φορά ακόμα και με ταυτόχρονα requests
+    used = OTPRecord.objects.filter(pk=record.pk, is_verified=False).update(is_verified=True, verified_at=now)
+    return VERIFIED if used else INVALID
+
+
+def purge(batch_size=None, now=None):
+    """Σβήνει σε chunks τους κωδικούς που έληξαν πριν από RETENTION. Επιστρέφει πόσοι σβήστηκαν."""
+    OTPRecord = _model()
+    options = config()
+    cutoff = (now or timezone.now()) - timedelta(seconds=options['RETENTION'])
+    batch_size = batch_size or options['PURGE_BATCH']
+    deleted = 0
+    while True:
+        ids = list(OTPRecord.objects.filter(expires_at__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += OTPRecord.objects.filter(pk__in=ids).delete()[0]
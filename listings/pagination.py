@@ -0,0 +1,179 @@
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured  # type: ignore
+from django.db.models import Q  # type: ignore
+from rest_framework.exceptions import NotFound  # type: ignore
+from rest_framework.pagination import BasePagination  # type: ignore
+from rest_framework.response import Response  # type: ignore
+from rest_framework.settings import api_settings  # type: ignore
+from rest_framework.utils.urls import remove_query_param, replace_query_param  # type: ignore
+
+
+def _invert(ordering):
+    return ordering[1:] if ordering.startswith('-') else f'-{ordering}'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination χωρίς OFFSET και χωρίς COUNT(*).
+
+    Το cursor κρατάει τις τιμές των πεδίων ταξινόμησης της τελευταίας γραμμής της σελίδας
+    (π.χ. (created_at, id)) και η επόμενη σελίδα ζητείται με WHERE πάνω σε αυτές, οπότε
+    μια "βαθιά" σελίδα κοστίζει όσο και η πρώτη. Η ταξινόμηση λαμβάνεται από το queryset
+    (ή default '-created_at') και συμπληρώνεται πάντα με το pk για σταθερή σειρά.
+    Τα πεδία ταξινόμησης πρέπει να είναι NOT NULL.
+    """
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    default_ordering = ('-created_at',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare(queryset, request)
+        return self.finish(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Το ίδιο για τα async views (listings/async_views.py) με το async ORM."""
+        queryset = self.prepare(queryset, request)
+        return self.finish([row async for row in queryset[:self.page_size + 1]])
+
+    def prepare(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor['reverse'])
+        ordering = [_invert(o) for o in self.ordering] if self.reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.build_filter(ordering, self.cursor['values']))
+        return queryset
+
+    def finish(self, rows):
+        # Ζητήθηκε μία γραμμή παραπάνω για να ξέρουμε αν υπάρχει επόμενη σελίδα
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value:
+            try:
+                size = int(value)
+            except ValueError:
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size)
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = [o for o in queryset.query.order_by if isinstance(o, str)]
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering or self.default_ordering)
+
+        pk_name = queryset.model._meta.pk.name
+        fields = []
+        for item in ordering:
+            name = item.lstrip('-')
+            if name == 'pk':
+                item, name = item.replace('pk', pk_name), pk_name
+            try:
+                queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(f"KeysetPagination cannot order by '{item}'.")
+            fields.append(item)
+
+        if fields[-1].lstrip('-') != pk_name:
+            fields.append(f'-{pk_name}' if fields[-1].startswith('-') else pk_name)
+        return fields
+
+    def build_filter(self, ordering, values):
+        """
+        (a, b, c) "μετά" από (va, vb, vc):
+        a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc)
+        με < αντί για > στα πεδία φθίνουσας ταξινόμησης.
+        """
+        condition = Q()
+        equal = Q()
+        for item, value in zip(ordering, values):
+            name = item.lstrip('-')
+            lookup = 'lt' if item.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            raw_values = payload['v']
+            if len(raw_values) != len(self.ordering):
+                raise ValueError
+            values = [
+                self.model._meta.get_field(item.lstrip('-')).to_python(raw)
+                for item, raw in zip(self.ordering, raw_values)
+            ]
+            return {'values': values, 'reverse': bool(payload.get('r'))}
+        except Exception:
+            raise NotFound('Invalid cursor')
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for item in self.ordering:
+            name = item.lstrip('-')
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        payload = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
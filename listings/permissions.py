@@ -1,13 +1,12 @@
 from rest_framework.permissions import BasePermission
 
+from .authentication import is_verified_agent
+
 class IsVerifiedAgent(BasePermission):
     def has_permission(self, request, view):
         user = request.user
         if not user or not user.is_authenticated:
             return False
 
-        agent = getattr(user, 'agent', None)
-        if agent is None:
-            return False
-
-        return agent.is_verified
+        # Με το CachedTokenAuthentication ο agent είναι ήδη φορτωμένος στον user
+        return is_verified_agent(user)
@@ -0,0 +1,166 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings  # type: ignore
+from django.core.cache import caches  # type: ignore
+from django.db import connection, transaction  # type: ignore
+from rest_framework.response import Response  # type: ignore
+
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',   # alias από το CACHES· κοινή μεταξύ των workers (file-based, Redis), όχι locmem
+    'TTL': 600,           # δευτερόλεπτα για τις αποθηκευμένες απαντήσεις
+}
+
+GLOBAL_SCOPE = ('global', None)
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'LISTING_CACHE', {})}
+
+
+def _cache():
+    return caches[_config()['ALIAS']]
+
+
+def _hash(value):
+    return hashlib.sha1(str(value).encode('utf-8')).hexdigest()
+
+
+def city_scope(city):
+    return ('city', city)
+
+
+def seller_scope(seller_id):
+    return ('seller', seller_id)
+
+
+def _version_key(scope):
+    kind, value = scope
+    # Hash της τιμής ώστε πόλεις με κενά/ελληνικά να δίνουν έγκυρα cache keys
+    return f'listing-version:{kind}' if value is None else f'listing-version:{kind}:{_hash(value)}'
+
+
+def _initial_version():
+    # Αν ένα counter χαθεί (eviction) ξεκινά από νέα τιμή και όχι από κάποια παλιά
+    return time.time_ns()
+
+
+def get_versions(scopes):
+    cache = _cache()
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(scopes):
+    cache = _cache()
+    for scope in scopes:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), None)
+
+
+def invalidate(scopes):
+    """
+    Ακυρώνει τις αποθηκευμένες απαντήσεις των scopes αλλάζοντας τα version counters τους.
+    Μέσα σε transaction ξαναγίνεται bump μετά το commit, ώστε μια απάντηση που
+    σειριοποιήθηκε από άλλο request πριν το commit να μη μείνει με τη νέα έκδοση.
+    """
+    scopes = [GLOBAL_SCOPE, *{scope for scope in scopes if scope[1] is not None}]
+    bump_versions(scopes)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def invalidate_for_property(sender, instance, **kwargs):
+    invalidate(instance.response_cache_scopes(getattr(instance, '_loaded', None)))
+
+
+def response_key(view_name, request, scopes):
+    params = sorted((name, value) for name in request.query_params for value in request.query_params.getlist(name))
+    versions = get_versions(scopes)
+    digest = _hash((request.get_host(), request.path, params, list(zip(scopes, versions))))
+    return f'listing-response:{view_name}:{digest}'
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else None,
+            }
+
+
+_stats = _Stats()
+
+
+def stats():
+    """Μετρητές hit/miss του τρέχοντος process."""
+    return _stats.as_dict()
+
+
+def clear():
+    _cache().clear()
+    _stats.reset()
+
+
+class CachedResponseMixin:
+    """
+    Cache των απαντήσεων GET για τα δημόσια endpoints ακινήτων. Το κλειδί περιέχει τα
+    ταξινομημένα query params και τα version counters των scopes της απάντησης, οπότε
+    μετά από κάθε αλλαγή σε Property οι παλιές εγγραφές απλώς δεν ξαναβρίσκονται
+    (λήγουν με το TTL) και δεν χρειάζονται wildcard deletes.
+    Μπαίνει μετά το ConditionalListMixin ώστε τα 304 να εξυπηρετούνται πριν από την cache.
+    Σε miss καλείται το list() του view (όπως στο ListAPIView.get).
+    """
+
+    def get_cache_scopes(self):
+        return [GLOBAL_SCOPE]
+
+    def get(self, request, *args, **kwargs):
+        config = _config()
+        if not config['ENABLED']:
+            return self.list(request, *args, **kwargs)
+
+        cache = _cache()
+        key = response_key(type(self).__name__, request, self.get_cache_scopes())
+        data = cache.get(key)
+        if data is not None:
+            _stats.record(hit=True)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _stats.record(hit=False)
+        response = self.list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, config['TTL'])
+        response['X-Cache'] = 'MISS'
+        return response
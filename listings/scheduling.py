@@ -0,0 +1,190 @@
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings  # type: ignore
+from django.contrib.auth.models import User  # type: ignore
+from django.db.models import F, Q  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.utils.dateparse import parse_date, parse_datetime  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+from .models import Property, VisitAvailability, VisitRequest, VisitRule
+
+
+DEFAULTS = {
+    'TIME_ZONE': 'Europe/Athens',   # ζώνη ώρας των κανόνων διαθεσιμότητας
+    'SLOT_MINUTES': 30,             # διάρκεια όταν το ακίνητο δεν έχει ορίσει διαθεσιμότητα
+    'MAX_RANGE_DAYS': 62,           # μέγιστο εύρος του endpoint ελεύθερων slots
+}
+
+# Αιτήματα που δεσμεύουν το slot τους
+BLOCKING_STATUSES = ('PENDING', 'APPROVED')
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'VISIT_SCHEDULING', {})}
+
+
+class IntervalIndex:
+    """
+    Ταξινομημένα, ξένα μεταξύ τους διαστήματα [start, end). Τα επικαλυπτόμενα συγχωνεύονται
+    στην κατασκευή, οπότε ο έλεγχος επικάλυψης είναι ένα bisect (O(log n)).
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        # Το τελευταίο διάστημα που ξεκινά πριν το end είναι και αυτό που τελειώνει αργότερα
+        index = bisect_left(self.starts, end)
+        return index > 0 and self.ends[index - 1] > start
+
+
+# --- Διαθεσιμότητα ---
+
+def expand_rules(rules, start, end):
+    """
+    Slots (start, end) των κανόνων μέσα στο [start, end), χωρίς να αποθηκεύονται. Οι ώρες
+    των κανόνων είναι τοπικές, οπότε ένα slot 10:00 μένει 10:00 και μετά την αλλαγή ώρας.
+    """
+    zone = ZoneInfo(config()['TIME_ZONE'])
+    rules = list(rules)
+    day = start.astimezone(zone).date()
+    last = end.astimezone(zone).date()
+    while day <= last:
+        for rule in rules:
+            if rule.weekday != day.weekday() or day < rule.valid_from:
+                continue
+            if rule.valid_until is not None and day > rule.valid_until:
+                continue
+            step = timedelta(minutes=rule.slot_minutes)
+            slot = datetime.combine(day, rule.start_time, tzinfo=zone)
+            closing = datetime.combine(day, rule.end_time, tzinfo=zone)
+            while slot + step <= closing:
+                if slot >= start and slot < end:
+                    yield slot, slot + step
+                slot += step
+        day += timedelta(days=1)
+
+
+def offered_slots(property_id, start, end):
+    """Όλα τα slots του ακινήτου στο [start, end): κανόνες και μεμονωμένες ημερομηνίες, ταξινομημένα."""
+    slots = {}
+    # ±1 ημέρα: οι ημερομηνίες των κανόνων είναι τοπικές, τα start/end σε UTC
+    rules = VisitRule.objects.filter(property_id=property_id).filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=(start - timedelta(days=1)).date()),
+        valid_from__lte=(end + timedelta(days=1)).date(),
+    )
+    for slot_start, slot_end in expand_rules(rules, start, end):
+        slots[slot_start] = slot_end
+    single = VisitAvailability.objects.filter(property_id=property_id, available_date__gte=start, available_date__lt=end)
+    for available_date, minutes in single.values_list('available_date', 'duration_minutes'):
+        slots.setdefault(available_date, available_date + timedelta(minutes=minutes))
+    return sorted(slots.items())
+
+
+def has_availability(property_id):
+    return (
+        VisitRule.objects.filter(property_id=property_id).exists()
+        or VisitAvailability.objects.filter(property_id=property_id).exists()
+    )
+
+
+# --- Κρατήσεις ---
+
+def busy_index(property_id, handler_id, start, end, exclude=None):
+    """
+    IntervalIndex των ενεργών επισκέψεων του ακινήτου ή του handler που τέμνουν το [start, end).
+    Οι παλιές επισκέψεις χωρίς ends_at (πριν από τα slots) διαρκούν SLOT_MINUTES.
+    """
+    default = timedelta(minutes=config()['SLOT_MINUTES'])
+    owners = Q(property_id=property_id)
+    if handler_id is not None:
+        owners |= Q(handler_id=handler_id)
+    visits = VisitRequest.objects.filter(owners, status__in=BLOCKING_STATUSES, scheduled_date__lt=end).filter(
+        Q(ends_at__gt=start) | Q(ends_at__isnull=True, scheduled_date__gt=start - default)
+    )
+    if exclude is not None:
+        visits = visits.exclude(pk=exclude)
+    return IntervalIndex(
+        (visit_start, visit_end or visit_start + default)
+        for visit_start, visit_end in visits.values_list('scheduled_date', 'ends_at')
+    )
+
+
+def free_slots(property_id, handler_id, start, end):
+    start = max(start, timezone.now())
+    if start >= end:
+        return []
+    slots = offered_slots(property_id, start, end)
+    if not slots:
+        return []
+    # Τα slots είναι ταξινομημένα κατά αρχή: ένα μεγαλύτερο slot μπορεί να τελειώνει μετά το τελευταίο
+    busy = busy_index(property_id, handler_id, slots[0][0], max(slot_end for _, slot_end in slots))
+    return [(slot_start, slot_end) for slot_start, slot_end in slots if not busy.overlaps(slot_start, slot_end)]
+
+
+def _lock(property_id, handler_id):
+    # Σειριοποιεί τις κρατήσεις ανά ακίνητο και ανά handler με conditional UPDATE πριν από κάθε
+    # ανάγνωση (όπως το jobs.claim): σε PostgreSQL κλειδώνει τις γραμμές, σε SQLite παίρνει το
+    # write lock της βάσης, ενώ το select_for_update() εκεί δεν κάνει τίποτα
+    Property.objects.filter(pk=property_id).update(id=F('id'))
+    if handler_id is not None:
+        User.objects.filter(pk=handler_id).update(id=F('id'))
+
+
+def reserve(property_id, handler_id, scheduled_date, exclude=None):
+    """
+    Ελέγχει ότι το scheduled_date είναι slot του ακινήτου και ότι δεν επικαλύπτεται με άλλη
+    ενεργή επίσκεψη του ακινήτου ή του handler. Επιστρέφει το τέλος του slot. Καλείται πρώτο
+    μέσα σε transaction.atomic() και ακολουθεί η αποθήκευση, ώστε δύο ταυτόχρονα αιτήματα να
+    μην κλείνουν το ίδιο slot (σε SQLite το lock παίρνεται πριν από την πρώτη ανάγνωση).
+    """
+    if scheduled_date <= timezone.now():
+        raise ValidationError({'scheduled_date': 'Visits must be scheduled in the future.'})
+    _lock(property_id, handler_id)
+
+    window_end = scheduled_date + timedelta(days=1)
+    slot_end = dict(offered_slots(property_id, scheduled_date, window_end)).get(scheduled_date)
+    if slot_end is None:
+        if has_availability(property_id):
+            raise ValidationError({'scheduled_date': 'The selected time is not an available slot for this property.'})
+        # Ακίνητα χωρίς καθόλου διαθεσιμότητα δέχονται αιτήματα όπως πριν, με τη default διάρκεια
+        slot_end = scheduled_date + timedelta(minutes=config()['SLOT_MINUTES'])
+
+    if busy_index(property_id, handler_id, scheduled_date, slot_end, exclude=exclude).overlaps(scheduled_date, slot_end):
+        raise ValidationError({'scheduled_date': 'The selected slot is already booked.'})
+    return slot_end
+
+
+def parse_range(params):
+    """?start=&end= (ISO ημερομηνίες ή datetimes) με default τις επόμενες 14 ημέρες."""
+    def parse(name, default):
+        value = params.get(name)
+        if not value:
+            return default
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValidationError({name: 'Must be an ISO date or datetime.'})
+            parsed = datetime.combine(day, time.min, tzinfo=ZoneInfo(config()['TIME_ZONE']))
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+    start = parse('start', timezone.now())
+    end = parse('end', start + timedelta(days=14))
+    max_days = config()['MAX_RANGE_DAYS']
+    if end <= start or end - start > timedelta(days=max_days):
+        raise ValidationError({'end': f'Must be after start and within {max_days} days.'})
+    return start, end
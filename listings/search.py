@@ -0,0 +1,149 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, Max, Min, Q  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+from .models import Property
+
+
+# Φίλτρα πολλαπλών τιμών (?city=Αθήνα&city=Πειραιάς ή ?city=Αθήνα,Πειραιάς)
+MULTI_VALUE_FILTERS = ('city', 'neighborhood', 'property_type', 'energy_class', 'condition', 'bedrooms', 'seller')
+
+INTEGER_FILTERS = ('bedrooms', 'seller')
+
+# Για αυτά τα πεδία επιστρέφουμε facet counts
+FACET_FIELDS = ('city', 'neighborhood', 'property_type', 'energy_class', 'condition', 'bedrooms')
+
+CHOICE_FILTERS = {
+    'property_type': {key for key, _ in Property.PROPERTY_TYPE_CHOICES},
+    'energy_class': {key for key, _ in Property.ENERGY_CLASS_CHOICES},
+    'condition': {key for key, _ in Property.CONDITION_CHOICES},
+}
+
+# Διαστήματα: query param -> (πεδίο, lookup)
+RANGE_FILTERS = {
+    'min_price': ('price', 'gte'),
+    'max_price': ('price', 'lte'),
+    'min_area': ('area', 'gte'),
+    'max_area': ('area', 'lte'),
+    'min_bedrooms': ('bedrooms', 'gte'),
+}
+
+BOOLEAN_FILTERS = ('is_sold', 'is_reserved')
+
+ORDERING_FIELDS = ('price', '-price', 'area', '-area', 'created_at', '-created_at')
+DEFAULT_ORDERING = '-created_at'
+
+
+def _split_values(params, name):
+    values = []
+    for raw in params.getlist(name):
+        values.extend(v.strip() for v in raw.split(',') if v.strip())
+    return values
+
+
+def _parse_decimal(name, value):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError):
+        raise ValidationError({name: f"Invalid number: {value}"})
+
+
+def _parse_bool(name, value):
+    lowered = value.lower()
+    if lowered in ('1', 'true', 'yes'):
+        return True
+    if lowered in ('0', 'false', 'no'):
+        return False
+    raise ValidationError({name: f"Invalid boolean: {value}"})
+
+
+class PropertySearch:
+    """
+    Μετατρέπει τα query params σε φίλτρα πάνω στο Property και υπολογίζει τα facets.
+    Κάθε φίλτρο κρατιέται ξεχωριστά ανά διάσταση ώστε τα facet counts μιας διάστασης
+    να υπολογίζονται με όλα τα υπόλοιπα φίλτρα ενεργά (όπως στα κλασικά faceted UIs).
+    """
+
+    def __init__(self, params):
+        self.filters = {}
+        self.values = {}
+        self.ordering = DEFAULT_ORDERING
+
+        for name in MULTI_VALUE_FILTERS:
+            values = _split_values(params, name)
+            if not values:
+                continue
+            if name in CHOICE_FILTERS:
+                invalid = [v for v in values if v not in CHOICE_FILTERS[name]]
+                if invalid:
+                    raise ValidationError({name: f"Invalid choice(s): {', '.join(invalid)}"})
+            if name in INTEGER_FILTERS:
+                try:
+                    values = [int(v) for v in values]
+                except ValueError:
+                    raise ValidationError({name: "Must be integers."})
+            self.values[name] = values
+            self.filters[name] = Q(**{f'{name}__in': values})
+
+        for name, (field, lookup) in RANGE_FILTERS.items():
+            value = params.get(name)
+            if value in (None, ''):
+                continue
+            number = _parse_decimal(name, value)
+            condition = Q(**{f'{field}__{lookup}': number})
+            self.filters[field] = self.filters[field] & condition if field in self.filters else condition
+
+        for name in BOOLEAN_FILTERS:
+            value = params.get(name)
+            if value in (None, ''):
+                continue
+            self.filters[name] = Q(**{name: _parse_bool(name, value)})
+
+        ordering = params.get('ordering')
+        if ordering:
+            if ordering not in ORDERING_FIELDS:
+                raise ValidationError({'ordering': f"Must be one of: {', '.join(ORDERING_FIELDS)}"})
+            self.ordering = ordering
+
+    def filter(self, queryset, exclude=None):
+        for name, condition in self.filters.items():
+            if name != exclude:
+                queryset = queryset.filter(condition)
+        return queryset
+
+    def apply(self, queryset):
+        # Το id ως δεύτερο κλειδί για σταθερή σειρά όταν οι τιμές ισοβαθμούν
+        tiebreaker = '-id' if self.ordering.startswith('-') else 'id'
+        return self.filter(queryset).order_by(self.ordering, tiebreaker)
+
+    def _facet_querysets(self, queryset):
+        for field in FACET_FIELDS:
+            yield field, (
+                self.filter(queryset, exclude=field)
+                .exclude(**{f'{field}__isnull': True})
+                .values(field)
+                .annotate(count=Count('id'))
+                .order_by('-count', field)
+            )
+
+    def _range_querysets(self, queryset):
+        for field in ('price', 'area'):
+            yield field, self.filter(queryset, exclude=field)
+
+    def facets(self, queryset):
+        facets = {}
+        for field, rows in self._facet_querysets(queryset):
+            facets[field] = [{'value': row[field], 'count': row['count']} for row in rows]
+        for field, filtered in self._range_querysets(queryset):
+            facets[field] = filtered.aggregate(min=Min(field), max=Max(field))
+        return facets
+
+    async def afacets(self, queryset):
+        """Τα ίδια facets με το async ORM (βλ. listings/async_views.py)."""
+        facets = {}
+        for field, rows in self._facet_querysets(queryset):
+            facets[field] = [{'value': row[field], 'count': row['count']} async for row in rows]
+        for field, filtered in self._range_querysets(queryset):
+            facets[field] = await filtered.aaggregate(min=Min(field), max=Max(field))
+        return facets
@@ -1,5 +1,11 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import models
+from django.db.models.fields.json import KT
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Seller, Agent, Property, Lead, Transaction, Buyer, VisitAvailability, VisitRequest, SupportTicket, SupportMessage, AgentBuyerAssociation, OTPRecord, TransactionProgress
+from . import images
+from .models import Seller, Agent, Property, Lead, Transaction, Buyer, VisitAvailability, VisitRequest, VisitRule, SupportTicket, SupportMessage, AgentBuyerAssociation, OTPRecord, TransactionProgress
 
 # Serializer για τους Πωλητές
 class SellerSerializer(serializers.ModelSerializer):
@@ -38,13 +44,84 @@ class BuyerSerializer(serializers.ModelSerializer):
         model = Buyer
         fields = ['id', 'name', 'email', 'phone', 'identification_number', 'created_at', 'agent']
 
-# Δημιουργούμε ένα νέο Serializer για το μοντέλο Property
-class PropertySerializer(serializers.ModelSerializer):
+# Πεδία που επιστρέφουν τα list endpoints των ακινήτων. Τα μεγάλα πεδία
+# (full_description, images, keywords κ.λπ.) επιστρέφονται μόνο στο detail.
+PROPERTY_LIST_FIELDS = (
+    'id', 'title', 'short_description', 'price', 'seller', 'is_verified', 'is_reserved', 'is_sold', 'created_at',
+    'property_type', 'condition', 'city', 'neighborhood', 'area', 'bedrooms', 'energy_class',
+    'price_per_square_meter', 'latitude', 'longitude',
+)
+
+# Μόνο η πρώτη εικόνα (JSON path στη βάση), για το thumbnail των λιστών
+PROPERTY_LIST_ANNOTATIONS = {'first_image': KT('images__0')}
+
+
+def _decimal_to_representation(field):
+    quantum = Decimal(1).scaleb(-field.decimal_places)
+
+    def convert(value):
+        if value is None:
+            return None
+        return str(Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP))
+    return convert
+
+
+def _datetime_to_representation(value):
+    if value is None:
+        return None
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def _compile_list_fields(model, names):
+    """
+    (όνομα, attname, converter) για κάθε πεδίο, υπολογισμένα μία φορά στο import,
+    ώστε η σειριοποίηση να μη χρειάζεται introspection ανά γραμμή.
+    """
+    compiled = []
+    for name in names:
+        field = model._meta.get_field(name)
+        if isinstance(field, models.DecimalField):
+            converter = _decimal_to_representation(field)
+        elif isinstance(field, models.DateTimeField):
+            converter = _datetime_to_representation
+        else:
+            converter = None
+        compiled.append((name, field.attname, converter))
+    return tuple(compiled)
+
+
+class PropertyListSerializer(serializers.BaseSerializer):
+    """
+    Γρήγορη, read-only σειριοποίηση για λίστες ακινήτων. Δέχεται είτε dicts από
+    Property.objects.values(*PROPERTY_LIST_FIELDS) είτε instances του Property
+    και παράγει την ίδια μορφή με έναν ModelSerializer για τα ίδια πεδία.
+    """
+    compiled_fields = _compile_list_fields(Property, PROPERTY_LIST_FIELDS)
+
+    def to_representation(self, instance):
+        if isinstance(instance, dict):
+            data = {
+                name: converter(instance[name]) if converter else instance[name]
+                for name, _, converter in self.compiled_fields
+            }
+            data['thumbnail'] = images.thumbnail_url(instance['id'], instance.get('first_image'))
+            return data
+        data = {}
+        for name, attname, converter in self.compiled_fields:
+            value = getattr(instance, attname)
+            data[name] = converter(value) if converter else value
+        data['thumbnail'] = images.thumbnail_url(instance.pk, instance.images[0] if instance.images else None)
+        return data
+
+
+class PropertyDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
-        fields = ['title', 'description', 'price','id','seller','is_verified','is_reserved','is_sold', 'created_at']
-        # ή συγκεκριμένα fields, π.χ.: ['id', 'title', 'description', 'price', 'location', ...]
-        read_only_fields = ['id', 'seller', 'is_verified', 'is_reserved', 'is_sold', 'created_at']
+        fields = '__all__'
+        read_only_fields = ['id', 'seller', 'is_verified', 'is_reserved', 'is_sold', 'created_at', 'updated_at',
+                            'price_per_square_meter', 'latitude', 'longitude', 'geo_cell']
 
 
 # listings/serializers.py
@@ -58,10 +135,10 @@ class LeadSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'agent', 'buyer', 'property',
             'interested', 'locked_until',
-            'otp_code', 'otp_verified',
+            'otp_verified',
             'created_at'
         ]
-        read_only_fields = ['id', 'created_at','agent','otp_code','otp_verified']
+        read_only_fields = ['id', 'created_at','agent','otp_verified']
 
 class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -79,14 +156,40 @@ class TransactionSerializer(serializers.ModelSerializer):
 class VisitAvailabilitySerializer(serializers.ModelSerializer):
     class Meta:
         model = VisitAvailability
-        fields = ['id', 'property', 'available_date', 'created_at']
+        fields = ['id', 'property', 'available_date', 'duration_minutes', 'created_at']
         read_only_fields = ['id', 'created_at', 'property']
 
+class VisitRuleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = VisitRule
+        fields = ['id', 'property', 'weekday', 'start_time', 'end_time', 'slot_minutes', 'valid_from', 'valid_until', 'created_at']
+        read_only_fields = ['id', 'property', 'created_at']
+
+    def validate(self, attrs):
+        if attrs['start_time'] >= attrs['end_time']:
+            raise serializers.ValidationError("end_time must be after start_time.")
+        if not 5 <= attrs.get('slot_minutes', 30) <= 240:
+            raise serializers.ValidationError("slot_minutes must be between 5 and 240.")
+        if attrs.get('valid_until') and attrs['valid_until'] < attrs['valid_from']:
+            raise serializers.ValidationError("valid_until must not be before valid_from.")
+        return attrs
+
+class VisitSlotBulkSerializer(serializers.Serializer):
+    """Μεμονωμένα slots και/ή κανόνες για ένα ακίνητο σε ένα request (π.χ. ένας μήνας επισκέψεων)."""
+    slots = serializers.ListField(child=serializers.DateTimeField(), required=False, default=list, max_length=2000)
+    duration_minutes = serializers.IntegerField(min_value=5, max_value=240, default=30)
+    rules = VisitRuleSerializer(many=True, required=False, default=list)
+
+    def validate(self, attrs):
+        if not attrs['slots'] and not attrs['rules']:
+            raise serializers.ValidationError("Provide slots and/or rules.")
+        return attrs
+
 class VisitRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = VisitRequest
-        fields = ['id', 'property', 'buyer', 'handler', 'scheduled_date', 'status','cancellation_reason', 'delegated', 'buyer_notes', 'seller_notes', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'buyer', 'handler','delegated', 'created_at', 'updated_at']
+        fields = ['id', 'property', 'buyer', 'handler', 'scheduled_date', 'ends_at', 'status','cancellation_reason', 'delegated', 'buyer_notes', 'seller_notes', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'buyer', 'handler', 'ends_at', 'delegated', 'created_at', 'updated_at']
 
 class VisitRequestCancellationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -113,7 +216,7 @@ class SupportMessageSerializer(serializers.ModelSerializer):
 
 class AgentBuyerAssociationSerializer(serializers.ModelSerializer):
     buyer_details = BuyerSerializer(source='buyer', read_only=True)
-    property_details = PropertySerializer(source='property', read_only=True)
+    property_details = PropertyListSerializer(source='property', read_only=True)
     class Meta:
         model = AgentBuyerAssociation
         fields = ['id', 'buyer','buyer_details', 'agent', 'property','property_details', 'accepted', 'lock_until', 'created_at']
@@ -122,8 +225,8 @@ class AgentBuyerAssociationSerializer(serializers.ModelSerializer):
 class OTPRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = OTPRecord
-        fields = ['id', 'buyer', 'otp', 'created_at', 'is_verified']
-        read_only_fields = ['id', 'buyer', 'otp', 'created_at', 'is_verified']
+        fields = ['id', 'buyer', 'lead', 'created_at', 'expires_at', 'is_verified']
+        read_only_fields = ['id', 'buyer', 'lead', 'created_at', 'expires_at', 'is_verified']
 
 from rest_framework import serializers
 from .models import AgentBuyerAssociation
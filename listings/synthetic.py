@@ -0,0 +1,473 @@
+import hashlib
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User  # type: ignore
+from django.core.management.color import no_style  # type: ignore
+from django.db import connection, transaction  # type: ignore
+from django.db.models import Max  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from . import associations, fulltext, market_stats, response_cache
+
+
+# Συνθετικά δεδομένα για benchmarks και δοκιμές κλίμακας (benchmark_endpoints, generate_data).
+# Τα δεδομένα παράγονται σε chunks σταθερού μεγέθους και κάθε chunk έχει δικό του RNG
+# (seed, είδος, αριθμός chunk), οπότε το αποτέλεσμα είναι ίδιο για το ίδιο seed ανεξάρτητα από
+# τη σειρά ή το process που γράφει κάθε chunk. Τα pks των ανθρώπων και των ακινήτων ορίζονται
+# ρητά (μετά τα υπάρχοντα), ώστε οι αναφορές μεταξύ chunks να μη χρειάζονται queries.
+
+CHUNK_SIZE = 2000
+
+# (νομός, πόλη, τιμή/m² αναφοράς, πρόθεμα Τ.Κ., βάρος, ((γειτονιά, lat, lng, συντελεστής τιμής), ...))
+CITIES = (
+    ('Αττική', 'Αθήνα', 2600, '10', 26, (
+        ('Κολωνάκι', 37.9780, 23.7440, 1.9), ('Παγκράτι', 37.9680, 23.7500, 1.2),
+        ('Κουκάκι', 37.9650, 23.7250, 1.15), ('Εξάρχεια', 37.9870, 23.7340, 1.0),
+        ('Κυψέλη', 38.0010, 23.7360, 0.85), ('Πατήσια', 38.0170, 23.7330, 0.7),
+    )),
+    ('Αττική', 'Γλυφάδα', 3900, '166', 6, (
+        ('Κέντρο', 37.8640, 23.7530, 1.1), ('Άνω Γλυφάδα', 37.8760, 23.7620, 0.9), ('Τερψιθέα', 37.8720, 23.7420, 1.0),
+    )),
+    ('Αττική', 'Μαρούσι', 3100, '151', 6, (
+        ('Κέντρο', 38.0500, 23.8080, 1.0), ('Πολύδροσο', 38.0370, 23.8040, 1.15), ('Άγιος Θωμάς', 38.0420, 23.7980, 0.9),
+    )),
+    ('Αττική', 'Κηφισιά', 3600, '145', 5, (
+        ('Κεφαλάρι', 38.0760, 23.8130, 1.25), ('Νέα Ερυθραία', 38.0950, 23.8190, 1.0), ('Πολιτεία', 38.0850, 23.8300, 1.1),
+    )),
+    ('Αττική', 'Πειραιάς', 2100, '185', 9, (
+        ('Καστέλλα', 37.9400, 23.6590, 1.3), ('Πειραϊκή', 37.9350, 23.6330, 1.15),
+        ('Νέο Φάληρο', 37.9500, 23.6650, 0.95), ('Κοκκινιά', 37.9580, 23.6450, 0.75),
+    )),
+    ('Θεσσαλονίκη', 'Θεσσαλονίκη', 2000, '54', 17, (
+        ('Κέντρο', 40.6330, 22.9430, 1.2), ('Άνω Πόλη', 40.6420, 22.9520, 1.0), ('Καλαμαριά', 40.5830, 22.9500, 1.1),
+        ('Τούμπα', 40.6150, 22.9680, 0.85), ('Νεάπολη', 40.6530, 22.9390, 0.7),
+    )),
+    ('Αχαΐα', 'Πάτρα', 1250, '262', 6, (
+        ('Κέντρο', 38.2460, 21.7350, 1.1), ('Άνω Πόλη', 38.2440, 21.7440, 1.0), ('Ρίο', 38.2950, 21.7880, 1.2),
+    )),
+    ('Ηρακλείου', 'Ηράκλειο', 1700, '71', 6, (
+        ('Κέντρο', 35.3390, 25.1330, 1.15), ('Αμμουδάρα', 35.3350, 25.0750, 1.0), ('Πόρος', 35.3370, 25.1470, 0.9),
+    )),
+    ('Λάρισας', 'Λάρισα', 1100, '412', 5, (
+        ('Κέντρο', 39.6390, 22.4180, 1.15), ('Αμπελόκηποι', 39.6280, 22.4260, 0.9), ('Νεάπολη', 39.6310, 22.4050, 0.85),
+    )),
+    ('Ιωαννίνων', 'Ιωάννινα', 1300, '452', 4, (
+        ('Κάστρο', 39.6680, 20.8580, 1.2), ('Αμπελόκηποι', 39.6620, 20.8450, 0.95), ('Ανατολή', 39.6430, 20.8790, 0.85),
+    )),
+    ('Μεσσηνίας', 'Καλαμάτα', 1350, '241', 4, (
+        ('Κέντρο', 37.0390, 22.1140, 1.0), ('Παραλία', 37.0230, 22.1120, 1.2),
+    )),
+    ('Κυκλάδων', 'Νάξος', 2700, '843', 3, (
+        ('Χώρα', 37.1030, 25.3770, 1.1), ('Αγία Άννα', 37.0670, 25.3530, 1.3), ('Πλάκα', 37.0420, 25.3630, 1.2),
+    )),
+)
+CITY_WEIGHTS = tuple(city[4] for city in CITIES)
+
+# (τύπος, ετικέτα, βάρος, εύρος εμβαδού m², συντελεστής τιμής/m²)
+PROPERTY_TYPES = (
+    ('apartment', 'Διαμέρισμα', 60, (40, 150), 1.0),
+    ('house', 'Μονοκατοικία', 17, (80, 260), 0.95),
+    ('villa', 'Βίλα', 5, (180, 480), 1.5),
+    ('commercial', 'Επαγγελματικός χώρος', 11, (30, 400), 0.9),
+    ('plot', 'Οικόπεδο', 7, (250, 2500), 0.12),
+)
+TYPE_WEIGHTS = tuple(kind[2] for kind in PROPERTY_TYPES)
+
+# Από την καλύτερη στη χειρότερη, με τον συντελεστή τιμής/m² κάθε κλάσης
+ENERGY_CLASSES = (
+    ('A+', 1.25), ('A', 1.18), ('B+', 1.1), ('B', 1.05), ('C', 1.0), ('D', 0.95), ('E', 0.9), ('F', 0.85), ('G', 0.8),
+)
+
+STREETS = (
+    'Ερμού', 'Πανεπιστημίου', 'Ακαδημίας', 'Σόλωνος', 'Αγίου Δημητρίου', 'Ελευθερίου Βενιζέλου', 'Παπαναστασίου',
+    'Τσιμισκή', 'Εγνατίας', 'Κολοκοτρώνη', 'Καραϊσκάκη', 'Μιαούλη', 'Κανάρη', 'Αθηνάς', '25ης Μαρτίου', 'Ομήρου',
+    'Αριστοτέλους', 'Περικλέους', 'Ιπποκράτους', 'Μητροπόλεως',
+)
+FIRST_NAMES = (
+    ('Γιώργος', 'Νίκος', 'Κώστας', 'Δημήτρης', 'Γιάννης', 'Παναγιώτης', 'Βασίλης', 'Χρήστος', 'Αντώνης', 'Μιχάλης'),
+    ('Μαρία', 'Ελένη', 'Κατερίνα', 'Βασιλική', 'Σοφία', 'Αγγελική', 'Δήμητρα', 'Γεωργία', 'Ιωάννα', 'Χριστίνα'),
+)
+LAST_NAMES = (
+    ('Παπαδόπουλος', 'Παπαδόπουλου'), ('Γεωργίου', 'Γεωργίου'), ('Νικολάου', 'Νικολάου'), ('Οικονόμου', 'Οικονόμου'),
+    ('Βλάχος', 'Βλάχου'), ('Αθανασίου', 'Αθανασίου'), ('Κωνσταντίνου', 'Κωνσταντίνου'), ('Δημητρίου', 'Δημητρίου'),
+    ('Ιωάννου', 'Ιωάννου'), ('Μακρής', 'Μακρή'), ('Αλεξίου', 'Αλεξίου'), ('Καραγιάννης', 'Καραγιάννη'),
+)
+ID_LETTERS = 'ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ'
+KEYWORDS = (
+    'θέα', 'μετρό', 'πάρκινγκ', 'αποθήκη', 'ηλιακός', 'τζάκι', 'κήπος', 'πισίνα', 'κοντά σε σχολεία',
+    'ήσυχη περιοχή', 'διαμπερές', 'γωνιακό', 'ρετιρέ', 'ανακαινισμένο',
+)
+TICKET_SUBJECTS = (
+    'Ερώτηση για την προκαταβολή', 'Πρόβλημα με το ραντεβού επίσκεψης', 'Αλλαγή στοιχείων επικοινωνίας',
+    'Έγγραφα συμβολαίου', 'Ο μεσίτης δεν απαντά',
+)
+IMAGE_BASE = 'https://images.example.gr/properties'
+
+
+def counts(scale):
+    """Πλήθος ανθρώπων ανά ρόλο για scale ακίνητα· οι υπόλοιπες εγγραφές εξαρτώνται από τα ακίνητα."""
+    return {
+        'seller': max(1, scale // 8),
+        'agent': max(1, scale // 40),
+        'buyer': max(1, scale // 3),
+        'property': scale,
+    }
+
+
+def spread(index, size, salt):
+    """Ντετερμινιστική, ομοιόμορφη επιλογή σε [0, size) για ένα index χωρίς RNG (π.χ. ο seller του ακινήτου i)."""
+    return ((index + 1) * 2654435761 + salt * 40503) % 4294967291 % size
+
+
+class Dataset:
+    """
+    Περιγραφή ενός συνθετικού συνόλου: scale, seed και τα offsets των pks (τα μέγιστα που
+    υπάρχουν ήδη στη βάση). Ό,τι χρειάζεται ένα chunk υπολογίζεται από εδώ, οπότε το
+    Dataset μπορεί να σταλεί σε worker processes.
+    """
+
+    def __init__(self, scale, seed=0, offsets=None, now=None):
+        self.scale = scale
+        self.seed = seed
+        self.counts = counts(scale)
+        self.offsets = offsets or {}
+        # Ημερομηνίες σχετικές με τα μεσάνυχτα (UTC) της ημέρας, ώστε η ίδια ημέρα να δίνει τα ίδια δεδομένα
+        self.now = now or timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def for_database(cls, scale, seed=0):
+        from .models import Agent, Buyer, Property, Seller
+        offsets = {name: model.objects.aggregate(top=Max('pk'))['top'] or 0
+                   for name, model in (('user', User), ('seller', Seller), ('buyer', Buyer), ('property', Property))}
+        offsets['agent'] = Agent.objects.count()
+        return cls(scale, seed, offsets)
+
+    def rng(self, kind, chunk):
+        return random.Random(f'{self.seed}:{kind}:{chunk}')
+
+    def chunks(self, kind):
+        return range((self.counts[kind] + CHUNK_SIZE - 1) // CHUNK_SIZE)
+
+    def bounds(self, kind, chunk):
+        return chunk * CHUNK_SIZE, min((chunk + 1) * CHUNK_SIZE, self.counts[kind])
+
+    def pk(self, kind, index):
+        return self.offsets.get(kind, 0) + index + 1
+
+    def agent_pk(self, index):
+        digest = hashlib.md5(f'{self.seed}:agent:{self.offsets.get("agent", 0) + index}'.encode()).digest()
+        return uuid.UUID(bytes=digest, version=4)
+
+    def user_pk(self, role, index):
+        before = {'seller': 0, 'buyer': self.counts['seller'], 'agent': self.counts['seller'] + self.counts['buyer']}
+        return self.offsets.get('user', 0) + before[role] + index + 1
+
+    def handles_visits(self, seller_index):
+        return spread(seller_index, 10, 1) < 7
+
+    def property_seller(self, index):
+        return spread(index, self.counts['seller'], 2)
+
+    def property_agent(self, index):
+        return spread(index, self.counts['agent'], 3) if spread(index, 10, 4) < 6 else None
+
+
+def _name(rng):
+    gender = rng.randrange(2)
+    return f'{rng.choice(FIRST_NAMES[gender])} {rng.choice(LAST_NAMES)[gender]}'
+
+
+def _identification_number(rng):
+    return f'{rng.choice(ID_LETTERS)}{rng.choice(ID_LETTERS)} {rng.randrange(100000, 1000000)}'
+
+
+# --- Άνθρωποι ---
+
+ROLE_PHONE_PREFIX = {'seller': '690', 'buyer': '691', 'agent': '692'}
+
+
+def build_people(ds, role, chunk):
+    """(users, instances) του role για το chunk, μη αποθηκευμένα και με ρητά pks."""
+    from .models import Agent, Buyer, Seller
+    rng = ds.rng(role, chunk)
+    users, people = [], []
+    for index in range(*ds.bounds(role, chunk)):
+        user_pk = ds.user_pk(role, index)
+        name = _name(rng)
+        first_name, last_name = name.split(' ', 1)
+        email = f'{role}{user_pk}@example.gr'
+        # Χωρίς κωδικό: τα tokens/κωδικοί δίνονται από όποιον χρειάζεται λογαριασμό (π.χ. benchmark)
+        users.append(User(id=user_pk, username=f'{role}-{user_pk}', password='!', email=email,
+                          first_name=first_name, last_name=last_name))
+        common = {'user_id': user_pk, 'name': name, 'email': email, 'phone': f'+30{ROLE_PHONE_PREFIX[role]}{user_pk:09d}'}
+        if role == 'seller':
+            people.append(Seller(id=ds.pk('seller', index), handle_visits=ds.handles_visits(index), **common))
+        elif role == 'agent':
+            people.append(Agent(agent_id=ds.agent_pk(index), is_verified=index == 0 or rng.random() < 0.85,
+                                commission=rng.choice((1.5, 2.0, 2.5, 3.0)), **common))
+        else:
+            agent = spread(index, ds.counts['agent'], 5) if rng.random() < 0.3 else None
+            people.append(Buyer(id=ds.pk('buyer', index), identification_number=_identification_number(rng),
+                                agent_id=None if agent is None else ds.agent_pk(agent), **common))
+    return users, people
+
+
+def write_people(ds, role, chunk):
+    from .models import Agent, Buyer, Seller
+    users, people = build_people(ds, role, chunk)
+    model = {'seller': Seller, 'buyer': Buyer, 'agent': Agent}[role]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        model.objects.bulk_create(people)
+    return {role: len(people)}
+
+
+# --- Ακίνητα και ιστορικό τους ---
+
+def _energy_class(rng, year_built, renovated):
+    # Νεότερα (ή ανακαινισμένα) κτίρια έχουν καλύτερη ενεργειακή κλάση
+    position = (2025 - year_built) / 65 * len(ENERGY_CLASSES) + rng.gauss(0, 1.3) - (2 if renovated else 0)
+    return ENERGY_CLASSES[min(max(int(position), 0), len(ENERGY_CLASSES) - 1)]
+
+
+def build_property(ds, rng, index):
+    from .models import Property
+    state, city, base_price, postal_prefix, _, neighborhoods = rng.choices(CITIES, CITY_WEIGHTS)[0]
+    neighborhood, lat, lng, location_factor = rng.choice(neighborhoods)
+    kind, label, _, (min_area, max_area), type_factor = rng.choices(PROPERTY_TYPES, TYPE_WEIGHTS)[0]
+    area = round(rng.triangular(min_area, max_area, min_area + (max_area - min_area) * 0.3))
+    pk = ds.pk('property', index)
+    agent = ds.property_agent(index)
+    values = {
+        'id': pk, 'seller_id': ds.pk('seller', ds.property_seller(index)),
+        'agent_id': None if agent is None else ds.agent_pk(agent),
+        'property_type': kind, 'area': Decimal(area),
+        'state': state, 'city': city, 'neighborhood': neighborhood,
+        'street': rng.choice(STREETS), 'number': str(rng.randint(1, 180)),
+        'postal_code': f'{postal_prefix}{rng.randrange(10 ** (5 - len(postal_prefix))):0{5 - len(postal_prefix)}d}',
+        'coordinates': {'lat': round(lat + rng.gauss(0, 0.006), 6), 'lng': round(lng + rng.gauss(0, 0.006), 6)},
+        'is_verified': rng.random() < 0.7,
+        'negotiable': rng.random() < 0.4,
+        'keywords': rng.sample(KEYWORDS, rng.randint(1, 4)),
+        'images': [f'{IMAGE_BASE}/{pk}/{n}.jpg' for n in range(rng.choice((0, 1, 3, 5, 8)))],
+    }
+
+    factor = base_price * location_factor * type_factor
+    if kind == 'plot':
+        values['title'] = f'{label} {area} τ.μ., {neighborhood} {city}'
+        values['short_description'] = f'{label} {area} τ.μ. {"εντός" if rng.random() < 0.7 else "εκτός"} σχεδίου'
+        values['building_permit'] = rng.random() < 0.3
+    else:
+        year_built = rng.randint(1960, 2024)
+        condition = rng.choices(('renovated', 'needsRenovation', 'underConstruction', None), (3, 2, 1, 4))[0]
+        energy_class, energy_factor = _energy_class(rng, year_built, condition == 'renovated')
+        rooms = max(1, round(area / rng.uniform(28, 45)))
+        floor = rng.choice(('Ισόγειο', '1ος', '2ος', '3ος', '4ος', '5ος', 'Ρετιρέ')) if kind != 'house' else None
+        values.update({
+            'year_built': year_built, 'condition': condition, 'energy_class': energy_class,
+            'bedrooms': rooms if kind != 'commercial' else None, 'rooms': rooms if kind == 'commercial' else None,
+            'bathrooms': max(1, rooms // 2), 'floor': floor, 'parking_spaces': rng.choice((0, 0, 1, 1, 2)),
+            'heating_type': rng.choice(('autonomous', 'central', 'heatpump')),
+            'elevator': floor not in (None, 'Ισόγειο') and year_built > 1970,
+            'garden': kind in ('house', 'villa'), 'pool': 'private' if kind == 'villa' and rng.random() < 0.6 else None,
+            'has_balcony': kind == 'apartment', 'furnished': rng.random() < 0.2,
+        })
+        values['title'] = f'{label} {area} τ.μ., {neighborhood} {city}'
+        values['short_description'] = f'{label} {rooms} χώρων, κατασκευή {year_built}, ενεργειακή κλάση {energy_class}'
+        # Παλαιότερα κτίρια φθηνότερα, έως -25% για τα πιο παλιά
+        factor *= energy_factor * (1 - min(max(2015 - year_built, 0), 50) * 0.005)
+    values['full_description'] = (
+        f"{values['short_description']}. Βρίσκεται στην οδό {values['street']} {values['number']}, "
+        f"{neighborhood}, {city}. {', '.join(values['keywords']).capitalize()}."
+    )
+    price = max(5000, round(area * factor * rng.lognormvariate(0, 0.12) / 500) * 500)
+    values['price'] = Decimal(price)
+
+    instance = Property(**values)
+    instance.update_derived_fields()
+    return instance
+
+
+def _scheduled(ds, rng):
+    # Επισκέψεις από έναν μήνα πριν έως έναν μήνα μετά, σε ώρες γραφείου (UTC)
+    return ds.now + timedelta(days=rng.randint(-30, 30), hours=rng.randint(7, 16), minutes=rng.choice((0, 30)))
+
+
+def build_history(ds, rng, index, prop):
+    """Συναλλαγές (με την πρόοδό τους), leads, αιτήματα επίσκεψης και συσχετίσεις μεσιτών για ένα ακίνητο."""
+    from .models import AgentBuyerAssociation, Lead, Transaction, VisitRequest
+    history = {'transactions': [], 'leads': [], 'visits': [], 'associations': []}
+    buyers = ds.counts['buyer']
+    seller_index = ds.property_seller(index)
+
+    roll = rng.random()
+    status = 'FINALIZED' if roll < 0.06 else 'DEPOSIT_PAID' if roll < 0.11 else 'PRE_DEPOSIT' if roll < 0.25 else None
+    if rng.random() < 0.03:
+        history['transactions'].append(Transaction(
+            property_id=prop.pk, buyer_id=ds.pk('buyer', rng.randrange(buyers)), agent_id=prop.agent_id, status='CANCELLED',
+        ))
+    if status is not None:
+        paid = status != 'PRE_DEPOSIT'
+        history['transactions'].append(Transaction(
+            property_id=prop.pk, buyer_id=ds.pk('buyer', rng.randrange(buyers)), agent_id=prop.agent_id, status=status,
+            deposit_paid=paid, deposit_amount=(prop.price / 10).quantize(Decimal('1.00')) if paid else None,
+        ))
+        prop.is_sold = status == 'FINALIZED'
+        prop.is_reserved = status == 'DEPOSIT_PAID'
+
+    if prop.agent_id is not None:
+        for _ in range(rng.choice((0, 0, 1, 1, 2, 3))):
+            interested = rng.random() < 0.5
+            locked = not interested and rng.random() < 0.5
+            history['leads'].append(Lead(
+                agent_id=prop.agent_id, property_id=prop.pk, buyer_id=ds.pk('buyer', rng.randrange(buyers)),
+                interested=interested, otp_verified=rng.random() < 0.6,
+                locked_until=ds.now + timedelta(days=rng.randint(-60, 90)) if locked else None,
+            ))
+        roll = rng.random()
+        if roll < 0.15:
+            accepted = rng.choice((True, False, None))
+            history['associations'].append(AgentBuyerAssociation(
+                agent_id=prop.agent_id, property_id=prop.pk, buyer_id=ds.pk('buyer', rng.randrange(buyers)),
+                accepted=accepted, lock_until=ds.now + timedelta(days=rng.randint(-7, 14)) if accepted is False else None,
+            ))
+        elif roll < 0.2:
+            # Προσωρινή συσχέτιση για αγοραστή που δεν έχει εγγραφεί (bulk_create: τα keys χωρίς save())
+            name, identification_number = _name(rng), _identification_number(rng)
+            history['associations'].append(AgentBuyerAssociation(
+                agent_id=prop.agent_id, property_id=prop.pk, temp_buyer_name=name,
+                temp_buyer_identification_number=identification_number,
+                temp_buyer_name_key=associations.normalize_name(name),
+                temp_buyer_id_key=associations.normalize_id(identification_number),
+            ))
+
+    handles = ds.handles_visits(seller_index)
+    for _ in range(rng.choice((0, 0, 0, 1, 1, 2))):
+        scheduled = _scheduled(ds, rng)
+        visit_status = rng.choices(('PENDING', 'APPROVED', 'REJECTED', 'CANCELLED_BY_BUYER'), (4, 4, 1, 1))[0]
+        history['visits'].append(VisitRequest(
+            property_id=prop.pk, buyer_id=ds.pk('buyer', rng.randrange(buyers)),
+            handler_id=ds.user_pk('seller', seller_index) if handles else None, delegated=not handles,
+            scheduled_date=scheduled, ends_at=scheduled + timedelta(minutes=30), status=visit_status,
+        ))
+    return history
+
+
+PROGRESS_STEPS = {
+    'PRE_DEPOSIT': ('INQUIRY', 'APPOINTMENT_SCHEDULED', 'APPOINTMENT_COMPLETED', 'PRE_DEPOSIT'),
+    'DEPOSIT_PAID': ('INQUIRY', 'APPOINTMENT_SCHEDULED', 'APPOINTMENT_COMPLETED', 'DOCUMENT_CHECK', 'PRE_DEPOSIT',
+                     'CONTRACT_SIGNING'),
+    'FINALIZED': ('INQUIRY', 'APPOINTMENT_SCHEDULED', 'APPOINTMENT_COMPLETED', 'DOCUMENT_CHECK', 'PRE_DEPOSIT',
+                  'CONTRACT_SIGNING', 'COMPLETED'),
+    'CANCELLED': ('INQUIRY', 'APPOINTMENT_SCHEDULED'),
+}
+
+
+def write_properties(ds, chunk):
+    """Ακίνητα του chunk με όλο το ιστορικό τους, σε ένα transaction. Επιστρέφει πλήθη ανά είδος."""
+    from .models import AgentBuyerAssociation, Lead, Property, Transaction, TransactionProgress, VisitRequest
+    rng = ds.rng('property', chunk)
+    properties = []
+    history = {'transactions': [], 'leads': [], 'visits': [], 'associations': []}
+    for index in range(*ds.bounds('property', chunk)):
+        prop = build_property(ds, rng, index)
+        for name, rows in build_history(ds, rng, index, prop).items():
+            history[name] += rows
+        properties.append(prop)
+
+    with transaction.atomic():
+        Property.objects.bulk_create(properties)
+        # Τα pks των συναλλαγών επιστρέφονται από το bulk_create (RETURNING σε SQLite 3.35+/PostgreSQL)
+        Transaction.objects.bulk_create(history['transactions'])
+        progress = [
+            TransactionProgress(transaction_id=item.pk, status=step)
+            for item in history['transactions'] for step in PROGRESS_STEPS[item.status]
+        ]
+        TransactionProgress.objects.bulk_create(progress)
+        Lead.objects.bulk_create(history['leads'])
+        VisitRequest.objects.bulk_create(history['visits'])
+        AgentBuyerAssociation.objects.bulk_create(history['associations'])
+        if fulltext.is_supported():
+            fulltext.index_properties([
+                (prop.pk, prop.title, prop.short_description, prop.full_description, prop.keywords) for prop in properties
+            ])
+    return {'property': len(properties), 'transaction': len(history['transactions']), 'progress': len(progress),
+            'lead': len(history['leads']), 'visit_request': len(history['visits']),
+            'association': len(history['associations'])}
+
+
+def write_tickets(ds, chunk):
+    """Support tickets (και τα μηνύματά τους) για περίπου 10% των αγοραστών του chunk."""
+    from .models import SupportMessage, SupportTicket
+    rng = ds.rng('ticket', chunk)
+    tickets, threads = [], []
+    for index in range(*ds.bounds('buyer', chunk)):
+        if rng.random() >= 0.1:
+            continue
+        for _ in range(rng.choice((1, 1, 2))):
+            about = rng.random() < 0.7
+            tickets.append(SupportTicket(
+                buyer_id=ds.pk('buyer', index), subject=rng.choice(TICKET_SUBJECTS),
+                property_id=ds.pk('property', rng.randrange(ds.counts['property'])) if about else None,
+                description='Καλησπέρα, θα ήθελα βοήθεια σχετικά με το παραπάνω θέμα.',
+                status=rng.choices(('OPEN', 'CLOSED'), (3, 2))[0],
+            ))
+            threads.append((ds.user_pk('buyer', index), rng.randint(1, 6)))
+
+    with transaction.atomic():
+        SupportTicket.objects.bulk_create(tickets)
+        messages = [
+            SupportMessage(ticket_id=ticket.pk, sender_id=sender, content=f'Μήνυμα {number + 1} για το αίτημα.')
+            for ticket, (sender, total) in zip(tickets, threads) for number in range(total)
+        ]
+        SupportMessage.objects.bulk_create(messages)
+    return {'ticket': len(tickets), 'message': len(messages)}
+
+
+def tasks(ds):
+    """
+    (όνομα, εργασίες) με τη σειρά εξαρτήσεων: πρώτα οι άνθρωποι, μετά τα ακίνητα, στο τέλος τα
+    tickets. Οι εργασίες ενός σταδίου είναι ανεξάρτητες και μπορούν να τρέξουν παράλληλα.
+    """
+    return [
+        ('people', [(write_people, role, chunk) for role in ('seller', 'agent', 'buyer') for chunk in ds.chunks(role)]),
+        ('properties', [(write_properties, chunk) for chunk in ds.chunks('property')]),
+        ('tickets', [(write_tickets, chunk) for chunk in ds.chunks('buyer')]),
+    ]
+
+
+def run_task(ds, task):
+    function, *args = task
+    return function(ds, *args)
+
+
+def add_counts(total, part):
+    for name, value in part.items():
+        total[name] = total.get(name, 0) + value
+    return total
+
+
+def finish():
+    """Μετά το bulk_create: sequences (PostgreSQL, λόγω ρητών pks), στατιστικά αγοράς και cache λιστών."""
+    from .models import Buyer, Property, Seller
+    statements = connection.ops.sequence_reset_sql(no_style(), [User, Seller, Buyer, Property])
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    market_stats.rebuild()
+    response_cache.clear()
+
+
+def seed(scale, seed=0):
+    """Γράφει ένα πλήρες συνθετικό σύνολο για scale ακίνητα στο τρέχον process. Επιστρέφει πλήθη ανά είδος."""
+    ds = Dataset.for_database(scale, seed)
+    total = {}
+    for _, stage in tasks(ds):
+        for task in stage:
+            add_counts(total, run_task(ds, task))
+    finish()
+    return total
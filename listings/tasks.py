@@ -0,0 +1,57 @@
+import logging
+
+from django.core.mail import send_mail  # type: ignore
+from django.db import transaction as db_transaction  # type: ignore
+
+from . import otp
+from .jobs import task
+from .models import Buyer, Lead, Transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+# Οι εργασίες εκτελούνται από το manage.py run_workers (βλ. listings/jobs.py).
+# Εδώ θα γίνονται οι κλήσεις σε SMS/email/τραπεζικά APIs, εκτός του request.
+
+
+def _send_otp(buyer, lead=None):
+    """
+    Εκδίδει και στέλνει στον αγοραστή νέο κωδικό, εκτός αν έχει ήδη ενεργό. Ο κωδικός
+    δημιουργείται εδώ, ώστε να μη γράφεται ποτέ στη βάση (ούτε στο payload της εργασίας).
+    Αν η αποστολή αποτύχει, το rollback σβήνει και τον κωδικό και το retry εκδίδει νέο.
+    """
+    with db_transaction.atomic():
+        issued = otp.issue_pending(buyer, lead=lead)
+        if issued is None:
+            # Επανεκτέλεση μετά από επιτυχή αποστολή (π.χ. ο worker χάθηκε πριν το done)
+            return
+        _, code = issued
+        send_mail(
+            'Κωδικός επιβεβαίωσης',
+            f'Ο κωδικός σας είναι {code}. Ισχύει για {otp.config()["TTL"] // 60} λεπτά.',
+            None, [buyer.email],
+        )
+    logger.info("Sent OTP%s to buyer %s (%s)", f' for lead {lead.id}' if lead else '', buyer.id, buyer.email)
+
+
+@task('send_lead_otp')
+def send_lead_otp(lead_id):
+    lead = Lead.objects.select_related('buyer').get(pk=lead_id)
+    _send_otp(lead.buyer, lead=lead)
+
+
+@task('send_buyer_otp')
+def send_buyer_otp(buyer_id):
+    _send_otp(Buyer.objects.get(pk=buyer_id))
+
+
+@task('pay_agent_commission', max_attempts=10)
+def pay_agent_commission(transaction_id):
+    transaction = Transaction.objects.select_related('agent').get(pk=transaction_id)
+    agent = transaction.agent
+    if not agent:
+        return
+    # Το id της συναλλαγής ως idempotency key προς τον πάροχο, ώστε ένα retry να μην πληρώνει δύο φορές
+    logger.info("Paying %s€ to agent %s (IBAN=%s), reference commission-%s",
+                transaction.deposit_amount, agent.name, agent.iban, transaction.id)
@@ -1,3 +1,1307 @@
-from django.test import TestCase
+import base64
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import tempfile
+import time
+import unittest
+import urllib.request
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import caches
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection, transaction as db_transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from . import associations, benchmark, documents, fulltext, geo, images, jobs, locks, market_stats, metrics, nplusone, otp, response_cache, scheduling, synthetic, tasks, throttling
+from .authentication import TokenCache, token_cache
+from .models import Agent, AgentBuyerAssociation, Buyer, Job, Lead, MarketStat, OTPRecord, Property, Seller, SupportTicket, Transaction, VisitAvailability, VisitRequest
+from .serializers import PROPERTY_LIST_ANNOTATIONS, PROPERTY_LIST_FIELDS, PropertyListSerializer, SupportTicketSerializer
+
+
+class PropertySearchTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.client.force_authenticate(self.user)
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        self.athens_flat = self.create_property('Αθήνα', 'apartment', '100000')
+        self.athens_house = self.create_property('Αθήνα', 'house', '300000')
+        self.patras_flat = self.create_property('Πάτρα', 'apartment', '120000')
+        self.patras_loft = self.create_property('Πάτρα', 'apartment', '500000')
+
+    def create_property(self, city, property_type, price):
+        return Property.objects.create(
+            seller=self.seller, title=f'{property_type} {city}', full_description='-', property_type=property_type,
+            area=Decimal('80'), price=Decimal(price), state='Αττική', city=city, street='Οδός', number='1',
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse('property-search'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_facet_counts_ignore_their_own_filter(self):
+        data = self.search(city='Αθήνα', property_type='apartment')
+        self.assertEqual([row['id'] for row in data['results']], [self.athens_flat.id])
+        facets = data['facets']
+        # city: μόνο με το φίλτρο property_type
+        self.assertEqual(facets['city'], [{'value': 'Πάτρα', 'count': 2}, {'value': 'Αθήνα', 'count': 1}])
+        # property_type: μόνο με το φίλτρο city
+        self.assertEqual(facets['property_type'], [{'value': 'apartment', 'count': 1}, {'value': 'house', 'count': 1}])
+        self.assertEqual(facets['price'], {'min': Decimal('100000'), 'max': Decimal('100000')})
+
+    def test_range_filter_applies_to_other_facets_but_not_its_own_range(self):
+        facets = self.search(max_price='200000')['facets']
+        self.assertEqual(facets['city'], [{'value': 'Αθήνα', 'count': 1}, {'value': 'Πάτρα', 'count': 1}])
+        self.assertEqual(facets['price'], {'min': Decimal('100000'), 'max': Decimal('500000')})
+
+    def test_filters_combine(self):
+        # Τιμές της ίδιας διάστασης: OR· διαφορετικές διαστάσεις: AND
+        data = self.search(city='Αθήνα,Πάτρα', property_type='apartment', min_price='110000', ordering='price')
+        self.assertEqual([row['id'] for row in data['results']], [self.patras_flat.id, self.patras_loft.id])
+        data = self.client.get(f"{reverse('property-search')}?city=Αθήνα&city=Πάτρα&max_price=150000&ordering=-price").data
+        self.assertEqual([row['id'] for row in data['results']], [self.patras_flat.id, self.athens_flat.id])
+
+    def test_invalid_filters_are_rejected(self):
+        for params in ({'property_type': 'castle'}, {'min_price': 'cheap'}, {'ordering': 'title'}):
+            self.assertEqual(self.client.get(reverse('property-search'), params).status_code, 400)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.client.force_authenticate(self.user)
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+
+    def create_property(self, price):
+        return Property.objects.create(
+            seller=self.seller, title=f'Ακίνητο {price}', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal(price), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+
+    @staticmethod
+    def cursor(payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def walk(self, params):
+        data = self.get(reverse('property-search'), params)
+        pages = [[row['id'] for row in data['results']]]
+        while data['next']:
+            data = self.get(data['next'])
+            pages.append([row['id'] for row in data['results']])
+        return pages, data
+
+    def test_next_and_previous_cursors(self):
+        ids = [self.create_property(price).id for price in ('100000', '200000', '300000', '400000', '500000')]
+        pages, last = self.walk({'ordering': 'price', 'page_size': 2})
+        self.assertEqual(pages, [ids[0:2], ids[2:4], ids[4:]])
+        self.assertIsNone(last['next'])
+
+        previous = self.get(last['previous'])
+        self.assertEqual([row['id'] for row in previous['results']], ids[2:4])
+        first = self.get(previous['previous'])
+        self.assertEqual([row['id'] for row in first['results']], ids[0:2])
+        self.assertIsNone(first['previous'])
+
+    def test_ties_are_broken_by_pk(self):
+        ids = [self.create_property('150000').id for _ in range(5)]
+        pages, _ = self.walk({'ordering': 'price', 'page_size': 2})
+        self.assertEqual(sum(pages, []), ids)
+        pages, _ = self.walk({'ordering': '-price', 'page_size': 2})
+        self.assertEqual(sum(pages, []), ids[::-1])
+
+    def test_invalid_cursor_is_not_found(self):
+        self.create_property('100000')
+        url = reverse('property-search')
+        for cursor in ('not-a-cursor', self.cursor({'v': ['1']}), self.cursor({'v': ['cheap', '1']})):
+            self.assertEqual(self.client.get(url, {'ordering': 'price', 'cursor': cursor}).status_code, 404)
+
+    def test_rows_inserted_between_pages(self):
+        ids = [self.create_property(price).id for price in ('100000', '200000', '300000', '400000')]
+        first = self.get(reverse('property-search'), {'ordering': 'price', 'page_size': 2})
+        self.assertEqual([row['id'] for row in first['results']], ids[:2])
+
+        # Πριν από το cursor: δεν εμφανίζεται ούτε μετατοπίζει την επόμενη σελίδα (όπως θα έκανε ένα OFFSET)
+        self.create_property('50000')
+        later = self.create_property('350000')
+        second = self.get(first['next'])
+        self.assertEqual([row['id'] for row in second['results']], [ids[2], later.id])
+        third = self.get(second['next'])
+        self.assertEqual([row['id'] for row in third['results']], [ids[3]])
+        self.assertIsNone(third['next'])
+
+
+@unittest.skipUnless(fulltext.is_supported(), 'full-text index requires SQLite FTS5 or PostgreSQL')
+class FullTextSearchTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.client.force_authenticate(self.user)
+        self.seller_user = User.objects.create_user('seller', password='secret')
+        self.seller = Seller.objects.create(user=self.seller_user, name='Seller', email='seller@example.com',
+                                            phone='6900000001')
+
+    def create_property(self, title, description='-', keywords=()):
+        return Property.objects.create(
+            seller=self.seller, title=title, full_description=description, keywords=list(keywords),
+            property_type='apartment', area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα',
+            street='Οδός', number='1',
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse('property-text-search'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_normalize_folds_case_accents_and_final_sigma(self):
+        self.assertEqual(fulltext.normalize('ΣΠΊΤΙ Κηφισιάς, Ϊ'), 'σπιτι κηφισιασ, ι')
+
+    def test_matches_ignoring_case_and_accents_and_by_prefix(self):
+        house = self.create_property('Μονοκατοικία στην Κηφισιά')
+        self.create_property('Διαμέρισμα στο Παγκράτι')
+        self.assertEqual(self.search('ΜΟΝΟΚΑΤΟΙΚΙΑ κηφισια'), [house.id])
+        self.assertEqual(self.search('κηφ'), [house.id])
+        # Πρόθεμα, όχι stemming
+        self.assertEqual(self.search('Κηφισιάς'), [])
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_description = self.create_property('Διαμέρισμα', description='Ανακαινισμένο, κοντά σε πάρκο με θέα')
+        in_keywords = self.create_property('Διαμέρισμα', keywords=['θέα'])
+        in_title = self.create_property('Διαμέρισμα με θέα')
+        self.assertEqual(self.search('θεα'), [in_title.id, in_keywords.id, in_description.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        kept = self.create_property('Μεζονέτα')
+        updated = self.create_property('Μεζονέτα')
+        updated.title = 'Ρετιρέ'
+        updated.save()
+        self.assertEqual(self.search('μεζονετα'), [kept.id])
+        self.assertEqual(self.search('ρετιρε'), [updated.id])
+
+        Property.objects.filter(pk=updated.pk).delete()
+        self.assertEqual(fulltext.search('ρετιρε'), [])
+        # Cascade από τον User του πωλητή
+        self.seller_user.delete()
+        self.assertEqual(fulltext.search('μεζονετα'), [])
+
+
+class GeoSearchTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.client.force_authenticate(self.user)
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+
+    def create_property(self, lat, lng):
+        return Property.objects.create(
+            seller=self.seller, title=f'{lat},{lng}', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+            coordinates={'lat': lat, 'lng': lng},
+        )
+
+    def bbox(self, min_lat, min_lng, max_lat, max_lng):
+        response = self.client.get(reverse('property-geo-bbox'), {
+            'min_lat': min_lat, 'min_lng': min_lng, 'max_lat': max_lat, 'max_lng': max_lng,
+        })
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.data['results']}
+
+    def radius(self, lat, lng, radius_km):
+        response = self.client.get(reverse('property-geo-radius'), {'lat': lat, 'lng': lng, 'radius_km': radius_km})
+        self.assertEqual(response.status_code, 200)
+        return [(row['id'], row['distance_km']) for row in response.data['results']]
+
+    def test_bbox_includes_points_on_cell_edges(self):
+        # 37.98/23.73: ακριβώς στο όριο κελιού του grid (CELL_SIZE 0.01)
+        edge = self.create_property(37.98, 23.73)
+        inside = self.create_property(37.985, 23.735)
+        self.assertEqual(self.bbox(37.98, 23.73, 37.99, 23.74), {edge.id, inside.id})
+        self.assertEqual(self.bbox(37.97, 23.72, 37.98, 23.73), {edge.id})
+        self.assertEqual(self.bbox(37.97, 23.72, 37.9799, 23.7299), set())
+
+    def test_bbox_without_cell_pruning_still_filters_by_range(self):
+        athens = self.create_property(37.98, 23.73)
+        self.create_property(40.64, 22.94)
+        self.assertIsNone(geo.cells_for_bbox(37, 23, 38, 24))
+        self.assertEqual(self.bbox(37, 23, 38, 24), {athens.id})
+
+    def test_antimeridian(self):
+        east = self.create_property(-17.0, 179.995)
+        west = self.create_property(-17.0, -179.995)
+        self.create_property(-17.0, 178.0)
+        self.assertEqual(self.bbox(-17.01, 179.99, -16.99, -179.99), {east.id, west.id})
+        self.assertEqual([item[0] for item in self.radius(-17.0, 179.999, 2)], [east.id, west.id])
+        self.assertEqual([item[0] for item in self.radius(-17.0, -179.999, 2)], [west.id, east.id])
+
+    def test_radius_cuts_off_bbox_corners_and_orders_by_distance(self):
+        lat, lng = 37.98, 23.73
+        km_lat = 1 / geo.KM_PER_DEGREE_LAT
+        km_lng = 1 / (geo.KM_PER_DEGREE_LAT * math.cos(math.radians(lat)))
+        near = self.create_property(lat + 0.5 * km_lat, lng)
+        far = self.create_property(lat - 1.9 * km_lat, lng)
+        # Μέσα στο bbox των 2km αλλά ~2.1km μακριά (γωνία του τετραγώνου)
+        corner = self.create_property(lat + 1.5 * km_lat, lng + 1.5 * km_lng)
+        self.assertGreater(geo.haversine_km(lat, lng, lat + 1.5 * km_lat, lng + 1.5 * km_lng), 2)
+
+        results = self.radius(lat, lng, 2)
+        self.assertEqual([property_id for property_id, _ in results], [near.id, far.id])
+        self.assertAlmostEqual(results[0][1], 0.5, places=2)
+        self.assertAlmostEqual(results[1][1], 1.9, places=2)
+        self.assertIn(corner.id, self.bbox(*geo.bbox_around(lat, lng, 2)))
+
+
+class AgentDashboardViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('agent', password='secret')
+        self.agent = Agent.objects.create(user=self.user, name='Agent', email='agent@example.com', phone='6900000000')
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        self.client.force_authenticate(self.user)
+
+    def create_property(self, title):
+        return Property.objects.create(
+            seller=self.seller, title=title, full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+
+    def create_buyers(self, count):
+        buyers = []
+        start = Buyer.objects.count()
+        for i in range(start, start + count):
+            buyer = Buyer.objects.create(name=f'Buyer {i}', email=f'buyer{i}@example.com', phone=f'69100000{i:02d}')
+            older = Transaction.objects.create(property=self.create_property(f'Old {i}'), buyer=buyer, agent=self.agent)
+            latest = Transaction.objects.create(property=self.create_property(f'New {i}'), buyer=buyer, agent=self.agent,
+                                                status='DEPOSIT_PAID')
+            buyers.append((buyer, older, latest))
+        return buyers
+
+    def test_returns_latest_transaction_per_buyer(self):
+        buyers = self.create_buyers(2)
+        response = self.client.get(reverse('agent_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['id'], row['transactionId'], row['propertyTitle'], row['status']) for row in response.data],
+            [(buyer.id, latest.id, latest.property.title, 'DEPOSIT_PAID') for buyer, _, latest in buyers],
+        )
+
+    def test_query_count_is_constant(self):
+        self.create_buyers(1)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('agent_dashboard'))
+
+        self.create_buyers(10)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('agent_dashboard'))
+        self.assertEqual(len(response.data), 11)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        response_cache.clear()
+        self.user = User.objects.create_user('agent', password='secret')
+        self.agent = Agent.objects.create(user=self.user, name='Agent', email='agent@example.com', phone='6900000000',
+                                          is_verified=True)
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_resolves_user_and_role_without_queries(self):
+        url = reverse('property-list')
+        with self.assertNumQueries(3):
+            # token + user + ρόλοι σε ένα query, συν ETag validators και λίστα
+            self.client.get(url)
+        with self.assertNumQueries(1):
+            # μόνο οι ETag validators, η λίστα έρχεται από τη response cache
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_role_change_invalidates_cache(self):
+        url = reverse('property-list')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.agent.is_verified = False
+        self.agent.save()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_deleted_token_is_rejected(self):
+        url = reverse('property-list')
+        self.client.get(url)
+        self.token.delete()
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+    @override_settings(AUTH_TOKEN_CACHE={'SHARED_CACHE': 'default'})
+    def test_revocation_reaches_other_processes_through_shared_cache(self):
+        caches['default'].clear()
+        # Δύο ανεξάρτητες caches, όπως σε δύο workers με κοινή Django cache
+        worker, other = TokenCache(), TokenCache()
+        self.assertTrue(worker.get_or_load(self.token.key).agent.is_verified)
+        self.assertTrue(other.get_or_load(self.token.key).agent.is_verified)
+        with self.assertNumQueries(0):
+            other.get_or_load(self.token.key)
+
+        self.agent.is_verified = False
+        # Τα signals ακυρώνουν μέσω του token_cache αυτού του process
+        self.agent.save()
+        self.assertFalse(other.get_or_load(self.token.key).agent.is_verified)
+
+        self.token.delete()
+        self.assertIsNone(other.get(self.token.key))
+        with self.assertRaises(Token.DoesNotExist):
+            other.get_or_load(self.token.key)
+
+    @override_settings(AUTH_TOKEN_CACHE={'SHARED_CACHE': None, 'LOCAL_TTL': 0})
+    def test_local_entries_expire_after_local_ttl_without_shared_cache(self):
+        cache = TokenCache()
+        cache.load(self.token.key)
+        self.assertIsNone(cache.get(self.token.key))
+
+
+class PropertyListSerializerTests(APITestCase):
+    class ReferenceSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = Property
+            fields = PROPERTY_LIST_FIELDS
+
+    def test_matches_model_serializer_for_rows_and_instances(self):
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        created = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('33.3'), price=Decimal('100000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+            coordinates={'lat': 37.9765, 'lng': 23.7358}, images=['https://cdn.example.com/1.jpg'],
+        )
+        instance = Property.objects.get(pk=created.pk)
+        row = Property.objects.values(*PROPERTY_LIST_FIELDS, **PROPERTY_LIST_ANNOTATIONS).get(pk=created.pk)
+
+        expected = dict(self.ReferenceSerializer(instance).data)
+        expected['thumbnail'] = images.thumbnail_url(created.pk, 'https://cdn.example.com/1.jpg')
+        self.assertEqual(PropertyListSerializer(instance).data, expected)
+        self.assertEqual(PropertyListSerializer(row).data, expected)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.client.force_authenticate(self.user)
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        self.property = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+
+    def test_not_modified_until_property_changes(self):
+        for url in (reverse('property-search'), reverse('property-detail', args=[self.property.pk])):
+            response = self.client.get(url)
+            etag = response['ETag']
+            self.assertTrue(etag.startswith('W/'))
+
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(not_modified.status_code, 304)
+            self.assertEqual(not_modified.content, b'')
+
+            self.property.title = f'{self.property.title}!'
+            self.property.save()
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_revalidates_after_delete(self):
+        url = reverse('property-search')
+        response = self.client.get(url)
+        # Μόνο ETag στις λίστες· το Last-Modified μένει στα detail endpoints
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('Last-Modified', self.client.get(reverse('property-detail', args=[self.property.pk])))
+        etag = response['ETag']
+
+        self.property.delete()
+        since = http_date(time.time() + 60)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.user = User.objects.create_user('agent', password='secret')
+        Agent.objects.create(user=self.user, name='Agent', email='agent@example.com', phone='6900000000', is_verified=True)
+        self.client.force_authenticate(self.user)
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+
+    def create_property(self, title, city):
+        return Property.objects.create(
+            seller=self.seller, title=title, full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city=city, street='Οδός', number='1',
+        )
+
+    def test_city_scope_is_invalidated_only_by_its_own_properties(self):
+        athens = self.create_property('Αθήνα 1', 'Αθήνα')
+        patras = self.create_property('Πάτρα 1', 'Πάτρα')
+        url = reverse('property-list')
+        params = {'city': 'Αθήνα'}
+
+        self.assertEqual(self.client.get(url, params)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url, params)['X-Cache'], 'HIT')
+
+        patras.price = Decimal('90000')
+        patras.save()
+        self.assertEqual(self.client.get(url, params)['X-Cache'], 'HIT')
+
+        # Η μετακίνηση σε άλλη πόλη ακυρώνει και την παλιά πόλη
+        athens = Property.objects.get(pk=athens.pk)
+        athens.city = 'Πάτρα'
+        athens.save()
+        response = self.client.get(url, params)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response_cache.stats(), {'hits': 2, 'misses': 2, 'hit_ratio': 0.5})
+
+    def test_query_param_order_does_not_matter(self):
+        self.create_property('Αθήνα 1', 'Αθήνα')
+        url = reverse('property-search')
+        self.assertEqual(self.client.get(f'{url}?city=Αθήνα&ordering=price')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f'{url}?ordering=price&city=Αθήνα')['X-Cache'], 'HIT')
+
+
+class ImportPropertiesCommandTests(APITestCase):
+    HEADER = 'seller,title,full_description,property_type,area,price,state,city,street,number,energy_class,garden\n'
+
+    def setUp(self):
+        response_cache.clear()
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'properties.csv')
+
+    def write(self, rows):
+        with open(self.path, 'w', encoding='utf-8') as handle:
+            handle.write(self.HEADER + ''.join(f'{row}\n' for row in rows))
+
+    def run_import(self, *args):
+        call_command('import_properties', self.path, '--batch-size', '2', *args, stdout=io.StringIO())
+
+    def test_imports_valid_rows_and_reports_errors(self):
+        self.write([
+            f'{self.seller.pk},Διαμέρισμα,-,apartment,80,160000,Αττική,Αθήνα,Οδός,1,B,yes',
+            f'{self.seller.pk},Κάστρο,-,castle,80,160000,Αττική,Αθήνα,Οδός,1,B,no',
+            f'{self.seller.pk + 1},Χωρίς πωλητή,-,house,100,200000,Αττική,Αθήνα,Οδός,2,,',
+        ])
+        self.run_import()
+
+        imported = Property.objects.get()
+        self.assertEqual(imported.price_per_square_meter, Decimal('2000.00'))
+        self.assertTrue(imported.garden)
+        with open(f'{self.path}.errors.jsonl', encoding='utf-8') as handle:
+            errors = {row['row']: row['errors'] for row in map(json.loads, handle)}
+        self.assertEqual(set(errors), {2, 3})
+        self.assertIn('property_type', errors[2])
+        self.assertEqual(errors[3], {'seller': 'Does not exist.'})
+
+    def test_resume_skips_committed_rows(self):
+        rows = [f'{self.seller.pk},Ακίνητο {i},-,apartment,80,160000,Αττική,Αθήνα,Οδός,{i},,' for i in range(3)]
+        self.write(rows[:2])
+        self.run_import()
+        self.write(rows)
+        self.run_import('--resume')
+        self.assertEqual(sorted(Property.objects.values_list('number', flat=True)), ['0', '1', '2'])
+
+
+class TransactionExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('seller', password='secret')
+        self.seller = Seller.objects.create(user=self.user, name='Seller', email='seller@example.com', phone='6900000001')
+        buyer = Buyer.objects.create(name='Αγοραστής', email='buyer@example.com', phone='6900000002')
+        for title in ('Πρώτο', 'Δεύτερο'):
+            prop = Property.objects.create(
+                seller=self.seller, title=title, full_description='-', property_type='apartment',
+                area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+            )
+            Transaction.objects.create(property=prop, buyer=buyer, deposit_amount=Decimal('1500.50'))
+        self.client.force_authenticate(self.user)
+
+    def export(self, output):
+        response = self.client.get(reverse('seller-transactions-export'), {'output': output})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
+    def test_csv_and_jsonl(self):
+        lines = self.export('csv').splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'property_id', 'property_title'])
+        self.assertEqual([line.split(',')[2] for line in lines[1:]], ['Δεύτερο', 'Πρώτο'])
+
+        rows = [json.loads(line) for line in self.export('jsonl').splitlines()]
+        self.assertEqual([row['buyer_name'] for row in rows], ['Αγοραστής', 'Αγοραστής'])
+        self.assertEqual(rows[0]['deposit_amount'], '1500.50')
+
+    def test_unknown_format_is_rejected(self):
+        self.assertEqual(self.client.get(reverse('seller-transactions-export'), {'output': 'xml'}).status_code, 400)
+
+    def test_csv_cells_are_not_formulas(self):
+        Property.objects.filter(title='Πρώτο').update(title='=HYPERLINK("http://example.com","x")')
+        Buyer.objects.update(name='@SUM(1+1)')
+        lines = self.export('csv').splitlines()
+        self.assertIn('"\'=HYPERLINK(""http://example.com"",""x"")"', lines[2])
+        self.assertIn("'@SUM(1+1)", lines[1])
+        # Τα JSONL μένουν ως έχουν
+        rows = [json.loads(line) for line in self.export('jsonl').splitlines()]
+        self.assertEqual(rows[0]['buyer_name'], '@SUM(1+1)')
+
+
+class MarketStatsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.client.force_authenticate(self.user)
+        self.seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+
+    def create_property(self, price, neighborhood='Κουκάκι', **extra):
+        return Property.objects.create(
+            seller=self.seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('100'), price=Decimal(price), state='Αττική', city='Αθήνα', neighborhood=neighborhood,
+            street='Οδός', number='1', **extra,
+        )
+
+    def snapshot(self):
+        return sorted(
+            MarketStat.objects.values_list('neighborhood', 'count', 'total', 'min_price', 'max_price', 'sketch')
+        )
+
+    def test_incremental_updates_match_rebuild(self):
+        cheapest = self.create_property('100000')
+        self.create_property('250000')
+        moved = self.create_property('300000', neighborhood='Παγκράτι')
+        sold = self.create_property('400000', neighborhood='Παγκράτι')
+
+        cheapest.price = Decimal('150000')
+        cheapest.save()
+        moved = Property.objects.get(pk=moved.pk)
+        moved.neighborhood = 'Κουκάκι'
+        moved.save()
+        sold.is_sold = True
+        sold.save()
+        self.create_property('500000', neighborhood=None).delete()
+
+        incremental = self.snapshot()
+        market_stats.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+        self.assertEqual(
+            [(row[0], row[1], row[3], row[4]) for row in incremental],
+            [('Κουκάκι', 3, Decimal('1500.00'), Decimal('3000.00'))],
+        )
+
+    def test_endpoint_merges_neighborhoods_per_city(self):
+        for price in ('100000', '200000', '300000'):
+            self.create_property(price)
+        self.create_property('400000', neighborhood='Παγκράτι')
+
+        response = self.client.get(reverse('market-stats'), {'city': 'Αθήνα', 'level': 'city'})
+        self.assertEqual(response.status_code, 200)
+        [row] = response.data['results']
+        self.assertEqual(row['count'], 4)
+        self.assertEqual(row['avg_price_per_m2'], Decimal('2500.00'))
+        self.assertEqual((row['min_price_per_m2'], row['max_price_per_m2']), (Decimal('1000.00'), Decimal('4000.00')))
+        self.assertAlmostEqual(row['median_price_per_m2'], 2000, delta=2000 * market_stats.RELATIVE_ACCURACY)
+
+
+class AsyncViewsTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        response_cache.clear()
+        self.user = User.objects.create_user('agent', password='secret')
+        self.agent = Agent.objects.create(user=self.user, name='Agent', email='agent@example.com', phone='6900000000',
+                                          is_verified=True)
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        buyer = Buyer.objects.create(name='Buyer', email='buyer@example.com', phone='6900000002')
+        for i, city in enumerate(('Αθήνα', 'Αθήνα', 'Πάτρα')):
+            prop = Property.objects.create(
+                seller=seller, title=f'Ακίνητο {i}', full_description='-', property_type='apartment',
+                area=Decimal('80'), price=Decimal(150000 + i), state='Αττική', city=city, street='Οδός', number='1',
+            )
+            Transaction.objects.create(property=prop, buyer=buyer, agent=self.agent)
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_async_views_match_sync_views(self):
+        for sync_name, async_name, params in (
+            ('property-list', 'async-property-list', {'page_size': 2}),
+            ('property-search', 'async-property-search', {'city': 'Αθήνα', 'ordering': 'price'}),
+            ('agent_dashboard', 'async-agent-dashboard', {}),
+        ):
+            expected = self.client.get(reverse(sync_name), params)
+            actual = self.client.get(reverse(async_name), params)
+            self.assertEqual(actual.status_code, 200)
+            # Τα next/previous links διαφέρουν μόνο στο πρόθεμα /async
+            self.assertEqual(actual.content.decode().replace('/api/async/', '/api/'), expected.content.decode())
+
+    def test_requires_token(self):
+        self.client.credentials()
+        response = self.client.get(reverse('async-property-list'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+
+class JobQueueTests(APITestCase):
+    def setUp(self):
+        self.calls = []
+
+        @jobs.task('test_flaky', max_attempts=2)
+        def flaky(fail):
+            self.calls.append(fail)
+            if fail:
+                raise RuntimeError('provider unavailable')
+
+        self.addCleanup(jobs.TASKS.pop, 'test_flaky')
+
+    def test_success_and_retry_with_backoff(self):
+        ok = jobs.enqueue('test_flaky', {'fail': False})
+        failing = jobs.enqueue('test_flaky', {'fail': True})
+        self.assertEqual(jobs.work_once('w1'), 2)
+        ok.refresh_from_db()
+        failing.refresh_from_db()
+        self.assertEqual((ok.status, ok.attempts), ('done', 1))
+        self.assertEqual((failing.status, failing.attempts), ('queued', 1))
+        self.assertGreater(failing.run_at, timezone.now())
+        self.assertIn('provider unavailable', failing.last_error)
+
+        # Πριν λήξει το backoff δεν ξανατρέχει, μετά αποτυγχάνει οριστικά (max_attempts=2)
+        self.assertEqual(jobs.work_once('w1'), 0)
+        Job.objects.filter(pk=failing.pk).update(run_at=timezone.now())
+        jobs.work_once('w1')
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), ('failed', 2))
+
+    @override_settings(JOB_QUEUE={'MAX_ATTEMPTS': 3})
+    def test_run_workers_uses_defaults_for_missing_settings(self):
+        job = jobs.enqueue('test_flaky', {'fail': False})
+        self.assertEqual(job.max_attempts, 2)
+        call_command('run_workers', processes=1, burst=True)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'done')
+
+    def test_expired_visibility_timeout_is_reclaimed(self):
+        job = jobs.enqueue('test_flaky', {'fail': False})
+        [claimed] = jobs.claim('w1')
+        self.assertEqual(jobs.claim('w2'), [])
+        # Ο w1 "πέθανε": μετά το visibility timeout την παίρνει άλλος worker
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        [reclaimed] = jobs.claim('w2')
+        self.assertEqual((reclaimed.pk, reclaimed.locked_by, reclaimed.attempts), (job.pk, 'w2', 2))
+        # Το αποτέλεσμα του w1 δεν γράφεται πάνω στην εργασία του w2
+        jobs.run(claimed, 'w1')
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'running')
+
+    def test_finalize_enqueues_commission_once(self):
+        user = User.objects.create_user('buyer', password='secret')
+        buyer = Buyer.objects.create(user=user, name='Buyer', email='buyer@example.com', phone='6900000002')
+        agent = Agent.objects.create(name='Agent', email='agent@example.com', phone='6900000000')
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        prop = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+        tx = Transaction.objects.create(property=prop, buyer=buyer, agent=agent, status='DEPOSIT_PAID',
+                                        deposit_amount=Decimal('1500'))
+        self.client.force_authenticate(user)
+
+        response = self.client.post(reverse('finalize-transaction', args=[tx.pk]))
+        self.assertEqual(response.status_code, 200)
+        [job] = Job.objects.filter(task='pay_agent_commission')
+        self.assertEqual((job.payload, job.key), ({'transaction_id': tx.pk}, f'commission-{tx.pk}'))
+        self.assertEqual(jobs.enqueue('pay_agent_commission', {'transaction_id': tx.pk}, key=job.key).pk, job.pk)
+        self.assertEqual(jobs.work_once('w1'), 1)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'done')
+
+
+class DocumentUploadTests(APITestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.media = media.name
+        self.user = User.objects.create_user('buyer', password='secret')
+        buyer = Buyer.objects.create(user=self.user, name='Buyer', email='buyer@example.com', phone='6900000002')
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        prop = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+        self.tx = Transaction.objects.create(property=prop, buyer=buyer)
+        self.client.force_authenticate(self.user)
+
+    def upload(self, content, field='final_contract_doc', chunk=4):
+        response = self.client.post(reverse('document-upload-create', args=[self.tx.pk]),
+                                    {'field': field, 'filename': 'scan.pdf', 'size': len(content)})
+        self.assertEqual(response.status_code, 201)
+        url = response['Location']
+        for start in range(0, len(content), chunk):
+            part = content[start:start + chunk]
+            response = self.client.put(url, part, content_type='application/octet-stream',
+                                       HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(part) - 1}/{len(content)}')
+        return url, response
+
+    def test_resumable_upload_is_content_addressed(self):
+        content = b'%PDF-1.4 contract'
+        response = self.client.post(reverse('document-upload-create', args=[self.tx.pk]),
+                                    {'field': 'final_contract_doc', 'size': len(content)})
+        url = response['Location']
+        self.client.put(url, content[:8], content_type='application/octet-stream',
+                        HTTP_CONTENT_RANGE=f'bytes 0-7/{len(content)}')
+        # Μετά από διακοπή ο client ρωτά το offset, ενώ λάθος offset απορρίπτεται
+        self.assertEqual(self.client.get(url).data['offset'], 8)
+        conflict = self.client.put(url, content[4:], content_type='application/octet-stream',
+                                   HTTP_CONTENT_RANGE=f'bytes 4-{len(content) - 1}/{len(content)}')
+        self.assertEqual((conflict.status_code, conflict.data['offset']), (409, 8))
+        response = self.client.put(url, content[8:], content_type='application/octet-stream',
+                                   HTTP_CONTENT_RANGE=f'bytes 8-{len(content) - 1}/{len(content)}')
+        self.assertEqual(response.status_code, 201)
+
+        self.tx.refresh_from_db()
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(self.tx.final_contract_doc.name, documents.blob_name(digest))
+
+        # Το ίδιο αρχείο ως απόδειξη πληρωμής δεν γράφεται δεύτερη φορά
+        self.upload(content, field='proof_of_payment_doc')
+        self.tx.refresh_from_db()
+        self.assertEqual(self.tx.proof_of_payment_doc.name, self.tx.final_contract_doc.name)
+        blobs = [name for _, _, names in os.walk(os.path.join(self.media, documents.BLOB_DIR)) for name in names]
+        self.assertEqual(blobs, [digest])
+
+    def test_download_supports_ranges(self):
+        content = b'%PDF-1.4 ' + bytes(range(256)) * 4
+        self.upload(content, chunk=300)
+        url = reverse('transaction-document', args=[self.tx.pk, 'final_contract_doc'])
+
+        full = self.client.get(url)
+        self.assertEqual((full.status_code, full['Content-Type']), (200, 'application/pdf'))
+        self.assertEqual(b''.join(full.streaming_content), content)
+
+        partial = self.client.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial['Content-Range'], f'bytes 100-199/{len(content)}')
+        self.assertEqual(b''.join(partial.streaming_content), content[100:200])
+        suffix = self.client.get(url, HTTP_RANGE='bytes=-10', HTTP_IF_RANGE=partial['ETag'])
+        self.assertEqual(b''.join(suffix.streaming_content), content[-10:])
+        self.assertEqual(self.client.get(url, HTTP_RANGE=f'bytes={len(content)}-').status_code, 416)
+
+        self.client.force_authenticate(User.objects.create_user('other', password='secret'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class PropertyImageTests(APITestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name, IMAGE_DERIVATIVES={}))
+        self.media = media.name
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        self.prop = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+            images=['/media/properties/front.png'],
+        )
+        self.url = reverse('property-image', args=[self.prop.pk, 0, 'thumb'])
+
+    def test_missing_image_is_404(self):
+        self.assertEqual(self.client.get(reverse('property-image', args=[self.prop.pk, 1, 'thumb'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('property-image', args=[self.prop.pk, 0, 'huge'])).status_code, 404)
+
+    @unittest.skipIf(images.Image is None, 'Pillow is not installed')
+    def test_thumbnail_is_generated_once(self):
+        os.makedirs(os.path.join(self.media, 'properties'))
+        images.Image.new('RGB', (1600, 1200), 'teal').save(os.path.join(self.media, 'properties', 'front.png'))
+
+        response = self.client.get(self.url, HTTP_ACCEPT='image/webp,*/*')
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'image/webp'))
+        with images.Image.open(io.BytesIO(b''.join(response.streaming_content))) as thumb:
+            self.assertEqual(thumb.size, (320, 240))
+        path = images.derivative_path(images.config()['ROOT'], '/media/properties/front.png', 'thumb', 'webp')
+        mtime = os.stat(path).st_mtime
+        self.assertEqual(self.client.get(self.url, HTTP_ACCEPT='image/webp').status_code, 200)
+        self.assertEqual(os.stat(path).st_mtime, mtime)
+
+    @unittest.skipIf(images.Image is not None, 'Pillow is installed')
+    def test_redirects_to_original_without_pillow(self):
+        response = self.client.get(self.url)
+        self.assertEqual((response.status_code, response['Location']), (302, '/media/properties/front.png'))
+
+    def test_sources_outside_property_media_are_rejected(self):
+        os.makedirs(os.path.join(self.media, 'contracts'))
+        with open(os.path.join(self.media, 'contracts', 'deal.pdf'), 'wb') as handle:
+            handle.write(b'%PDF')
+        options = {**images.config(), 'MEDIA_HOSTS': ['cdn.example.com'], 'SOURCE_HOSTS': ['images.example.com']}
+        self.assertEqual(
+            images._local_source('https://cdn.example.com/media/properties/front.png', options),
+            os.path.join(os.path.realpath(self.media), 'properties', 'front.png'),
+        )
+        for source in (
+            '/media/contracts/deal.pdf',
+            '/media/properties/../contracts/deal.pdf',
+            'https://cdn.example.com/media/payment_proofs/proof.pdf',
+        ):
+            with self.subTest(source=source), self.assertRaises(images.ImageUnavailable):
+                images._local_source(source, options)
+        # Οι URLs άλλων hosts δεν αντιστοιχίζονται ποτέ σε τοπικά αρχεία
+        self.assertIsNone(images._local_source('http://evil.example.com/media/contracts/deal.pdf', options))
+
+    def test_remote_sources_need_an_allowed_host(self):
+        options = {**images.config(), 'SOURCE_HOSTS': ['images.example.com']}
+        images._check_remote('https://images.example.com/front.png', options)
+        for source in ('http://127.0.0.1/admin', 'http://169.254.169.254/latest/meta-data/', 'file:///etc/passwd'):
+            with self.subTest(source=source), self.assertRaises(images.ImageUnavailable):
+                images._check_remote(source, options)
+        # Χωρίς ρητή λίστα δεν επιτρέπεται καμία λήψη
+        with self.assertRaises(images.ImageUnavailable):
+            images._check_remote('https://images.example.com/front.png', images.config())
+
+    def test_redirects_are_limited_to_allowed_hosts(self):
+        handler = images.AllowedRedirectHandler(('images.example.com',))
+        request = urllib.request.Request('https://images.example.com/front.png')
+        followed = handler.redirect_request(request, None, 302, 'Found', {}, 'https://images.example.com/photos/front.png')
+        self.assertEqual(followed.full_url, 'https://images.example.com/photos/front.png')
+        for target in ('http://127.0.0.1/admin', 'http://169.254.169.254/latest/meta-data/', 'file:///etc/passwd'):
+            with self.subTest(target=target), self.assertRaises(images.ImageUnavailable):
+                handler.redirect_request(request, None, 302, 'Found', {}, target)
+
+    def test_lru_eviction_removes_least_recently_used(self):
+        root = os.path.join(self.media, 'derivatives')
+        os.makedirs(os.path.join(root, 'ab'))
+        now = time.time()
+        for age, name in enumerate(('new', 'middle', 'old')):
+            path = os.path.join(root, 'ab', name)
+            with open(path, 'wb') as handle:
+                handle.write(b'x' * 100)
+            os.utime(path, (now - age * 60, now - age * 60))
+
+        self.assertEqual(images.evict(root, 250), 200)
+        self.assertEqual(sorted(os.listdir(os.path.join(root, 'ab'))), ['middle', 'new'])
+
+
+class VisitSchedulingTests(APITestCase):
+    def setUp(self):
+        self.seller_user = User.objects.create_user('seller', password='secret')
+        seller = Seller.objects.create(user=self.seller_user, name='Seller', email='seller@example.com', phone='6900000001')
+        self.prop = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+        self.buyers = []
+        for i in range(2):
+            user = User.objects.create_user(f'buyer{i}', password='secret')
+            Buyer.objects.create(user=user, name='Buyer', email=f'buyer{i}@example.com', phone=f'690000001{i}')
+            self.buyers.append(user)
+        # Κάθε ημέρα της επόμενης εβδομάδας 10:00-11:00 (ώρα Ελλάδας) σε slots των 30'
+        self.day = (timezone.now() + timedelta(days=7)).date()
+        self.client.force_authenticate(self.seller_user)
+        response = self.client.post(reverse('visit-slots-bulk', args=[self.prop.pk]), {
+            'rules': [{'weekday': self.day.weekday(), 'start_time': '10:00', 'end_time': '11:00',
+                       'slot_minutes': 30, 'valid_from': str(self.day)}],
+            'slots': [self.local(15, 0).isoformat(), self.local(15, 0).isoformat()],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['slots_created'], response.data['slots_skipped']), (1, 1))
+
+    def local(self, hour, minute):
+        return datetime.combine(self.day, dt_time(hour, minute), tzinfo=scheduling.ZoneInfo('Europe/Athens'))
+
+    def free_slots(self):
+        response = self.client.get(reverse('visit-slots', args=[self.prop.pk]),
+                                   {'start': str(self.day), 'end': str(self.day + timedelta(days=1))})
+        self.assertEqual(response.status_code, 200)
+        return [slot['start'].astimezone(scheduling.ZoneInfo('Europe/Athens')).strftime('%H:%M')
+                for slot in response.data['results']]
+
+    def request_visit(self, user, when):
+        self.client.force_authenticate(user)
+        return self.client.post(reverse('create_visit_request'), {'property': self.prop.pk, 'scheduled_date': when},
+                                format='json')
+
+    def test_slots_are_booked_once(self):
+        self.assertEqual(self.free_slots(), ['10:00', '10:30', '15:00'])
+        slot = self.local(10, 30)
+
+        first = self.request_visit(self.buyers[0], slot.isoformat())
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(datetime.fromisoformat(first.data['ends_at'].replace('Z', '+00:00')), slot + timedelta(minutes=30))
+        self.assertEqual(self.request_visit(self.buyers[1], slot.isoformat()).status_code, 400)
+        self.assertEqual(self.request_visit(self.buyers[1], (slot + timedelta(minutes=10)).isoformat()).status_code, 400)
+        self.assertEqual(self.free_slots(), ['10:00', '15:00'])
+
+    def test_second_reservation_of_a_slot_fails(self):
+        slot = self.local(10, 0)
+        buyer = Buyer.objects.get(user=self.buyers[0])
+        with CaptureQueriesContext(connection) as queries, db_transaction.atomic():
+            ends_at = scheduling.reserve(self.prop.pk, None, slot)
+            VisitRequest.objects.create(property=self.prop, buyer=buyer, scheduled_date=slot, ends_at=ends_at)
+        # Το lock (UPDATE) προηγείται κάθε ανάγνωσης, ώστε και στην SQLite να σειριοποιούνται οι κρατήσεις
+        statements = [query['sql'] for query in queries.captured_queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertTrue(statements[0].startswith('UPDATE'), statements[0])
+        with self.assertRaises(serializers.ValidationError), db_transaction.atomic():
+            scheduling.reserve(self.prop.pk, None, slot)
+
+    def test_visits_without_end_block_the_default_duration(self):
+        slot = self.local(10, 0)
+        VisitRequest.objects.create(property=self.prop, buyer=Buyer.objects.get(user=self.buyers[0]), scheduled_date=slot)
+        self.assertEqual(self.free_slots(), ['10:30', '15:00'])
+        with self.assertRaises(serializers.ValidationError):
+            scheduling.reserve(self.prop.pk, None, slot)
+
+    def test_free_slots_see_conflicts_after_the_last_start(self):
+        # Slot 14:00-16:00 που ξεκινά πριν και τελειώνει μετά το slot των 15:00
+        long_slot = self.local(14, 0)
+        VisitAvailability.objects.create(property=self.prop, available_date=long_slot, duration_minutes=120)
+        VisitRequest.objects.create(property=self.prop, buyer=Buyer.objects.get(user=self.buyers[0]),
+                                    scheduled_date=self.local(15, 30), ends_at=self.local(15, 45))
+        self.assertEqual(self.free_slots(), ['10:00', '10:30', '15:00'])
+
+    def test_interval_index(self):
+        index = scheduling.IntervalIndex([(1, 3), (2, 5), (8, 9)])
+        self.assertEqual((index.starts, index.ends), ([1, 8], [5, 9]))
+        self.assertTrue(index.overlaps(4, 6))
+        self.assertFalse(index.overlaps(5, 8))
+        self.assertTrue(index.overlaps(0, 20))
+
+
+class PropertyLockTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        locks.lock_cache.clear()
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        self.properties = [
+            Property.objects.create(
+                seller=seller, title=f'Ακίνητο {i}', full_description='-', property_type='apartment',
+                area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number=str(i),
+            )
+            for i in range(3)
+        ]
+        self.agent_user = User.objects.create_user('agent', password='secret')
+        self.agent = Agent.objects.create(user=self.agent_user, name='Agent', email='agent@example.com',
+                                          phone='6900000000', is_verified=True)
+        self.buyer_user = User.objects.create_user('buyer', password='secret')
+        self.buyer = Buyer.objects.create(user=self.buyer_user, name='Buyer', email='buyer@example.com', phone='6900000002')
+        now = timezone.now()
+        self.lead = Lead.objects.create(agent=self.agent, buyer=self.buyer, property=self.properties[0],
+                                        locked_until=now + timedelta(days=90))
+        AgentBuyerAssociation.objects.create(agent=self.agent, buyer=self.buyer, property=self.properties[1],
+                                             accepted=False, lock_until=now + timedelta(days=14))
+
+    def locked(self, response):
+        return {row['id']: row['locked_until'] is not None for row in response.data['results']}
+
+    def test_search_shows_lock_state_to_buyers(self):
+        self.client.force_authenticate(self.buyer_user)
+        url = reverse('property-search')
+        first = self.client.get(url)
+        expected = {self.properties[0].pk: True, self.properties[1].pk: True, self.properties[2].pk: False}
+        self.assertEqual(self.locked(first), expected)
+        self.assertEqual(self.locked(self.client.get(url)), expected)
+
+        # Η λήξη του κλειδώματος ακυρώνει την cache και αλλάζει το ETag (η response cache μένει HIT)
+        self.lead.locked_until = timezone.now() - timedelta(minutes=1)
+        self.lead.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertFalse(self.locked(response)[self.properties[0].pk])
+
+        # Οι μεσίτες βλέπουν την ίδια (κοινή) απάντηση χωρίς κατάσταση κλειδώματος
+        self.client.force_authenticate(self.agent_user)
+        self.assertNotIn('locked_until', self.client.get(url).data['results'][0])
+
+    def test_locked_properties_batch(self):
+        ids = [prop.pk for prop in self.properties]
+        self.assertEqual(set(locks.locked_properties(self.buyer.pk, ids)), set(ids[:2]))
+        with self.assertNumQueries(0):
+            locks.locked_properties(self.buyer.pk, ids)
+        self.assertIsNone(locks.locked_until(self.buyer.pk, ids[2]))
+
+    def test_lead_create_is_rejected_while_locked(self):
+        self.client.force_authenticate(self.agent_user)
+        url = reverse('lead-create')
+        response = self.client.post(url, {'buyer': self.buyer.pk, 'property': self.properties[1].pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, {'buyer': self.buyer.pk, 'property': self.properties[2].pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_lead_otp_is_issued_by_the_worker(self):
+        self.client.force_authenticate(self.agent_user)
+        response = self.client.post(reverse('lead-create'), {'buyer': self.buyer.pk, 'property': self.properties[2].pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        [job] = Job.objects.filter(task='send_lead_otp')
+        self.assertEqual(job.payload, {'lead_id': response.data['id']})
+        self.assertFalse(OTPRecord.objects.filter(lead_id=response.data['id']).exists())
+        self.assertEqual(jobs.work_once('w1'), 1)
+        self.assertEqual(OTPRecord.objects.filter(lead_id=response.data['id'], buyer=self.buyer).count(), 1)
+        # Ο κωδικός φτάνει στον αγοραστή και επιβεβαιώνει το lead
+        response = self.client.post(reverse('lead-verify-otp'), {
+            'lead_id': response.data['id'], 'otp_code': sent_code(mail.outbox[-1]),
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class AssociationMatchingTests(APITestCase):
+    def setUp(self):
+        agent = Agent.objects.create(name='Agent', email='agent@example.com', phone='6900000000', is_verified=True)
+        seller = Seller.objects.create(name='Seller', email='seller@example.com', phone='6900000001')
+        prop = Property.objects.create(
+            seller=seller, title='Διαμέρισμα', full_description='-', property_type='apartment',
+            area=Decimal('80'), price=Decimal('150000'), state='Αττική', city='Αθήνα', street='Οδός', number='1',
+        )
+        self.matching = AgentBuyerAssociation.objects.create(
+            agent=agent, property=prop, temp_buyer_name='Γιώργος  Παπαδόπουλος', temp_buyer_identification_number='ΑΒ 123456',
+        )
+        self.other = AgentBuyerAssociation.objects.create(
+            agent=agent, property=prop, temp_buyer_name='Γιώργος Παπαδόπουλος', temp_buyer_identification_number='ΑΒ 654321',
+        )
+
+    def test_registration_claims_normalized_matches(self):
+        self.assertEqual(associations.match_key(' ΓΙΏΡΓΟΣ παπαδόπουλος ', 'αβ-123456'),
+                         ('γιωργοσ παπαδοπουλοσ', 'αβ123456'))
+        response = self.client.post(reverse('register_buyer'), {
+            'username': 'giorgos', 'password': 'secret', 'email': 'giorgos@example.com', 'phone': '6900000002',
+            'name': 'ΓΙΩΡΓΟΣ ΠΑΠΑΔΟΠΟΥΛΟΣ', 'identification_number': 'αβ-123456',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.matching.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.matching.buyer_id, response.data['id'])
+        self.assertIsNone(self.other.buyer_id)
+
+    def test_backfill_command(self):
+        first = Buyer.objects.create(name='Γιώργος Παπαδόπουλος', email='a@example.com', phone='6900000003',
+                                     identification_number='ΑΒ654321')
+        Buyer.objects.create(name='Άλλος', email='b@example.com', phone='6900000004', identification_number='ΧΧ1')
+        out = io.StringIO()
+        call_command('match_associations', '--batch-size', '1', stdout=out)
+        self.assertIn('matched 1 associations', out.getvalue())
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.buyer_id, first.pk)
+        self.assertIsNone(AgentBuyerAssociation.objects.get(pk=self.matching.pk).buyer_id)
+
+
+def sent_code(message):
+    return re.search(r'\b(\d{6})\b', message.body).group(1)
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionRefusedError('smtp unavailable')
+
+
+class OTPTests(APITestCase):
+    def setUp(self):
+        throttling.clear()
+        self.user = User.objects.create_user('buyer', password='secret')
+        self.buyer = Buyer.objects.create(user=self.user, name='Buyer', email='buyer@example.com', phone='6900000002')
+        self.client.force_authenticate(self.user)
+
+    def generate(self):
+        response = self.client.post(reverse('generate_otp'), {'buyer_id': self.buyer.pk}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertNotIn('otp', response.data)
+        self.assertEqual(jobs.work_once('w1'), 1)
+        return sent_code(mail.outbox[-1])
+
+    def verify(self, code):
+        return self.client.post(reverse('verify_otp'), {'buyer_id': self.buyer.pk, 'otp': code}, format='json')
+
+    def test_codes_are_hashed_and_single_use(self):
+        code = self.generate()
+        record = OTPRecord.objects.get(buyer=self.buyer)
+        self.assertNotIn(code, record.code_hash)
+        self.assertEqual(mail.outbox[-1].to, ['buyer@example.com'])
+        # Ο κωδικός εκδίδεται στον worker: το payload έχει μόνο τον αγοραστή
+        self.assertEqual(Job.objects.get(task='send_buyer_otp').payload, {'buyer_id': self.buyer.pk})
+
+        wrong = '1' + code[1:] if code[0] != '1' else '2' + code[1:]
+        self.assertEqual(self.verify(wrong).status_code, 400)
+        self.assertEqual(self.verify(code).status_code, 200)
+        self.assertEqual(self.verify(code).status_code, 400)
+
+    def test_retry_issues_a_code_only_if_none_was_sent(self):
+        with override_settings(EMAIL_BACKEND='listings.tests.FailingEmailBackend'):
+            self.client.post(reverse('generate_otp'), {'buyer_id': self.buyer.pk}, format='json')
+            jobs.work_once('w1')
+        # Η αποτυχημένη αποστολή δεν αφήνει κωδικό· το retry εκδίδει και στέλνει νέο
+        self.assertFalse(OTPRecord.objects.exists())
+        [job] = Job.objects.filter(task='send_buyer_otp', status='queued')
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        jobs.work_once('w1')
+        code = sent_code(mail.outbox[-1])
+        # Επανεκτέλεση μετά την αποστολή δεν ακυρώνει τον κωδικό που έλαβε ο αγοραστής
+        tasks.send_buyer_otp(self.buyer.pk)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(self.verify(code).status_code, 200)
+
+    def test_expiry_and_attempt_limit(self):
+        code = self.generate()
+        wrong = '1' + code[1:] if code[0] != '1' else '2' + code[1:]
+        for _ in range(otp.config()['MAX_ATTEMPTS']):
+            self.assertEqual(self.verify(wrong).status_code, 400)
+        self.assertEqual(self.verify(code).status_code, 429)
+
+        # Νέος κωδικός αντικαθιστά τον προηγούμενο· μετά τη λήξη δεν γίνεται δεκτός
+        code = self.generate()
+        self.assertEqual(OTPRecord.objects.count(), 1)
+        OTPRecord.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.verify(code).status_code, 400)
+
+    def test_purge_deletes_expired_rows_in_chunks(self):
+        self.generate()
+        pending = jobs.enqueue('send_buyer_otp', {'buyer_id': self.buyer.pk})
+        now = timezone.now()
+        OTPRecord.objects.bulk_create([
+            OTPRecord(buyer=self.buyer, code_hash='-', expires_at=now - timedelta(days=2)) for _ in range(5)
+        ] + [OTPRecord(buyer=self.buyer, code_hash='-', expires_at=now + timedelta(minutes=5))])
+        out = io.StringIO()
+        call_command('purge_otps', '--batch-size', '2', stdout=out)
+        self.assertIn('Deleted 5 expired', out.getvalue())
+        self.assertIn('Deleted 1 finished', out.getvalue())
+        self.assertEqual(OTPRecord.objects.count(), 2)
+        self.assertEqual(list(Job.objects.values_list('pk', flat=True)), [pending.pk])
+
+
+class ThrottlingTests(APITestCase):
+    def setUp(self):
+        throttling.clear()
+
+    @override_settings(THROTTLING={'SCOPES': {'register': {'ip': '2/hour'}, 'login': {'ip': '2/hour'}}})
+    def test_scopes_have_separate_buckets(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post(reverse('register_buyer'), {}, format='json').status_code, 400)
+        throttled = self.client.post(reverse('register_buyer'), {}, format='json')
+        self.assertEqual(throttled.status_code, 429)
+        self.assertEqual(throttled['Retry-After'], '1800')
+        # Το login έχει δικό του bucket
+        self.assertEqual(self.client.post(reverse('api_token_auth'), {}, format='json').status_code, 400)
+
+    def test_rejected_request_does_not_consume_other_buckets(self):
+        ip, user = ('ip', 2, 1.0), ('user', 1, 1.0)
+        self.assertEqual(throttling.take_all([ip, user], now=100.0), [])
+        # Το bucket του χρήστη είναι άδειο: το token της IP δεν καταναλώνεται
+        self.assertEqual(throttling.take_all([ip, user], now=100.0), [1.0])
+        self.assertEqual(throttling.take_all([ip, user], now=100.0), [1.0])
+        self.assertIsNone(throttling.take('ip', 2, 1.0, now=100.0))
+
+    def test_bucket_refills_over_time(self):
+        capacity, per_second = throttling.parse_rate('60/min', burst=2)
+        self.assertEqual((capacity, per_second), (2, 1.0))
+        self.assertIsNone(throttling.take('test', capacity, per_second, now=100.0))
+        self.assertIsNone(throttling.take('test', capacity, per_second, now=100.0))
+        self.assertAlmostEqual(throttling.take('test', capacity, per_second, now=100.5), 0.5)
+        self.assertIsNone(throttling.take('test', capacity, per_second, now=101.5))
+
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        metrics.registry.reset()
+        self.user = User.objects.create_user('admin', password='secret', is_staff=True)
+        self.client.force_authenticate(self.user)
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.assertEqual(self.client.get(reverse('property-search')).status_code, 200)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        labels = 'view="property-search",method="GET"'
+        self.assertIn(f'listings_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn(f'listings_request_duration_seconds_count{{{labels}}} 1', text)
+        self.assertIn(f'listings_serialization_seconds_count{{{labels}}} 1', text)
+        queries = [line for line in text.splitlines() if line.startswith(f'listings_db_queries_sum{{{labels}}}')]
+        self.assertGreater(float(queries[0].split()[-1]), 0)
+
+    @override_settings(METRICS={'SAMPLE_RATE': 0.0})
+    def test_unsampled_requests_are_only_counted(self):
+        self.client.get(reverse('property-search'))
+        text = metrics.registry.render()
+        self.assertIn('listings_requests_total{view="property-search",method="GET",status="200"} 1', text)
+        self.assertNotIn('listings_request_duration_seconds_count{view="property-search"', text)
+
+
+class NPlusOneTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('buyer', password='secret')
+        buyer = Buyer.objects.create(user=self.user, name='Buyer', email='buyer@example.com', phone='6900000002')
+        SupportTicket.objects.bulk_create([
+            SupportTicket(buyer=buyer, subject=f'Θέμα {i}', description='-') for i in range(6)
+        ])
+
+    def test_detector_reports_serializer_field(self):
+        with self.assertRaises(nplusone.NPlusOneError) as raised:
+            with nplusone.detect(label='tickets'):
+                SupportTicketSerializer(SupportTicket.objects.all(), many=True).data
+        self.assertIn('SupportTicketSerializer.buyer_username', str(raised.exception))
+        self.assertIn('listings/tests.py', str(raised.exception))
+
+    @override_settings(N_PLUS_ONE={'ENABLED': True, 'RAISE': True})
+    def test_ticket_list_has_no_repeated_queries(self):
+        # Με N_PLUS_ONE['RAISE'] το middleware αποτυγχάνει αν επανέλθει το N+1
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('support_ticket_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 6)
+
+
+class BenchmarkTests(APITestCase):
+    def test_every_endpoint_has_a_scenario(self):
+        names = [name for name, _ in benchmark.endpoints()]
+        self.assertNotIn(None, names)
+        self.assertEqual(set(names) - set(benchmark.SCENARIOS), set())
+
+    def test_synthetic_dataset_is_deterministic(self):
+        def build(seed):
+            ds = synthetic.Dataset(200, seed=seed)
+            rng = ds.rng('property', 0)
+            return [(prop.city, prop.title, prop.price) for prop in (synthetic.build_property(ds, rng, i) for i in range(20))]
+
+        self.assertEqual(build(0), build(0))
+        self.assertNotEqual(build(0), build(1))
+
+    def test_run_has_no_server_errors(self):
+        counts = synthetic.seed(40)
+        self.assertEqual(Property.objects.count(), counts['property'])
+        with tempfile.TemporaryDirectory() as media_root, override_settings(**benchmark.settings_overrides(media_root)):
+            ctx = benchmark.Context()
+            ctx.setup()
+            results = benchmark.run(ctx, 1, warmup=0)
+        self.assertEqual(set(results), {name for name, _ in benchmark.endpoints()})
+        for name, result in results.items():
+            self.assertFalse([status for status in result['statuses'] if int(status) >= 500], name)
+            self.assertGreaterEqual(result['latency_ms']['p50'], 0)
+        self.assertGreater(results['property-list']['queries']['max'], 0)
+        self.assertGreater(results['property-list']['bytes']['max'], 0)
+
+
+class GenerateDataCommandTests(APITestCase):
+    def test_generates_linked_rows(self):
+        out = io.StringIO()
+        call_command('generate_data', scale=60, seed=4, workers=2, stdout=out)
+        # Η βάση των tests είναι στη μνήμη: χωρίς processes
+        self.assertIn('running without worker processes', out.getvalue())
+        self.assertIn('Generated 60 properties', out.getvalue())
+        self.assertEqual(Property.objects.count(), 60)
+        self.assertFalse(Property.objects.filter(seller__isnull=True).exists())
+        self.assertTrue(Transaction.objects.exists())
+
+        ds = synthetic.Dataset(60, seed=4)
+        expected = synthetic.build_property(ds, ds.rng('property', 0), 0)
+        first = Property.objects.order_by('pk').first()
+        self.assertEqual((first.title, first.price), (expected.title, expected.price))
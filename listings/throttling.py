@@ -0,0 +1,106 @@
+import math
+import time
+
+from django.conf import settings  # type: ignore
+from django.core.cache import caches  # type: ignore
+from rest_framework.throttling import BaseThrottle  # type: ignore
+
+
+# Token buckets για τα ακριβά endpoints χωρίς ή με ελάχιστο authentication (εγγραφές, login, OTP).
+# Κάθε scope έχει δικό του bucket ανά IP και (για authenticated χρήστες) ανά user, οπότε ένα
+# κύμα εγγραφών δεν αδειάζει τον προϋπολογισμό του login. Η κατάσταση ενός bucket είναι ένα
+# (tokens, timestamp) στην cache: ένα get_many και ένα set ανά bucket σε κάθε έλεγχο. Με locmem τα όρια είναι ανά
+# process· για κοινά όρια μεταξύ workers η cache 'throttling' πρέπει να είναι κοινή (file/redis).
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'throttling',
+    # scope -> {'ip': 'N/period', 'user': 'N/period', 'burst': μέγιστα tokens (default N)}
+    'SCOPES': {},
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'THROTTLING', {})}
+
+
+def _cache():
+    return caches[config()['ALIAS']]
+
+
+def parse_rate(rate, burst=None):
+    """'10/min' -> (capacity, tokens ανά δευτερόλεπτο)."""
+    count, _, period = rate.partition('/')
+    count = int(count)
+    return (burst or count), count / PERIODS[period.strip()[0]]
+
+
+def take(key, capacity, per_second, now=None):
+    """Καταναλώνει ένα token. None αν υπήρχε, αλλιώς δευτερόλεπτα μέχρι το επόμενο."""
+    waits = take_all([(key, capacity, per_second)], now)
+    return waits[0] if waits else None
+
+
+def take_all(buckets, now=None):
+    """
+    Καταναλώνει ένα token από κάθε (key, capacity, per_second), μόνο αν έχουν όλα τα buckets.
+    Αλλιώς δεν αγγίζει κανένα και επιστρέφει τα δευτερόλεπτα αναμονής όσων δεν έχουν token·
+    ένα request που απορρίπτεται από το bucket της IP δεν χρεώνεται και στο bucket του χρήστη.
+    """
+    cache = _cache()
+    now = time.time() if now is None else now
+    states = cache.get_many([key for key, _, _ in buckets])
+    refilled, waits = [], []
+    for key, capacity, per_second in buckets:
+        tokens, updated = states.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * per_second)
+        if tokens < 1:
+            waits.append((1 - tokens) / per_second)
+        refilled.append((key, tokens, capacity, per_second))
+    if waits:
+        return waits
+    for key, tokens, capacity, per_second in refilled:
+        # Μετά από capacity / rate δευτερόλεπτα το bucket είναι ξανά γεμάτο, οπότε η εγγραφή μπορεί να λήξει
+        cache.set(key, (tokens - 1, now), math.ceil(capacity / per_second) + 1)
+    return waits
+
+
+def clear():
+    _cache().clear()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle του DRF με token buckets. Το view ορίζει throttle_scope και τα όρια είναι στο
+    settings.THROTTLING['SCOPES']. Το DRF επιστρέφει 429 με Retry-After από το wait().
+    """
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        self.waits = []
+
+    def get_buckets(self, request):
+        yield 'ip', self.get_ident(request)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            yield 'user', user.pk
+
+    def allow_request(self, request, view):
+        options = config()
+        scope = getattr(view, self.scope_attr, None)
+        limits = options['SCOPES'].get(scope)
+        if not options['ENABLED'] or not limits:
+            return True
+        buckets = []
+        for kind, ident in self.get_buckets(request):
+            rate = limits.get(kind)
+            if rate is None:
+                continue
+            buckets.append((f'tb:{scope}:{kind}:{ident}', *parse_rate(rate, limits.get('burst'))))
+        self.waits = take_all(buckets)
+        return not self.waits
+
+    def wait(self):
+        return max(self.waits) if self.waits else None
@@ -1,13 +1,19 @@
 from django.urls import path
 from .views import SellerRegisterView, BuyerRegisterView, AgentRegisterAPIView
-from .views import SellerListView, BuyerListView, PropertyListView
+from .views import SellerListView, BuyerListView, PropertyListView, PropertySearchView, PropertyTextSearchView
+from .views import PropertyBoundingBoxView, PropertyRadiusView, PropertyDetailView, ListingCacheStatsView, MarketStatsView, MetricsView
 from .views import LeadCreateAPIView
 from .views import LeadVerifyOTPAPIView
 from .views import CustomAuthToken
 from .views import PropertyCreateView, SellerDashboardView
+from .async_views import (
+    AsyncPropertyListView, AsyncPropertySearchView, AsyncSellerDashboardView, AsyncAgentDashboardView,
+    AsyncSellerVisitRequestListView, AsyncSupportMessageListView,
+)
+from .views import SellerTransactionExportView, BuyerTransactionExportView, AdminTransactionExportView
 from rest_framework.authtoken.views import obtain_auth_token
 from .views import LeadUpdateStatusAPIView
-from .views import (PropertyInterestView, pay_deposit, upload_contract, finalize_transaction, BuyerTransactionsListView, VisitAvailabilityCreateView, VisitRequestCreateView, SellerVisitRequestListView, VisitRequestUpdateView, CancelVisitRequestByBuyerView, CancelVisitRequestBySellerView, AdminCancelVisitRequestView
+from .views import (PropertyInterestView, VisitSlotListView, VisitSlotBulkView, PropertyImageView, pay_deposit, upload_contract, DocumentUploadCreateView, DocumentUploadView, TransactionDocumentView, finalize_transaction, BuyerTransactionsListView, VisitAvailabilityCreateView, VisitRequestCreateView, SellerVisitRequestListView, VisitRequestUpdateView, CancelVisitRequestByBuyerView, CancelVisitRequestBySellerView, AdminCancelVisitRequestView
 , SupportTicketCreateView, SupportTicketListView, SupportMessageCreateView, SupportMessageListView, BuyerRegisterFromAgentView,BuyerAgentAssociationResponseView,GenerateOTPView,VerifyOTPView,AgentDashboardView, CreateTemporaryAssociationView, TransactionProgressView )
 from django.conf import settings
 from django.conf.urls.static import static
@@ -18,12 +24,22 @@ urlpatterns = [
     path('register/buyer/', BuyerRegisterView.as_view(), name='register_buyer'),
     path('register/agent/', AgentRegisterAPIView.as_view(), name='register_agent'),
     path('properties/', PropertyListView.as_view(), name='property-list'),
+    path('properties/<int:pk>/', PropertyDetailView.as_view(), name='property-detail'),
+    path('properties/<int:property_id>/images/<int:index>/<str:size>/', PropertyImageView.as_view(), name='property-image'),
+    path('properties/search/', PropertySearchView.as_view(), name='property-search'),
+    path('properties/search/text/', PropertyTextSearchView.as_view(), name='property-text-search'),
+    path('properties/geo/bbox/', PropertyBoundingBoxView.as_view(), name='property-geo-bbox'),
+    path('properties/geo/radius/', PropertyRadiusView.as_view(), name='property-geo-radius'),
+    path('market-stats/', MarketStatsView.as_view(), name='market-stats'),
+    path('cache/stats/', ListingCacheStatsView.as_view(), name='listing-cache-stats'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     path('api-token-auth/', CustomAuthToken.as_view(), name='api_token_auth'),
     path('leads/create/', LeadCreateAPIView.as_view(), name='lead-create'),
     path('leads/verify_otp/', LeadVerifyOTPAPIView.as_view(), name='lead-verify-otp'),
-    path('leads/update_status/', LeadUpdateStatusAPIView.as_view()), 
+    path('leads/update_status/', LeadUpdateStatusAPIView.as_view(), name='lead-update-status'),
     # Νέο endpoint για εγγραφή αγοραστή με agent_id
     path('seller/dashboard/', SellerDashboardView.as_view(), name='seller_dashboard'),
+    path('seller/transactions/export/', SellerTransactionExportView.as_view(), name='seller-transactions-export'),
     path('register/buyer/from_agent/<str:agent_id>/<int:property_id>/', BuyerRegisterFromAgentView.as_view(), name='register_buyer_from_agent'),
     # Λίστες χρηστών
     path('agent/dashboard/', AgentDashboardView.as_view(), name='agent_dashboard'),
@@ -41,12 +57,20 @@ urlpatterns = [
     path('transactions/<int:transaction_id>/pay_deposit/', pay_deposit, name='pay-deposit'),
     path('transactions/<int:transaction_id>/upload_contract/', upload_contract, name='upload-contract'),
     path('transactions/<int:transaction_id>/finalize/', finalize_transaction, name='finalize-transaction'),
+    # Resumable uploads και downloads (Range) εγγράφων συναλλαγής, βλ. listings/documents.py
+    path('transactions/<int:transaction_id>/uploads/', DocumentUploadCreateView.as_view(), name='document-upload-create'),
+    path('uploads/<uuid:upload_id>/', DocumentUploadView.as_view(), name='document-upload'),
+    path('transactions/<int:transaction_id>/documents/<str:field>/', TransactionDocumentView.as_view(), name='transaction-document'),
     path('buyer/agent_association/<int:association_id>/response/', BuyerAgentAssociationResponseView.as_view(), name='buyer_agent_association_response'),
     path('buyer/transactions/', BuyerTransactionsListView.as_view(), name='buyer-transactions'),
+    path('buyer/transactions/export/', BuyerTransactionExportView.as_view(), name='buyer-transactions-export'),
+    path('admin/transactions/export/', AdminTransactionExportView.as_view(), name='admin-transactions-export'),
     # ... κ.λπ.
     # Endpoint για δημιουργία temporary association από Agent (manual entry)
     path('agent/associations/temporary/', CreateTemporaryAssociationView.as_view(), name='create_temporary_association'),
     path('visit_availability/create/', VisitAvailabilityCreateView.as_view(), name='create_visit_availability'),
+    path('properties/<int:property_id>/visit_slots/', VisitSlotListView.as_view(), name='visit-slots'),
+    path('properties/<int:property_id>/visit_slots/bulk/', VisitSlotBulkView.as_view(), name='visit-slots-bulk'),
     path('visit_requests/create/', VisitRequestCreateView.as_view(), name='create_visit_request'),
     path('seller/visit_requests/', SellerVisitRequestListView.as_view(), name='seller_visit_requests'),
     path('visit_requests/<int:pk>/update/', VisitRequestUpdateView.as_view(), name='update_visit_request'),
@@ -60,5 +84,13 @@ urlpatterns = [
     # OTP Endpoints
     path('otp/generate/', GenerateOTPView.as_view(), name='generate_otp'),
     path('otp/verify/', VerifyOTPView.as_view(), name='verify_otp'),
+
+    # Async (ASGI) εκδόσεις των read-heavy endpoints, βλ. listings/async_views.py
+    path('async/properties/', AsyncPropertyListView.as_view(), name='async-property-list'),
+    path('async/properties/search/', AsyncPropertySearchView.as_view(), name='async-property-search'),
+    path('async/seller/dashboard/', AsyncSellerDashboardView.as_view(), name='async-seller-dashboard'),
+    path('async/agent/dashboard/', AsyncAgentDashboardView.as_view(), name='async-agent-dashboard'),
+    path('async/seller/visit_requests/', AsyncSellerVisitRequestListView.as_view(), name='async-seller-visit-requests'),
+    path('async/support/messages/', AsyncSupportMessageListView.as_view(), name='async-support-message-list'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
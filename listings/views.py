@@ -1,22 +1,33 @@
-import urllib.request as urllib_request
 from django.forms import ValidationError # type: ignore
 from rest_framework import generics # type: ignore
 from rest_framework.response import Response # type: ignore
 from rest_framework import status # type: ignore
-from django.http import HttpResponse # type: ignore
-from .models import Seller, Agent, Property, Lead, Transaction, Buyer, VisitAvailability, VisitRequest, SupportTicket, SupportMessage, AgentBuyerAssociation, OTPRecord, TransactionProgress
-from .serializers import SellerSerializer, BuyerSerializer, AgentSerializer, PropertySerializer, TransactionSerializer, VisitAvailabilitySerializer, VisitRequestSerializer, VisitRequestCancellationSerializer, SupportTicketSerializer, SupportMessageSerializer, AgentBuyerAssociationSerializer, TemporaryAssociationSerializer, TransactionProgressSerializer
-import random
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect # type: ignore
+from .models import Seller, Agent, Property, Lead, Transaction, Buyer, VisitAvailability, VisitRequest, SupportTicket, SupportMessage, AgentBuyerAssociation, TransactionProgress, MarketStat, DocumentUpload, VisitRule
+from .serializers import SellerSerializer, BuyerSerializer, AgentSerializer, PropertyListSerializer, PropertyDetailSerializer, PROPERTY_LIST_ANNOTATIONS, PROPERTY_LIST_FIELDS, TransactionSerializer, VisitAvailabilitySerializer, VisitRequestSerializer, VisitRequestCancellationSerializer, VisitRuleSerializer, VisitSlotBulkSerializer, SupportTicketSerializer, SupportMessageSerializer, AgentBuyerAssociationSerializer, TemporaryAssociationSerializer, TransactionProgressSerializer
 from django.contrib.auth.models import User # type: ignore
 from .permissions import IsVerifiedAgent
+from .authentication import get_role, token_cache
+from .search import PropertySearch
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .response_cache import CachedResponseMixin, city_scope, seller_scope
+from . import response_cache
+from . import associations, documents, export, fulltext, geo, images, jobs, locks, market_stats, metrics, otp, scheduling
+from .locks import PropertyLockStateMixin
+from .throttling import TokenBucketThrottle
 from rest_framework.permissions import AllowAny # type: ignore
 from rest_framework.permissions import IsAuthenticated # type: ignore
+from rest_framework.permissions import IsAdminUser # type: ignore
 from .serializers import LeadSerializer
-import random
 from rest_framework.views import APIView # type: ignore
+from rest_framework.negotiation import BaseContentNegotiation # type: ignore
 from datetime import timedelta
 from django.utils import timezone # type: ignore
 from django.shortcuts import get_object_or_404 # type: ignore
+from django.urls import reverse # type: ignore
+from django.core.exceptions import DisallowedRedirect # type: ignore
+from django.db import transaction as db_transaction # type: ignore
+from django.db.models import OuterRef, Subquery # type: ignore
 from django.views.decorators.csrf import csrf_exempt # type: ignore
 from rest_framework.decorators import api_view, permission_classes # type: ignore
 from rest_framework import status # type: ignore
@@ -34,6 +45,8 @@ from rest_framework.authtoken.models import Token # type: ignore
 # API για την εγγραφή Πωλητών (Sellers)
 class SellerRegisterView(generics.CreateAPIView):
     permission_classes = []  # Επιτρέπουμε πρόσβαση χωρίς authentication για εγγραφή
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'register'
     queryset = Seller.objects.all()
     serializer_class = SellerSerializer
     def create(self, request, *args, **kwargs):
@@ -62,7 +75,7 @@ class SellerRegisterView(generics.CreateAPIView):
         seller = serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
-class SellerDashboardView(generics.ListAPIView):
+class SellerDashboardView(ConditionalListMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = TransactionSerializer
 
@@ -75,7 +88,7 @@ class SellerDashboardView(generics.ListAPIView):
     
 class PropertyCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
-    serializer_class = PropertySerializer
+    serializer_class = PropertyDetailSerializer
     
     def perform_create(self, serializer):
         seller = getattr(self.request.user, 'seller', None)
@@ -88,6 +101,8 @@ class BuyerRegisterView(generics.CreateAPIView):
     queryset = Buyer.objects.all()
     serializer_class = BuyerSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'register'
 
     def create(self, request, *args, **kwargs):
          # Δημιουργούμε τον Django User για τον Buyer
@@ -111,18 +126,9 @@ class BuyerRegisterView(generics.CreateAPIView):
         serializer = self.get_serializer(data=buyer_data)
         serializer.is_valid(raise_exception=True)
         buyer = serializer.save(user=user)
-         # Ελέγχουμε αν υπάρχει AgentBuyerAssociation με matching στοιχεία (π.χ., temp_buyer_name και temp_buyer_identification_number)
-        from .models import AgentBuyerAssociation
-        if buyer.name and buyer.identification_number:
-            associations = AgentBuyerAssociation.objects.filter(
-                buyer__isnull=True,
-                temp_buyer_name=buyer.name,
-                temp_buyer_identification_number=buyer.identification_number
-            )
-            for assoc in associations:
-                assoc.buyer = buyer
-                assoc.save()
-        
+        # Προσωρινές συσχετίσεις μεσιτών με το ίδιο (κανονικοποιημένο) όνομα και αριθμό ταυτότητας
+        associations.claim_for_buyer(buyer)
+
         return Response(BuyerSerializer(buyer).data, status=status.HTTP_201_CREATED)
         # Λαμβάνουμε το agent_id από τα URL kwargs ή το request data
         agent_id = self.kwargs.get("agent_id") or self.request.data.get("agent_id")
@@ -140,6 +146,8 @@ class AgentRegisterAPIView(generics.CreateAPIView):
     queryset = Agent.objects.all()
     serializer_class = AgentSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'register'
     def create(self, request, *args, **kwargs):
         username = request.data.get('username')
         password = request.data.get('password')
@@ -189,11 +197,181 @@ class AgentListView(generics.ListAPIView):
     queryset = Agent.objects.all()
     serializer_class = AgentSerializer
 
-class PropertyListView(generics.ListAPIView):
-    queryset = Property.objects.all()
-    serializer_class = PropertySerializer
+def property_list_rows(queryset):
+    # Μόνο οι στήλες της λίστας (και η πρώτη εικόνα), ως dicts για τον PropertyListSerializer
+    return queryset.values(*PROPERTY_LIST_FIELDS, **PROPERTY_LIST_ANNOTATIONS)
+
+def property_list_rows_by_id(ids):
+    return {row['id']: row for row in property_list_rows(Property.objects.filter(id__in=ids))}
+
+class PropertyListView(PropertyLockStateMixin, ConditionalListMixin, CachedResponseMixin, generics.ListAPIView):
+    serializer_class = PropertyListSerializer
     permission_classes = [IsAuthenticated, IsVerifiedAgent]
 
+    def get_queryset(self):
+        # Τα ίδια φίλτρα με το search endpoint (π.χ. ?city=Αθήνα&max_price=200000)
+        return property_list_rows(PropertySearch(self.request.query_params).apply(Property.objects.all()))
+
+    def get_cache_scopes(self):
+        # Λίστα ενός πωλητή ή μιας πόλης ακυρώνεται μόνο από αλλαγές σε αυτόν/αυτήν
+        values = PropertySearch(self.request.query_params).values
+        if len(values.get('seller', ())) == 1:
+            return [seller_scope(values['seller'][0])]
+        if len(values.get('city', ())) == 1:
+            return [city_scope(values['city'][0])]
+        return super().get_cache_scopes()
+
+class PropertyDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
+    """Πλήρης εγγραφή ενός ακινήτου (όλα τα πεδία, μαζί με περιγραφή, εικόνες και keywords)."""
+    queryset = Property.objects.all()
+    serializer_class = PropertyDetailSerializer
+    permission_classes = [IsAuthenticated]
+
+class PropertySearchView(PropertyLockStateMixin, ConditionalListMixin, CachedResponseMixin, generics.ListAPIView):
+    """
+    Αναζήτηση ακινήτων με φίλτρα (city, neighborhood, property_type, seller, min/max_price,
+    min/max_area, bedrooms, min_bedrooms, energy_class, condition, is_sold, is_reserved)
+    και facet counts ανά διάσταση στην ίδια απάντηση.
+    """
+    serializer_class = PropertyListSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return property_list_rows(PropertySearch(self.request.query_params).apply(Property.objects.all()))
+
+    def get_conditional_queryset(self):
+        # Τα facets εξαρτώνται και από γραμμές εκτός των αποτελεσμάτων
+        return Property.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        search = PropertySearch(request.query_params)
+        queryset = self.get_queryset()
+        facets = search.facets(Property.objects.all())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+            response.data['facets'] = facets
+            return response
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({'results': serializer.data, 'facets': facets})
+
+class PropertyTextSearchView(PropertyLockStateMixin, CachedResponseMixin, APIView):
+    """
+    Full-text αναζήτηση σε τίτλο, περιγραφές και keywords με κατάταξη κατά relevance.
+    Το query κανονικοποιείται (πεζά, χωρίς τόνους) όπως και το index, οπότε
+    ?q=σπιτι ταιριάζει με "Σπίτι". Παράμετροι: q, limit (default 20, max 100).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not query:
+            return Response({'results': []})
+
+        if not fulltext.is_supported():
+            properties = property_list_rows(Property.objects.filter(title__icontains=query).order_by('-created_at')[:limit])
+            return Response({'results': PropertyListSerializer(properties, many=True).data})
+
+        ranked = fulltext.search(query, limit=limit)
+        rows = property_list_rows_by_id([property_id for property_id, _ in ranked])
+        results = []
+        for property_id, score in ranked:
+            row = rows.get(property_id)
+            if row is None:
+                continue
+            data = PropertyListSerializer(row).data
+            data['score'] = score
+            results.append(data)
+        return Response({'results': results})
+
+class PropertyBoundingBoxView(PropertyLockStateMixin, CachedResponseMixin, APIView):
+    """
+    Ακίνητα μέσα σε ένα ορθογώνιο χάρτη (viewport).
+    Παράμετροι: min_lat, min_lng, max_lat, max_lng, limit (default 200, max 500)
+    και προαιρετικά τα ίδια φίλτρα με το search endpoint. Με min_lng > max_lng το
+    viewport περνά τον αντιμεσημβρινό.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        params = request.query_params
+        min_lat = geo.parse_float(params, 'min_lat', -90, 90)
+        max_lat = geo.parse_float(params, 'max_lat', -90, 90)
+        min_lng = geo.parse_float(params, 'min_lng', -180, 180)
+        max_lng = geo.parse_float(params, 'max_lng', -180, 180)
+        limit = int(geo.parse_float(params, 'limit', 1, 500, required=False, default=200))
+        if min_lat > max_lat:
+            return Response({"detail": "min_lat must not exceed max_lat."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = PropertySearch(params).apply(Property.objects.all())
+        queryset = property_list_rows(geo.filter_bbox(queryset, min_lat, min_lng, max_lat, max_lng)[:limit])
+        return Response({'results': PropertyListSerializer(queryset, many=True).data})
+
+class PropertyRadiusView(PropertyLockStateMixin, CachedResponseMixin, APIView):
+    """
+    Ακίνητα σε ακτίνα radius_km από ένα σημείο, ταξινομημένα κατά απόσταση.
+    Παράμετροι: lat, lng, radius_km (default 2, max 50), limit (default 50, max 500).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        params = request.query_params
+        lat = geo.parse_float(params, 'lat', -90, 90)
+        lng = geo.parse_float(params, 'lng', -180, 180)
+        radius_km = geo.parse_float(params, 'radius_km', 0, 50, required=False, default=2.0)
+        limit = int(geo.parse_float(params, 'limit', 1, 500, required=False, default=50))
+
+        queryset = PropertySearch(params).filter(Property.objects.all())
+        matches = geo.within_radius(queryset, lat, lng, radius_km, limit)
+        rows = property_list_rows_by_id([property_id for property_id, _ in matches])
+        results = []
+        for property_id, distance in matches:
+            row = rows.get(property_id)
+            if row is None:
+                # Σβήστηκε ή αποσύρθηκε ανάμεσα στα δύο queries
+                continue
+            data = PropertyListSerializer(row).data
+            data['distance_km'] = round(distance, 3)
+            results.append(data)
+        return Response({'results': results})
+
+class MarketStatsView(APIView):
+    """
+    Στατιστικά τιμής/m² από τον πίνακα MarketStat (χωρίς GROUP BY πάνω στα ακίνητα).
+    Φίλτρα: state, city, neighborhood, property_type. Με ?level=city|state οι γειτονιές
+    συγχωνεύονται σε επίπεδο πόλης/νομού (default: neighborhood).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        level = params.get('level', 'neighborhood')
+        if level not in market_stats.LEVELS:
+            raise ValidationError({'level': f"Must be one of: {', '.join(market_stats.LEVELS)}"})
+        filters = {field: params[field] for field in market_stats.KEY_FIELDS if params.get(field)}
+        stats = MarketStat.objects.filter(**filters)
+        return Response({'level': level, 'results': market_stats.summarize(stats, level)})
+
+class ListingCacheStatsView(APIView):
+    """Μετρητές hit/miss της cache των λιστών ακινήτων (ανά process)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(response_cache.stats())
+
+class MetricsView(APIView):
+    """Histograms των requests ανά view (ανά process) σε Prometheus text format, βλ. listings/metrics.py."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 class LeadCreateAPIView(generics.CreateAPIView):
     """
     Ενδεικτικό endpoint:  μεσίτης δημιουργεί ένα Lead (προφορική επαφή).
@@ -210,21 +388,18 @@ class LeadCreateAPIView(generics.CreateAPIView):
         agent = self.request.user.agent
         buyer = serializer.validated_data['buyer']
         property_ = serializer.validated_data['property']
-        existing_leads = Lead.objects.filter(buyer=buyer, property=property_, locked_until__isnull=False, locked_until__gte=timezone.now())
-        if existing_leads.exists():
+        # Κλείδωμα από Lead ή από απόρριψη συσχέτισης με μεσίτη
+        if locks.locked_until(buyer.id, property_.id):
             raise ValidationError({"detail": "This buyer is locked for this property."})
-    # generate OTP κλπ.
-        lead=serializer.save(agent=agent)
-         # Παράγουμε έναν απλό 6-ψήφιο αριθμό
-        otp = str(random.randint(100000, 999999))
-        lead.otp_code = otp
-        lead.save()
-        
-        # Εδώ θα μπορούσες να στείλεις email/SMS στον buyer
-        print(f"DEBUG: OTP for lead {lead.id} is {otp}")
+        lead = serializer.save(agent=agent)
+
+        # Ο κωδικός εκδίδεται και στέλνεται (email/SMS) στον buyer από τους workers (listings/tasks.py)
+        jobs.enqueue('send_lead_otp', {'lead_id': lead.id})
 
 class LeadVerifyOTPAPIView(APIView):
         permission_classes = [IsAuthenticated, IsVerifiedAgent]
+        throttle_classes = [TokenBucketThrottle]
+        throttle_scope = 'otp_verify'
 
         def post(self, request):
             lead_id = request.data.get('lead_id')
@@ -243,12 +418,14 @@ class LeadVerifyOTPAPIView(APIView):
                 return Response({"detail": "Not your lead"}, status=status.HTTP_403_FORBIDDEN)
 
         # Ταιριάζει το OTP;
-            if lead.otp_code == otp_code:
-                lead.otp_verified = True
-                lead.save()
-                return Response({"detail": "OTP verified successfully"}, status=status.HTTP_200_OK)
-            else:
+            result = otp.verify(lead.buyer_id, otp_code, lead_id=lead.id)
+            if result == otp.LOCKED:
+                return Response({"detail": "Too many attempts, request a new OTP code"}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            if result != otp.VERIFIED:
                 return Response({"detail": "Invalid OTP code"}, status=status.HTTP_400_BAD_REQUEST)
+            lead.otp_verified = True
+            lead.save(update_fields=['otp_verified'])
+            return Response({"detail": "OTP verified successfully"}, status=status.HTTP_200_OK)
             
 class LeadUpdateStatusAPIView(APIView):
     permission_classes = [IsAuthenticated, IsVerifiedAgent]
@@ -282,7 +459,8 @@ class PropertyInterestView(APIView):
         prop = get_object_or_404(Property, pk=property_id)
         
         # 2. Έλεγχος αν ο χρήστης είναι ο ιδιοκτήτης του ακινήτου
-        if prop.user == request.user:
+        seller = getattr(request.user, 'seller', None)
+        if seller is not None and prop.seller_id == seller.id:
             return Response({
                 "detail": "Δεν μπορείτε να εκδηλώσετε ενδιαφέρον για ακίνητο που έχετε καταχωρήσει εσείς"
             }, status=status.HTTP_400_BAD_REQUEST)
@@ -324,7 +502,7 @@ class PropertyInterestView(APIView):
             "transaction": serializer.data
         }, status=status.HTTP_200_OK)
     
-class BuyerTransactionsListView(generics.ListAPIView):
+class BuyerTransactionsListView(ConditionalListMixin, generics.ListAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
 
@@ -335,6 +513,61 @@ class BuyerTransactionsListView(generics.ListAPIView):
             return Transaction.objects.none()
         return Transaction.objects.filter(buyer=buyer).order_by('-created_at')
     
+class BaseTransactionExportView(APIView):
+    """
+    Πλήρες export συναλλαγών ως streaming CSV (?output=csv, default) ή JSONL (?output=jsonl).
+    Οι γραμμές διαβάζονται με iterator(chunk_size) και στέλνονται καθώς διαβάζονται.
+    Αφηρημένη βάση χωρίς route: οι υποκλάσεις (seller/buyer/admin) ορίζουν το get_queryset().
+    """
+    permission_classes = [IsAuthenticated]
+    export_name = 'transactions'
+
+    def get_queryset(self):
+        """Οι συναλλαγές που επιτρέπεται να εξαγάγει ο χρήστης του request."""
+        raise NotImplementedError(f'{type(self).__name__} must define get_queryset().')
+
+    def get(self, request):
+        fmt = export.parse_format(request.query_params)
+        queryset = self.get_queryset().order_by('-created_at', '-id')
+        return export.streaming_export(queryset, export.TRANSACTION_COLUMNS, fmt, self.export_name)
+
+class SellerTransactionExportView(BaseTransactionExportView):
+    export_name = 'seller-transactions'
+
+    def get_queryset(self):
+        seller = getattr(self.request.user, 'seller', None)
+        if not seller:
+            return Transaction.objects.none()
+        return Transaction.objects.filter(property__seller=seller)
+
+class BuyerTransactionExportView(BaseTransactionExportView):
+    export_name = 'buyer-transactions'
+
+    def get_queryset(self):
+        buyer = getattr(self.request.user, 'buyer', None)
+        if not buyer:
+            return Transaction.objects.none()
+        return Transaction.objects.filter(buyer=buyer)
+
+class AdminTransactionExportView(BaseTransactionExportView):
+    """Export όλων των συναλλαγών για το back-office, με προαιρετικά φίλτρα status, seller, buyer."""
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = Transaction.objects.all()
+        if params.get('status'):
+            if params['status'] not in dict(Transaction.STATUS_CHOICES):
+                raise ValidationError({'status': "Invalid choice."})
+            queryset = queryset.filter(status=params['status'])
+        for name, lookup in (('seller', 'property__seller_id'), ('buyer', 'buyer_id')):
+            if params.get(name):
+                try:
+                    queryset = queryset.filter(**{lookup: int(params[name])})
+                except ValueError:
+                    raise ValidationError({name: "Must be an integer."})
+        return queryset
+
 # ΒΗΜΑ 5: Πληρωμή Προκαταβολής
 @csrf_exempt
 @api_view(['POST'])
@@ -370,15 +603,188 @@ def upload_contract(request, transaction_id):
     final_contract = request.FILES.get('final_contract_doc')
     proof_payment = request.FILES.get('proof_of_payment_doc')
 
+    # Content-addressed αποθήκευση (βλ. listings/documents.py): ίδια αρχεία δεν διπλασιάζονται
     if final_contract:
-        transaction.final_contract_doc = final_contract
+        transaction.final_contract_doc.name = documents.store_uploaded_file(final_contract)
     if proof_payment:
-        transaction.proof_of_payment_doc = proof_payment
+        transaction.proof_of_payment_doc.name = documents.store_uploaded_file(proof_payment)
 
     transaction.save()
     return Response({"detail": "Documents uploaded", "transaction": TransactionSerializer(transaction).data},
                     status=status.HTTP_200_OK)
 
+
+class DocumentUploadCreateView(APIView):
+    """
+    Ξεκινά ένα resumable upload εγγράφου συναλλαγής.
+    Body: field (final_contract_doc ή proof_of_payment_doc), filename, size (bytes).
+    Τα chunks στέλνονται με PUT στο upload με header Content-Range: bytes start-end/size.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, transaction_id):
+        transaction = get_object_or_404(Transaction, pk=transaction_id)
+        buyer = getattr(request.user, 'buyer', None)
+        if not buyer or transaction.buyer != buyer:
+            return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
+
+        field = request.data.get('field')
+        if field not in dict(DocumentUpload.FIELD_CHOICES):
+            return Response({"field": f"Must be one of: {', '.join(dict(DocumentUpload.FIELD_CHOICES))}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            size = 0
+        max_size = documents.config()['MAX_SIZE']
+        if not 0 < size <= max_size:
+            return Response({"size": f"Must be between 1 and {max_size} bytes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        upload = DocumentUpload.objects.create(
+            transaction=transaction, field=field, size=size, created_by=request.user,
+            filename=str(request.data.get('filename') or field)[:255],
+        )
+        data = {**DocumentUploadView.status_data(upload), "chunk_max": documents.config()['CHUNK_MAX']}
+        return Response(data, status=status.HTTP_201_CREATED,
+                        headers={'Location': reverse('document-upload', args=[upload.pk])})
+
+
+class DocumentUploadView(APIView):
+    """
+    GET: πόσα bytes έχουν ληφθεί (από πού συνεχίζει ο client μετά από διακοπή).
+    PUT: ένα chunk, με raw body και Content-Range: bytes start-end/size. Το start πρέπει
+    να είναι ίσο με το offset, αλλιώς 409 με το τρέχον offset. Με το τελευταίο chunk το
+    έγγραφο αποθηκεύεται με βάση το sha256 του και συνδέεται με τη συναλλαγή.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def status_data(upload):
+        return {
+            "upload_id": str(upload.pk),
+            "field": upload.field,
+            "offset": upload.received,
+            "size": upload.size,
+            "completed": upload.completed_at is not None,
+        }
+
+    def get_upload(self, request, upload_id):
+        return get_object_or_404(DocumentUpload.objects.select_related('transaction'), pk=upload_id,
+                                 created_by=request.user)
+
+    def get(self, request, upload_id):
+        return Response(self.status_data(self.get_upload(request, upload_id)))
+
+    def put(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload.completed_at is not None:
+            return Response(self.status_data(upload), status=status.HTTP_409_CONFLICT)
+
+        byte_range = documents.parse_content_range(request.META.get('HTTP_CONTENT_RANGE'))
+        if byte_range is None or byte_range[2] != upload.size:
+            return Response({"detail": f"Content-Range: bytes start-end/{upload.size} is required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        start, end, _ = byte_range
+        length = end - start + 1
+        if length > documents.config()['CHUNK_MAX']:
+            return Response({"detail": "Chunk too large."}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if int(request.META.get('CONTENT_LENGTH') or 0) != length:
+            return Response({"detail": "Content-Length does not match Content-Range."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if not documents.acquire(upload, start):
+            upload.refresh_from_db()
+            return Response({"detail": "Unexpected offset or upload in progress.", **self.status_data(upload)},
+                            status=status.HTTP_409_CONFLICT)
+        try:
+            written = documents.write_chunk(upload, request.stream, start, length)
+        except BaseException:
+            documents.release(upload, start)
+            raise
+        if written != length:
+            documents.release(upload, start)
+            return Response({"detail": "Incomplete chunk.", **self.status_data(upload)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        documents.release(upload, end + 1)
+
+        if upload.received < upload.size:
+            return Response(self.status_data(upload))
+        documents.complete(upload)
+        return Response({**self.status_data(upload), "transaction": TransactionSerializer(upload.transaction).data},
+                        status=status.HTTP_201_CREATED)
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    # Τα downloads δεν περνούν από renderer, οπότε ένα Accept: application/pdf δεν πρέπει να δίνει 406
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class TransactionDocumentView(APIView):
+    """
+    Download εγγράφου συναλλαγής για τον buyer, τον seller, τον agent ή admin.
+    Υποστηρίζει Range/If-Range (206) και, με DOCUMENTS['SENDFILE'], offload στον web server.
+    """
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, transaction_id, field):
+        if field not in dict(DocumentUpload.FIELD_CHOICES):
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        transaction = get_object_or_404(Transaction.objects.select_related('property'), pk=transaction_id)
+        user = request.user
+        parties = (
+            (getattr(user, 'buyer', None), transaction.buyer_id),
+            (getattr(user, 'seller', None), transaction.property.seller_id),
+            (getattr(user, 'agent', None), transaction.agent_id),
+        )
+        if not user.is_staff and not any(role is not None and role.id == role_id for role, role_id in parties):
+            return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
+
+        document = getattr(transaction, field)
+        if not document:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return documents.serve(request, document.name, f'{field}-{transaction.pk}')
+        except FileNotFoundError:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+class PropertyImageView(APIView):
+    """
+    Σμικρυμένη έκδοση (thumb ή medium) μιας εικόνας ακινήτου, WebP αν το δέχεται ο client
+    αλλιώς JPEG. Παράγεται στην πρώτη ζήτηση και μένει στον δίσκο (βλ. listings/images.py).
+    Αν δεν μπορεί να παραχθεί, redirect στο original.
+    """
+    permission_classes = [AllowAny]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, property_id, index, size):
+        if size not in images.SIZES:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        sources = Property.objects.filter(pk=property_id).values_list('images', flat=True).first() or []
+        source = sources[index] if index < len(sources) else None
+        if not isinstance(source, str) or not source:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        fmt = images.negotiate(request.META.get('HTTP_ACCEPT'))
+        try:
+            path = images.derivative(source, size, fmt)
+        except images.ImageUnavailable:
+            try:
+                return HttpResponseRedirect(source)
+            except DisallowedRedirect:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        response = FileResponse(open(path, 'rb'), content_type=images.FORMATS[fmt][1])
+        # Με το σωστό ?v= το URL δείχνει πάντα την ίδια εικόνα
+        immutable = request.query_params.get('v') == images.version(source)[:12]
+        response['Cache-Control'] = 'public, max-age=31536000, immutable' if immutable else 'public, max-age=300'
+        response['Vary'] = 'Accept'
+        return response
+
+
 # ΒΗΜΑ 6.2 & 7: Οριστική Ολοκλήρωση + Πληρωμή Μεσίτη
 @csrf_exempt
 @api_view(['POST'])
@@ -397,20 +803,13 @@ def finalize_transaction(request, transaction_id):
     transaction.property.is_sold = True
     transaction.property.save()
 
-    # Πληρωμή Μεσίτη (demo)
+    # Πληρωμή Μεσίτη: στην ουρά, με key ώστε ένα δεύτερο finalize να μην ξαναπληρώνει
     if transaction.agent:
-        pay_commission_to_agent(transaction)
+        jobs.enqueue('pay_agent_commission', {'transaction_id': transaction.id}, key=f'commission-{transaction.id}')
 
     return Response({"detail": "Transaction finalized", "transaction": TransactionSerializer(transaction).data},
                     status=status.HTTP_200_OK)
 
-def pay_commission_to_agent(transaction):
-    agent = transaction.agent
-    if not agent:
-        return
-    # Π.χ. απλώς εκτυπώνουμε (demo). Στην πράξη καλείς τραπεζικό API
-    print(f"Paying {transaction.deposit_amount}€ to agent {agent.name} (IBAN={agent.iban})")
-
 class VisitAvailabilityCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = VisitAvailabilitySerializer
@@ -428,6 +827,58 @@ class VisitAvailabilityCreateView(generics.CreateAPIView):
             raise serializers.ValidationError("Property not found or you are not the owner.")
         serializer.save(property=property_instance)
 
+class VisitSlotListView(APIView):
+    """
+    Ελεύθερα slots επίσκεψης ενός ακινήτου: κανόνες και μεμονωμένες ημερομηνίες, χωρίς όσα
+    επικαλύπτονται με ενεργές επισκέψεις του ακινήτου ή του handler.
+    Παράμετροι: start, end (ISO, default οι επόμενες 14 ημέρες, μέγιστο 62).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, property_id):
+        property_instance = get_object_or_404(Property.objects.select_related('seller'), pk=property_id)
+        start, end = scheduling.parse_range(request.query_params)
+        seller = property_instance.seller
+        handler_id = seller.user_id if seller.handle_visits else None
+        slots = scheduling.free_slots(property_instance.pk, handler_id, start, end)
+        return Response({'results': [{'start': slot_start, 'end': slot_end} for slot_start, slot_end in slots]})
+
+class VisitSlotBulkView(APIView):
+    """
+    Δημοσίευση διαθεσιμότητας σε ένα request από τον seller του ακινήτου:
+    slots (λίστα ημερομηνιών/ωρών, με κοινό duration_minutes) και/ή rules
+    (weekday, start_time, end_time, slot_minutes, valid_from, valid_until).
+    Slots που υπάρχουν ήδη αγνοούνται.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, property_id):
+        seller = getattr(request.user, 'seller', None)
+        if not seller:
+            return Response({"detail": "Only sellers can set availability."}, status=status.HTTP_403_FORBIDDEN)
+        property_instance = get_object_or_404(Property, pk=property_id, seller=seller)
+        serializer = VisitSlotBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        slots = sorted(set(data['slots']))
+        with db_transaction.atomic():
+            existing = set()
+            if slots:
+                existing = set(VisitAvailability.objects.filter(
+                    property=property_instance, available_date__gte=slots[0], available_date__lte=slots[-1],
+                ).values_list('available_date', flat=True))
+            created = VisitAvailability.objects.bulk_create([
+                VisitAvailability(property=property_instance, available_date=slot, duration_minutes=data['duration_minutes'])
+                for slot in slots if slot not in existing
+            ])
+            rules = VisitRule.objects.bulk_create([VisitRule(property=property_instance, **rule) for rule in data['rules']])
+        return Response({
+            "slots_created": len(created),
+            "slots_skipped": len(data['slots']) - len(created),
+            "rules": VisitRuleSerializer(rules, many=True).data,
+        }, status=status.HTTP_201_CREATED)
+
 class VisitRequestCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = VisitRequestSerializer
@@ -447,9 +898,13 @@ class VisitRequestCreateView(generics.CreateAPIView):
         # Ελέγχουμε αν ο Seller του property επιθυμεί να αναλάβει τις επισκέψεις
         seller = property_instance.seller
         handler = seller.user if seller.handle_visits else None
-        serializer.save(buyer=buyer, property=property_instance, handler=handler)
+        # Έλεγχος διαθεσιμότητας και επικαλύψεων στο ίδιο transaction με την αποθήκευση
+        with db_transaction.atomic():
+            ends_at = scheduling.reserve(property_instance.pk, getattr(handler, 'pk', None),
+                                         serializer.validated_data['scheduled_date'])
+            serializer.save(buyer=buyer, property=property_instance, handler=handler, ends_at=ends_at)
 
-class SellerVisitRequestListView(generics.ListAPIView):
+class SellerVisitRequestListView(ConditionalListMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = VisitRequestSerializer
 
@@ -459,7 +914,7 @@ class SellerVisitRequestListView(generics.ListAPIView):
             return VisitRequest.objects.none()
         return VisitRequest.objects.filter(property__seller=seller).order_by('-created_at')
     
-class VisitRequestUpdateView(generics.RetrieveUpdateAPIView):
+class VisitRequestUpdateView(ConditionalRetrieveMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = VisitRequestSerializer
     queryset = VisitRequest.objects.all()
@@ -475,7 +930,13 @@ class VisitRequestUpdateView(generics.RetrieveUpdateAPIView):
         }
         serializer = self.get_serializer(visit_request, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        with db_transaction.atomic():
+            reactivated = data["status"] in scheduling.BLOCKING_STATUSES and visit_request.status not in scheduling.BLOCKING_STATUSES
+            if reactivated:
+                # Ένα αίτημα που ξαναγίνεται ενεργό δεν πρέπει να πέσει πάνω σε άλλη επίσκεψη
+                scheduling.reserve(visit_request.property_id, visit_request.handler_id, visit_request.scheduled_date,
+                                   exclude=visit_request.pk)
+            self.perform_update(serializer)
         return Response(serializer.data)
     
 class CancelVisitRequestByBuyerView(APIView):
@@ -542,7 +1003,7 @@ class SupportTicketCreateView(generics.CreateAPIView):
             raise serializers.ValidationError("Only buyers can create support tickets.")
         serializer.save(buyer=buyer)
 
-class SupportTicketListView(generics.ListAPIView):
+class SupportTicketListView(ConditionalListMixin, generics.ListAPIView):
     """
     Επιστρέφει όλα τα Support Tickets που έχει ανοίξει ο συνδεδεμένος Buyer.
     """
@@ -553,7 +1014,7 @@ class SupportTicketListView(generics.ListAPIView):
         buyer = getattr(self.request.user, 'buyer', None)
         if not buyer:
             return SupportTicket.objects.none()
-        return SupportTicket.objects.filter(buyer=buyer).order_by('-created_at')
+        return SupportTicket.objects.filter(buyer=buyer).select_related('buyer__user').order_by('-created_at')
     
 class SupportMessageCreateView(generics.CreateAPIView):
     """
@@ -585,7 +1046,7 @@ class SupportMessageListView(generics.ListAPIView):
         ticket_id = self.request.query_params.get('ticket')
         if not ticket_id:
             return SupportMessage.objects.none()
-        return SupportMessage.objects.filter(ticket__id=ticket_id).order_by('created_at')
+        return SupportMessage.objects.filter(ticket__id=ticket_id).select_related('sender').order_by('created_at')
     
 class BuyerRegisterFromAgentView(generics.CreateAPIView):
     queryset = Buyer.objects.all()
@@ -648,7 +1109,7 @@ class BuyerAgentAssociationResponseView(APIView):
 
     def patch(self, request, association_id):
         try:
-            association = AgentBuyerAssociation.objects.get(id=association_id, buyer=request.user.buyer)
+            association = AgentBuyerAssociation.objects.select_related('buyer', 'property').get(id=association_id, buyer=request.user.buyer)
         except AgentBuyerAssociation.DoesNotExist:
             return Response({"detail": "Association not found."}, status=status.HTTP_404_NOT_FOUND)
         
@@ -666,10 +1127,12 @@ class BuyerAgentAssociationResponseView(APIView):
     
 class GenerateOTPView(APIView):
     """
-    Δημιουργεί και αποθηκεύει ένα OTP για έναν Buyer.
+    Στέλνει νέο OTP σε έναν Buyer (μέσω των workers).
     Request Body πρέπει να περιέχει "buyer_id".
     """
     permission_classes = [IsAuthenticated]  # Μπορεί να περιοριστεί σε ρόλους (π.χ., Agent ή admin)
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'otp_generate'
     
     def post(self, request):
         buyer_id = request.data.get("buyer_id")
@@ -679,10 +1142,10 @@ class GenerateOTPView(APIView):
             buyer = Buyer.objects.get(id=buyer_id)
         except Buyer.DoesNotExist:
             return Response({"detail": "Buyer not found."}, status=status.HTTP_404_NOT_FOUND)
-        otp_code = str(random.randint(100000, 999999))
-        otp_record = OTPRecord.objects.create(buyer=buyer, otp=otp_code)
-        # TODO: Στείλε OTP μέσω SMS/email. Για τώρα επιστρέφουμε το otp.
-        return Response({"detail": "OTP generated", "otp": otp_code}, status=status.HTTP_201_CREATED)
+        # Ο παλιός κωδικός ακυρώνεται αμέσως· τον νέο τον εκδίδει και τον στέλνει ο worker
+        otp.revoke(buyer)
+        jobs.enqueue('send_buyer_otp', {'buyer_id': buyer.id})
+        return Response({"detail": "OTP sent"}, status=status.HTTP_202_ACCEPTED)
     
 class VerifyOTPView(APIView):
     """
@@ -690,18 +1153,19 @@ class VerifyOTPView(APIView):
     Request Body πρέπει να περιέχει "buyer_id" και "otp".
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'otp_verify'
     
     def post(self, request):
         buyer_id = request.data.get("buyer_id")
         otp_input = request.data.get("otp")
         if not buyer_id or not otp_input:
             return Response({"detail": "buyer_id and otp are required."}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            otp_record = OTPRecord.objects.filter(buyer_id=buyer_id, otp=otp_input, is_verified=False).latest('created_at')
-        except OTPRecord.DoesNotExist:
+        result = otp.verify(buyer_id, otp_input)
+        if result == otp.LOCKED:
+            return Response({"detail": "Too many attempts. Request a new OTP."}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        if result != otp.VERIFIED:
             return Response({"detail": "Invalid or expired OTP."}, status=status.HTTP_400_BAD_REQUEST)
-        otp_record.is_verified = True
-        otp_record.save()
         return Response({"detail": "OTP verified successfully."}, status=status.HTTP_200_OK)
     
 class AgentDashboardView(APIView):
@@ -714,28 +1178,33 @@ class AgentDashboardView(APIView):
 
     def get(self, request):
         agent = get_object_or_404(Agent, user=request.user)
-        
-        # Get all transactions for this agent
-        transactions = Transaction.objects.filter(agent=agent)
-        
-        # Get unique buyers from transactions
-        buyers = Buyer.objects.filter(transaction__in=transactions).distinct()
-        
-        data = []
-        for buyer in buyers:
-            # Get the latest transaction for this buyer
-            latest_transaction = transactions.filter(buyer=buyer).order_by('-created_at').first()
-            
-            if latest_transaction:
-                data.append({
-                    'id': buyer.id,
-                    'name': buyer.name,
-                    'email': buyer.email,
-                    'transactionId': latest_transaction.id,
-                    'propertyTitle': latest_transaction.property.title,
-                    'status': latest_transaction.status
-                })
-        
+
+        # Η πιο πρόσφατη συναλλαγή κάθε buyer υπολογίζεται με correlated subquery,
+        # ώστε όλο το dashboard να είναι ένα query ανεξάρτητα από το πλήθος των buyers
+        latest_id = (
+            Transaction.objects.filter(agent=agent, buyer=OuterRef('buyer'))
+            .order_by('-created_at', '-id')
+            .values('id')[:1]
+        )
+        latest_transactions = (
+            Transaction.objects.filter(agent=agent, id=Subquery(latest_id))
+            .select_related('buyer', 'property')
+            .only('id', 'status', 'buyer__id', 'buyer__name', 'buyer__email', 'property__title')
+            .order_by('buyer_id')
+        )
+
+        data = [
+            {
+                'id': transaction.buyer.id,
+                'name': transaction.buyer.name,
+                'email': transaction.buyer.email,
+                'transactionId': transaction.id,
+                'propertyTitle': transaction.property.title,
+                'status': transaction.status
+            }
+            for transaction in latest_transactions
+        ]
+
         return Response(data)
     
 class CreateTemporaryAssociationView(generics.CreateAPIView):
@@ -787,21 +1256,16 @@ class CreateTemporaryAssociationView(generics.CreateAPIView):
     
 
 class CustomAuthToken(ObtainAuthToken):
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'login'
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         token, created = Token.objects.get_or_create(user=user)
         
-        # Ελέγχουμε τον ρόλο
-        if Buyer.objects.filter(user=user).exists():
-            role = "buyer"
-        elif Seller.objects.filter(user=user).exists():
-            role = "seller"
-        elif Agent.objects.filter(user=user).exists():
-            role = "agent"
-        else:
-            role = "unknown"
+        # Ελέγχουμε τον ρόλο με ένα query, το οποίο ζεσταίνει και την cache για τα επόμενα requests
+        role = get_role(token_cache.get_or_load(token.key))
 
         print(f"DEBUG: User {user.username} authenticated with role: {role}")
 
@@ -815,7 +1279,7 @@ class TransactionProgressView(APIView):
 
     def get(self, request, transaction_id):
         transaction = get_object_or_404(Transaction, pk=transaction_id)
-        progress = TransactionProgress.objects.filter(transaction=transaction)
+        progress = TransactionProgress.objects.filter(transaction=transaction).select_related('created_by')
         serializer = TransactionProgressSerializer(progress, many=True)
         return Response(serializer.data)
 
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 
 import os
+import tempfile
 from dotenv import load_dotenv
 load_dotenv()
 import dj_database_url
@@ -37,12 +38,135 @@ ALLOWED_HOSTS = []
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'listings.authentication.CachedTokenAuthentication',
        # 'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Keyset pagination σε (created_at, id) για όλα τα list endpoints (?cursor=...&page_size=...)
+    'DEFAULT_PAGINATION_CLASS': 'listings.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
+}
+
+# Cache token -> user/ρόλος (βλ. listings/authentication.py).
+# Με SHARED_CACHE = alias ενός CACHES κοινού μεταξύ των workers (όχι locmem) οι ακυρώσεις
+# ισχύουν αμέσως σε όλα τα processes. Χωρίς αυτό οι τοπικές εγγραφές ζουν LOCAL_TTL δευτερόλεπτα.
+AUTH_TOKEN_CACHE = {
+    'TTL': 300,
+    'LOCAL_TTL': 5,
+    'MAX_ENTRIES': 10000,
+    'SHARED_CACHE': os.getenv('AUTH_TOKEN_SHARED_CACHE') or None,
+}
+
+# Cache: 'default' για γενική χρήση και 'listings' για τις απαντήσεις των λιστών ακινήτων.
+# Η 'listings' κρατά και τα version counters με τα οποία ακυρώνονται οι απαντήσεις, οπότε πρέπει
+# να είναι κοινή μεταξύ των workers: file-based από default ή π.χ. Redis με
+# LISTING_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache LISTING_CACHE_LOCATION=redis://...
+# Το LocMemCache είναι μόνο για ένα process (runserver, tests).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'listings': {
+        'BACKEND': os.getenv('LISTING_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('LISTING_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'realestate-listings-cache')),
+        'TIMEOUT': 600,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Token buckets του listings/throttling.py· κοινή μεταξύ workers με THROTTLE_CACHE_BACKEND=...FileBasedCache
+    'throttling': {
+        'BACKEND': os.getenv('THROTTLE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION', 'throttling'),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# Versioned cache των απαντήσεων για τα endpoints ακινήτων (βλ. listings/response_cache.py)
+LISTING_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'listings',
+    'TTL': 600,
+}
+
+# Ουρά εργασιών στη βάση (βλ. listings/jobs.py), εκτελείται με manage.py run_workers
+JOB_QUEUE = {
+    'VISIBILITY_TIMEOUT': 300,
+    'POLL_INTERVAL': 1.0,
+    'BATCH_SIZE': 10,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_BASE': 5,
+    'BACKOFF_MAX': 3600,
+}
+
+# Έγγραφα συναλλαγών (βλ. listings/documents.py). Σε production με nginx:
+# 'SENDFILE': 'x-accel-redirect' και internal location /protected-media/ -> MEDIA_ROOT
+DOCUMENTS = {
+    'CHUNK_MAX': 8 * 1024 * 1024,
+    'MAX_SIZE': 200 * 1024 * 1024,
+    'SENDFILE': os.getenv('DOCUMENTS_SENDFILE') or None,
+    'SENDFILE_PREFIX': '/protected-media/',
+}
+
+# Thumbnails/medium εικόνων ακινήτων (βλ. listings/images.py, απαιτεί Pillow)
+IMAGE_DERIVATIVES = {
+    'ROOT': MEDIA_ROOT / 'derivatives',
+    'MAX_BYTES': int(os.getenv('IMAGE_CACHE_MAX_BYTES', 512 * 1024 * 1024)),
+    'WORKERS': int(os.getenv('IMAGE_WORKERS', 2)),
+    # Επιτρεπτοί εξωτερικοί hosts εικόνων (κενό: καμία λήψη από το δίκτυο)
+    'SOURCE_HOSTS': [host for host in os.getenv('IMAGE_SOURCE_HOSTS', '').split(',') if host],
+    # Hosts των απόλυτων URLs που σερβίρουν το MEDIA_ROOT· διαβάζονται μόνο τα αρχεία του MEDIA_DIR
+    'MEDIA_HOSTS': [host for host in os.getenv('IMAGE_MEDIA_HOSTS', '').split(',') if host],
+    'MEDIA_DIR': 'properties',
+}
+
+# Slots επισκέψεων (βλ. listings/scheduling.py): οι κανόνες διαθεσιμότητας είναι σε τοπική ώρα
+VISIT_SCHEDULING = {
+    'TIME_ZONE': 'Europe/Athens',
+    'SLOT_MINUTES': 30,
+    'MAX_RANGE_DAYS': 62,
+}
+
+# Μετρήσεις ανά view στο /api/metrics (βλ. listings/metrics.py)
+METRICS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': float(os.getenv('METRICS_SAMPLE_RATE', 1.0)),
+}
+
+# Token buckets ανά endpoint (βλ. listings/throttling.py): 'N/period' ανά IP και ανά user,
+# 'burst' = μέγιστα διαθέσιμα tokens. Τα αιτήματα πέρα από το όριο παίρνουν 429 με Retry-After.
+THROTTLING = {
+    'ENABLED': True,
+    'ALIAS': 'throttling',
+    'SCOPES': {
+        'register': {'ip': '20/hour', 'burst': 10},
+        'login': {'ip': '60/min', 'burst': 20},
+        'otp_generate': {'ip': '30/hour', 'user': '10/hour', 'burst': 5},
+        'otp_verify': {'ip': '60/hour', 'user': '30/hour', 'burst': 10},
+    },
+}
+
+# Κωδικοί OTP (βλ. listings/otp.py)· οι ληγμένοι σβήνονται με manage.py purge_otps (π.χ. ωριαία από cron)
+OTP = {
+    'TTL': 10 * 60,
+    'MAX_ATTEMPTS': 5,
+    'RETENTION': 24 * 3600,
+}
+
+# Email για την αποστολή των OTP από τους workers: console από default, SMTP με
+# EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend και EMAIL_HOST/EMAIL_PORT/...
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+
+# Κλειδώματα ακινήτων ανά αγοραστή (βλ. listings/locks.py), cache ανά process
+PROPERTY_LOCKS = {
+    'CACHE_TTL': 30,
+    'CACHE_SIZE': 10000,
 }
 
 # Application definition
@@ -60,7 +184,9 @@ INSTALLED_APPS = [
     'rest_framework.authtoken'
 ]
 
-MIDDLEWARE = [ 'django.middleware.security.SecurityMiddleware',
+MIDDLEWARE = [ 'listings.metrics.MetricsMiddleware',
+    'listings.nplusone.NPlusOneMiddleware',
+    'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -151,6 +277,16 @@ CORS_ALLOWED_ORIGINS =  ["http://127.0.0.1:5500", "http://localhost:5500"]
 BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("SECRET_KEY", "changeme")
 DEBUG = os.getenv("DEBUG", "False") == "True"
+
+# Ανίχνευση N+1 queries (βλ. listings/nplusone.py): warning στο DEBUG (ή με N_PLUS_ONE_ENABLED=True),
+# αποτυχία στα tests μέσω του TEST_RUNNER (N_PLUS_ONE_TESTS=False για να απενεργοποιηθεί)
+N_PLUS_ONE = {
+    'ENABLED': os.getenv('N_PLUS_ONE_ENABLED', str(DEBUG)) == 'True',
+    'THRESHOLD': 5,
+    'RAISE': os.getenv('N_PLUS_ONE_RAISE', 'False') == 'True',
+    'TESTS': os.getenv('N_PLUS_ONE_TESTS', 'True') == 'True',
+}
+TEST_RUNNER = 'listings.nplusone.TestRunner'
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "127.0.0.1").split(",")
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///db.sqlite3")